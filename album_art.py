@@ -0,0 +1,188 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from library_index import get_mutagen_audio, load_mutagen
+from profiler import profiler
+from rgb565 import RGB565_MASKS
+
+# Kantenlänge der Cover auf dem Play-Screen (Pixel)
+ART_SIZE = 48
+# APIC/FLAC-Bildtyp "Front Cover"
+FRONT_COVER = 3
+
+
+def extract_cover(path):
+    """Eingebettetes Cover (JPEG/PNG-Bytes) einer MP3/FLAC/WAV-Datei oder None.
+
+    Gelesen wird mit denselben mutagen-Klassen wie die Metadaten. Gibt es mehrere Bilder,
+    wird das Front-Cover bevorzugt.
+    """
+    if not load_mutagen():
+        return None
+    try:
+        audio = get_mutagen_audio(path)
+    except Exception:
+        return None
+    if audio is None:
+        return None
+    pictures = []
+    if getattr(audio, 'pictures', None):
+        # FLAC: METADATA_BLOCK_PICTURE
+        pictures = [(picture.type, picture.data) for picture in audio.pictures]
+    elif audio.tags is not None and hasattr(audio.tags, 'getall'):
+        # MP3/WAV: ID3-Frames APIC
+        pictures = [(frame.type, frame.data) for frame in audio.tags.getall('APIC')]
+    if not pictures:
+        return None
+    for picture_type, data in pictures:
+        if picture_type == FRONT_COVER:
+            return data
+    return pictures[0][1]
+
+
+def make_thumbnail(image_data, size):
+    """Dekodiert ein Cover, schneidet es quadratisch zu und gibt size*size RGB565-Werte zurück."""
+    image = pygame.image.load(io.BytesIO(image_data))
+    width, height = image.get_size()
+    side = min(width, height)
+    square = image.subsurface(pygame.Rect((width - side) // 2, (height - side) // 2, side, side))
+    # smoothscale braucht 24/32 Bit (Paletten-PNGs vorher umwandeln)
+    if square.get_bitsize() < 24:
+        converted = pygame.Surface((side, side), 0, 24)
+        converted.blit(square, (0, 0))
+        square = converted
+    scaled = pygame.transform.smoothscale(square, (size, size))
+    rgb = pygame.surfarray.array3d(scaled).astype(np.uint16)
+    pixels = ((rgb[:, :, 0] & 0xF8) << 8) | ((rgb[:, :, 1] & 0xFC) << 3) | (rgb[:, :, 2] >> 3)
+    # surfarray liefert (x, y), gespeichert wird zeilenweise
+    return np.ascontiguousarray(pixels.T, dtype='<u2')
+
+
+class AlbumArtCache:
+    """Cover-Thumbnails für den Play-Screen, einmal erzeugt und danach nur noch geladen.
+
+    Beim ersten Mal wird das eingebettete Cover gelesen, dekodiert und auf size*size
+    verkleinert. Das Ergebnis landet als rohes RGB565 (little-endian, wie im 16-Bit-Surface
+    auf dem Pi) in cache_dir, neben dem Bibliotheksindex. Danach kostet ein Cover nur das
+    Lesen von size*size*2 Bytes in ein 16-Bit-Surface. Die letzten max_entries Surfaces
+    bleiben im Speicher (LRU). Dateien ohne Cover bekommen eine leere Cache-Datei, damit sie
+    nicht bei jedem Trackwechsel erneut durchsucht werden.
+
+    get() blockiert nie: Unbekannte Cover lädt ein Hintergrund-Thread, danach wird
+    on_ready(datei) aufgerufen (z.B. um neu zu zeichnen).
+    """
+
+    def __init__(self, folder, size=ART_SIZE, cache_dir=None, max_entries=16, on_ready=None):
+        self.folder = folder
+        self.size = size
+        if cache_dir is None:
+            folder_abs = os.path.abspath(folder)
+            cache_dir = os.path.join(os.path.dirname(folder_abs), f".{os.path.basename(folder_abs)}_art")
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.on_ready = on_ready
+        self._memory = OrderedDict()  # Datei -> Surface oder None (kein Cover)
+        self._wanted = []
+        self._changed = threading.Condition()
+        self.hits = 0
+        self.disk_loads = 0
+        self.extractions = 0
+        self._thread = threading.Thread(target=self._load_loop, name="album-art", daemon=True)
+        self._thread.start()
+
+    def _cache_path(self, file, stat):
+        # Größe und mtime im Schlüssel: ein geändertes Cover ergibt eine neue Datei
+        key = f"{file}\0{stat.st_size}\0{stat.st_mtime_ns}\0{self.size}".encode("utf-8", "surrogateescape")
+        return os.path.join(self.cache_dir, hashlib.sha1(key).hexdigest() + ".565")
+
+    def _surface(self, data):
+        surface = pygame.Surface((self.size, self.size), 0, 16, RGB565_MASKS)
+        if surface.get_pitch() == self.size * 2:
+            surface.get_buffer().write(data)
+        else:
+            pixels = np.frombuffer(data, dtype='<u2').reshape(self.size, self.size)
+            pygame.surfarray.blit_array(surface, pixels.T)
+        return surface
+
+    def load(self, file):
+        """Lädt das Cover von file (relativ zum Musikordner) und blockiert dabei. None = kein Cover."""
+        with self._changed:
+            if file in self._memory:
+                self._memory.move_to_end(file)
+                self.hits += 1
+                return self._memory[file]
+        path = os.path.join(self.folder, file)
+        surface = None
+        try:
+            cache_path = self._cache_path(file, os.stat(path))
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+            self.disk_loads += 1
+        except FileNotFoundError:
+            data = self._extract(path, cache_path) if os.path.exists(path) else b""
+        except OSError:
+            data = b""
+        if len(data) == self.size * self.size * 2:
+            surface = self._surface(data)
+        with self._changed:
+            self._memory[file] = surface
+            self._memory.move_to_end(file)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return surface
+
+    def _extract(self, path, cache_path):
+        self.extractions += 1
+        data = b""
+        image_data = extract_cover(path)
+        if image_data is not None:
+            try:
+                data = make_thumbnail(image_data, self.size).tobytes()
+            except (pygame.error, ValueError) as e:
+                print(f"Cover von {os.path.basename(path)} nicht lesbar: {e}")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Erst vollständig schreiben, dann umbenennen: kein halbes Thumbnail nach Stromausfall
+            with open(cache_path + ".tmp", 'wb') as f:
+                f.write(data)
+            os.replace(cache_path + ".tmp", cache_path)
+        except OSError as e:
+            # z.B. schreibgeschützte SD-Karte: dann bleibt es beim Cache im Speicher
+            print(f"Cover-Cache {self.cache_dir} nicht beschreibbar: {e}")
+        return data
+
+    def get(self, file):
+        """Cover aus dem Speicher oder None; ist es noch nicht geladen, übernimmt das der Thread."""
+        with self._changed:
+            if file in self._memory:
+                self._memory.move_to_end(file)
+                self.hits += 1
+                return self._memory[file]
+        self.prefetch((file,))
+        return None
+
+    def prefetch(self, files):
+        """Lädt Cover im Hintergrund vor, die zuerst genannten zuerst (z.B. aktueller, nächster Track)."""
+        with self._changed:
+            wanted = [file for file in files if file not in self._memory]
+            self._wanted = wanted + [file for file in self._wanted if file not in wanted]
+            if wanted:
+                self._changed.notify()
+
+    def _load_loop(self):
+        while True:
+            with self._changed:
+                while not self._wanted:
+                    self._changed.wait()
+                file = self._wanted.pop(0)
+            start = profiler.start()
+            art = self.load(file)
+            profiler.stop("art", start)
+            if art is not None and self.on_ready is not None:
+                self.on_ready(file)
@@ -1,139 +1,359 @@
 import os
 import time
-import vlc
-import wave
-
-try:
-    from mutagen.mp3 import MP3
-    from mutagen.wave import WAVE
-    from mutagen.flac import FLAC
-    from mutagen import MutagenError
-except ImportError:
-    MP3 = None
-    WAVE = None
-    FLAC = None
-    MutagenError = None
+import threading
+from bisect import bisect_left
+
+from profiler import profiler
+from track_library import TrackLibrary
+from library_index import (LibraryIndex, get_mutagen_audio, load_mutagen, read_track_info, scan_audio_files,
+                           DEFAULT_LENGTH)
+from library_watcher import LibraryWatcher
+
+class PlaybackState:
+    """Lokal gespiegelter Wiedergabezustand.
+
+    Wird aus den libvlc-Events gepflegt, so dass die Oberfläche ihn in jedem Frame lesen
+    kann, ohne libvlc aufzurufen.
+    """
+
+    __slots__ = ('index', 'paused', 'ended', 'error', 'length', 'time_ms', 'time_stamp')
+
+    def __init__(self):
+        self.index = None      # None = noch nichts abgespielt
+        self.paused = False
+        self.ended = False
+        self.error = False
+        self.length = 0
+        self.time_ms = 0
+        self.time_stamp = None # Zeitpunkt des letzten TimeChanged-Events
+
+    def position(self):
+        """Aktuelle Position in Sekunden, zwischen zwei TimeChanged-Events interpoliert."""
+        seconds = self.time_ms / 1000.0
+        if self.time_stamp is not None and not self.paused and not self.ended:
+            seconds += time.monotonic() - self.time_stamp
+        if self.length > 0:
+            seconds = min(seconds, self.length)
+        return seconds
+
 
 class AudioPlayer:
-    def __init__(self, folder):
-        self.vlc_instance = vlc.Instance()
+    def __init__(self, folder, scan_workers=4, vlc_instance=None, vlc_module=None, watch=True):
+        if vlc_module is None:
+            # Erst hier importieren: python-vlc lädt dabei libvlc, das dauert auf dem Pi spürbar.
+            # Ohne python-vlc nur mit übergebenem Backend nutzbar (siehe fake_backends)
+            try:
+                import vlc as vlc_module
+            except ImportError:
+                raise RuntimeError("python-vlc nicht gefunden, bitte ein vlc_module übergeben")
+        self.vlc = vlc_module
+        self.vlc_instance = vlc_instance or self.vlc.Instance()
         self.player = self.vlc_instance.media_player_new()
         self.folder = folder
-        self.audio_files = sorted([f for f in os.listdir(folder) if f.lower().endswith(('.mp3', '.wav', 'flac'))])
+        # Rekursiv, relative Pfade (Interpret/Album/Titel.mp3); Größe und mtime für den Index
+        self._file_stats = scan_audio_files(folder)
+        self.audio_files = sorted(self._file_stats)
         if not self.audio_files:
             raise FileNotFoundError("Keine Audio-Dateien gefunden!")
 
-        # Metadaten-Speicher
-        self.metadata = []
-        self.artists = []
-        self.albums = []
-        self._load_metadata() # Diese Funktion wird jetzt aufgerufen
+        # Metadaten-Speicher: alle Dateien sind sofort bekannt, Interpret/Album bleiben None,
+        # bis der Scan die Datei gelesen hat
+        self.library = TrackLibrary(self.audio_files)
+
+        # Metadaten im Hintergrund laden, die Oberfläche kann schon vorher starten
+        self.scan_workers = scan_workers
+        self.scan_complete = threading.Event()
+        self.library_index = LibraryIndex(self.folder)
+        # Nach dem Scan beobachtet der Watcher den Ordner; Änderungen bereitet er als neue
+        # (Dateiliste, Bibliothek) vor, der Hauptloop übernimmt sie mit apply_library_update
+        self.watch = watch
+        self.watcher = None
+        self.library_version = 0
+        self._library_update = None
+        self._library_lock = threading.Lock()
+        self._scan_thread = threading.Thread(target=self._load_metadata, name="library-scan", daemon=True)
+        self._scan_thread.start()
 
-        self.current_index = 0
-        self.song_length = 0
         self.start_time = None
-        self.paused = False
+        self.state = PlaybackState()
+
+        # Songende, Zeit und Fehler kommen als libvlc-Events. Die Callbacks laufen in einem
+        # libvlc-Thread und dürfen libvlc nicht selbst aufrufen, daher übernimmt ein eigener
+        # Thread den Wechsel zum nächsten Track.
+        self.auto_advance = True
+        self._control_lock = threading.RLock()
+        self._advance_requested = threading.Event()
+        self._failed_in_row = 0
+        # Vorab erzeugte und geparste Medien der Nachbar-Tracks {index: media}
+        self._preloaded = {}
+        events = self.player.event_manager()
+        events.event_attach(self.vlc.EventType.MediaPlayerEndReached, self._on_end_reached)
+        events.event_attach(self.vlc.EventType.MediaPlayerTimeChanged, self._on_time_changed)
+        events.event_attach(self.vlc.EventType.MediaPlayerEncounteredError, self._on_error)
+        self._advance_thread = threading.Thread(target=self._advance_loop, name="track-advance", daemon=True)
+        self._advance_thread.start()
         
     def _load_metadata(self):
-        """Lädt Metadaten (Interpret, Album) aus den Audio-Dateien."""
-        if not MutagenError:
-            print("mutagen nicht gefunden, Metadaten können nicht geladen werden.")
-            return
-
-        temp_artists = set()
-        temp_albums = set()
-
-        for i, file in enumerate(self.audio_files):
-            path = os.path.join(self.folder, file)
-            artist = "Unbekannter Interpret"
-            album = "Unbekanntes Album"
-            try:
-                audio = self._get_mutagen_audio(path)
-                if audio:
-                    # Versuche, die Tags auszulesen
-                    if 'artist' in audio:
-                        artist = audio['artist'][0]
-                    if 'album' in audio:
-                        album = audio['album'][0]
-            except MutagenError:
-                print(f"Fehler beim Lesen der Metadaten von {file}")
-
-            self.metadata.append({'file': file, 'artist': artist, 'album': album, 'original_index': i})
-            temp_artists.add(artist)
-            temp_albums.add(album)
-
-        self.artists = sorted(list(temp_artists))
-        self.albums = sorted(list(temp_albums))
+        """Lädt Metadaten (Interpret, Album, Länge) über den persistenten Bibliotheksindex."""
+        try:
+            if not load_mutagen():
+                print("mutagen nicht gefunden, Metadaten können nicht geladen werden.")
+            stats, self._file_stats = self._file_stats, None
+            self.library_index.sync(self.audio_files, read_track_info, self.scan_workers, self._add_track_info, stats)
+            print(f"Bibliothek: {len(self.audio_files)} Dateien, {self.library_index.parsed} neu gelesen, "
+                  f"{self.library_index.pruned} entfernt ({self.library_index.last_sync_time:.2f}s)")
+            if self.watch:
+                # Mit den Stat-Daten des ersten Scans meldet der Watcher auch, was sich während
+                # des Metadaten-Scans geändert hat
+                self.watcher = LibraryWatcher(self.folder, self._on_library_change, self.audio_files,
+                                              known_stats=stats)
+                self.watcher.start()
+        finally:
+            # Auch nach einem Fehler, sonst wartet wait_for_scan() für immer
+            self.scan_complete.set()
+
+    def close(self):
+        """Beendet die Beobachtung des Musikordners."""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def _on_library_change(self, added, removed):
+        """Vom LibraryWatcher: liest neue Dateien und bereitet die geänderte Bibliothek vor."""
+        infos = self.library_index.update(sorted(added), read_track_info, removed)
+        with self._library_lock:
+            # Auf einem noch nicht übernommenen Update aufbauen, sonst ginge es verloren
+            files, library = self._library_update or (self.audio_files, self.library)
+            names = set(files)
+            names.difference_update(removed)
+            names.update(infos)  # nur Dateien, die beim Lesen noch existierten
+            if not names:
+                print("Keine Audio-Dateien mehr gefunden, Bibliothek bleibt unverändert.")
+                return
+            new_files = sorted(names)
+            self._library_update = (new_files, library.rebuilt(new_files, infos))
+        print(f"Bibliothek: {len(infos)} neu/geändert, {len(removed)} entfernt "
+              f"({self.library_index.last_sync_time:.2f}s)")
+
+    @property
+    def library_update_pending(self):
+        return self._library_update is not None
+
+    def apply_library_update(self):
+        """Übernimmt eine vom Watcher vorbereitete Bibliothek (im Hauptloop aufrufen).
+
+        Gibt True zurück, wenn sich die Dateiliste geändert hat. Der laufende Titel spielt
+        weiter, nur sein Index wird auf die neue Liste umgerechnet.
+        """
+        if self._library_update is None:
+            return False
+        # Unter _library_lock tauschen: sonst könnte der Watcher dazwischen auf der alten Liste
+        # aufbauen und dieses Update verwerfen
+        with self._library_lock, self._control_lock:
+            files, library = self._library_update
+            self._library_update = None
+            state = self.state
+            if state.index is not None:
+                current = self.audio_files[state.index]
+                index = library.positions.get(current)
+                if index is None:
+                    # Laufende Datei gelöscht: libvlc spielt sie zu Ende, danach geht es mit
+                    # der Datei weiter, die jetzt an ihrer Stelle steht
+                    index = (bisect_left(files, current) - 1) % len(files)
+                state.index = index
+            preloaded = {}
+            for old_index, media in self._preloaded.items():
+                new_index = library.positions.get(self.audio_files[old_index])
+                if new_index is None:
+                    media.release()
+                else:
+                    preloaded[new_index] = media
+            self._preloaded = preloaded
+            self.audio_files = files
+            self.library = library
+            self.library_version += 1
+        return True
+
+    def _add_track_info(self, file, info):
+        """Trägt die Metadaten einer gescannten Datei ein (wird aus dem Scan-Thread aufgerufen)."""
+        artist, album, duration = info
+        self.library.set_track_info(self.library.positions[file], artist, album, duration)
+
+    @property
+    def metadata(self):
+        return self.library.metadata
+
+    @property
+    def artists(self):
+        return self.library.artists
+
+    @property
+    def albums(self):
+        return self.library.albums
+
+    def wait_for_scan(self, timeout=None):
+        """Wartet, bis alle Metadaten geladen sind."""
+        return self.scan_complete.wait(timeout)
         
     def _get_mutagen_audio(self, path):
         """Hilfsfunktion, um das richtige mutagen-Objekt basierend auf der Dateiendung zu laden."""
-        if path.lower().endswith('.flac') and FLAC:
-            return FLAC(path)
-        if path.lower().endswith('.mp3') and MP3:
-            return MP3(path)
-        if path.lower().endswith('.wav') and WAVE:
-            return WAVE(path)
-        return None
+        return get_mutagen_audio(path)
 
 
     def get_songs_by_artist(self, artist_name):
         """Gibt eine Liste von Songs für einen bestimmten Interpreten zurück."""
-        return [song for song in self.metadata if song['artist'] == artist_name]
+        return self.library.get_songs_by_artist(artist_name)
 
     def get_songs_by_album(self, album_name):
         """Gibt eine Liste von Songs für ein bestimmtes Album zurück."""
-        return [song for song in self.metadata if song['album'] == album_name]
+        return self.library.get_songs_by_album(album_name)
+
+    def count_songs_by_artist(self, artist_name):
+        return self.library.count_songs_by_artist(artist_name)
+
+    def count_songs_by_album(self, album_name):
+        return self.library.count_songs_by_album(album_name)
+
+    def get_albums_by_artist(self, artist_name):
+        """Gibt die Alben eines Interpreten zurück."""
+        return self.library.get_albums_by_artist(artist_name)
+
+    def has_artist(self, name):
+        return self.library.has_artist(name)
+
+    def has_album(self, name):
+        return self.library.has_album(name)
 
     def get_audio_length(self, path):
+        # Zuerst im Index nachsehen, dann muss die Datei nicht erneut geöffnet werden
+        track_id = self.library.positions.get(os.path.relpath(path, self.folder))
+        if track_id is not None:
+            length = self.library.get_duration(track_id)
+            if length is not None:
+                return length
         try:
-			# Hinzufügen der Längenabfrage für FLAC-Dateien
-            if path.lower().endswith('.flac') and FLAC:
-                return FLAC(path).info.length
-            if path.lower().endswith('.mp3') and MP3:
-                return MP3(path).info.length
-            elif path.lower().endswith('.wav') and WAVE:
-                return WAVE(path).info.length
+            audio = self._get_mutagen_audio(path)
+            if audio:
+                return audio.info.length
         except Exception:
-            return 180.0 # Fallback
-        return 180.0
+            return DEFAULT_LENGTH # Fallback
+        return DEFAULT_LENGTH
+
+    @property
+    def current_index(self):
+        return self.state.index if self.state.index is not None else 0
+
+    @property
+    def paused(self):
+        return self.state.paused
+
+    @property
+    def song_length(self):
+        return self.state.length
 
     def play_song(self, index):
-        self.current_index = index % len(self.audio_files)
-        current_file = self.audio_files[self.current_index]
-        song_path = os.path.join(self.folder, current_file)
-        media = self.vlc_instance.media_new(song_path)
-        self.player.set_media(media)
-        self.player.play()
-        time.sleep(0.2)
-        self.song_length = self.get_audio_length(song_path)
-        self.start_time = time.time()
-        self.paused = False
-        return self.current_index
+        with self._control_lock:
+            index = index % len(self.audio_files)
+            song_path = os.path.join(self.folder, self.audio_files[index])
+            media = self._preloaded.pop(index, None)
+            if media is None:
+                media = self.vlc_instance.media_new(song_path)
+            start = profiler.start()
+            self.player.set_media(media)
+
+            # Zustand vor play() zurücksetzen: ein Fehler kann schon kommen, bevor play() zurückkehrt
+            # Länge kommt aus dem Bibliotheksindex, die Datei wird nicht erneut geöffnet
+            state = self.state
+            state.length = self.get_audio_length(song_path)
+            state.time_ms = 0
+            state.time_stamp = None
+            state.ended = False
+            state.error = False
+            state.paused = False
+            state.index = index
+            self.start_time = time.time()
+            self.player.play()
+            profiler.stop("vlc", start)
+            self._preload_neighbours(index)
+            return index
+
+    def _preload_neighbours(self, index):
+        """Erzeugt und parst die Medien für nächsten und vorherigen Track im Voraus."""
+        count = len(self.audio_files)
+        wanted = {(index + 1) % count, (index - 1) % count}
+        wanted.discard(index)
+        for stale in [i for i in self._preloaded if i not in wanted]:
+            self._preloaded.pop(stale).release()
+        for i in wanted:
+            if i not in self._preloaded:
+                media = self.vlc_instance.media_new(os.path.join(self.folder, self.audio_files[i]))
+                # Asynchron parsen, die Demuxer-Vorbereitung ist beim Abspielen dann schon erledigt
+                media.parse_with_options(self.vlc.MediaParseFlag.local, 0)
+                self._preloaded[i] = media
 
     def pause(self):
-        self.player.pause()
-        self.paused = not self.paused
-        if self.paused:
-            self.paused_time = self.player.get_time()
-        else:
-            # Kleine Korrektur, falls die Zeit beim Fortsetzen nicht perfekt ist
-            self.player.set_time(int(self.paused_time))
+        with self._control_lock:
+            state = self.state
+            start = profiler.start()
+            self.player.pause()
+            profiler.stop("vlc", start)
+            if not state.paused:
+                state.time_ms = int(state.position() * 1000)
+                state.paused = True
+                self.paused_time = self.player.get_time()
+            else:
+                # Kleine Korrektur, falls die Zeit beim Fortsetzen nicht perfekt ist
+                self.player.set_time(int(self.paused_time))
+                state.paused = False
+            if state.time_stamp is not None:
+                state.time_stamp = time.monotonic()
 
     #def set_volume(self, volume):
      #   self.player.audio_set_volume(int(volume * 100))
 
     def get_current_time(self):
-        return self.player.get_time() / 1000.0
+        return self.state.position()
 
     def next_song(self):
-        return self.play_song((self.current_index + 1) % len(self.audio_files))
+        with self._control_lock:
+            return self.play_song((self.current_index + 1) % len(self.audio_files))
 
     def previous_song(self):
-        return self.play_song((self.current_index - 1) % len(self.audio_files))
+        with self._control_lock:
+            return self.play_song((self.current_index - 1) % len(self.audio_files))
         
     def is_finished(self):
-        # vlc.State.Ended hat den Wert 6
-        return self.player.get_state() == vlc.State.Ended
+        return self.state.ended
+
+    # --- libvlc-Events (laufen im libvlc-Thread, nur Zustand setzen) ---
+    def _on_time_changed(self, event):
+        state = self.state
+        state.time_ms = event.u.new_time
+        state.time_stamp = time.monotonic()
+        self._failed_in_row = 0
+
+    def _on_end_reached(self, event):
+        state = self.state
+        state.time_ms = int(state.length * 1000)
+        state.ended = True
+        self._advance_requested.set()
+
+    def _on_error(self, event):
+        print(f"Wiedergabefehler bei {self.audio_files[self.current_index]}")
+        self.state.error = True
+        self.state.ended = True
+        self._failed_in_row += 1
+        self._advance_requested.set()
+
+    def _advance_loop(self):
+        while True:
+            self._advance_requested.wait()
+            self._advance_requested.clear()
+            with self._control_lock:
+                # Nicht endlos weiterspringen, wenn keine einzige Datei abspielbar ist
+                if not self.auto_advance or not self.state.ended or self._failed_in_row >= len(self.audio_files):
+                    continue
+                self.next_song()
 
     # --- ZUKüNFTIGE FUNKTION für Interpret/Album ---
     # def _load_metadata(self):
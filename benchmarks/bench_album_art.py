@@ -0,0 +1,100 @@
+"""Kosten eines Covers beim Trackwechsel: direkt aus der Datei gegen AlbumArtCache.
+
+Die Bibliothek besteht aus WAVs mit eingebettetem ID3-Cover (JPEG, 600x600), gelesen wie
+MP3-Tags über mutagen. Gemessen pro Track:
+
+  direkt       Cover extrahieren, JPEG dekodieren, verkleinern, nach RGB565 wandeln
+  Platte       Thumbnail aus dem Cache-Ordner lesen (nach einem Neustart)
+  Speicher     Treffer im LRU
+  blit         Thumbnail in das 16-Bit-Surface des Play-Screens kopieren
+
+Braucht mutagen und pygame mit JPEG-Unterstützung; fehlt mutagen, wird das gemeldet und
+übersprungen.
+
+Aufruf: python benchmarks/bench_album_art.py [anzahl_tracks]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from album_art import ART_SIZE, AlbumArtCache, extract_cover, make_thumbnail
+from bench_library_index import make_library
+from library_index import load_mutagen
+from rgb565 import RGB565_MASKS
+
+
+def make_cover(path, seed):
+    surface = pygame.Surface((600, 600))
+    for i in range(0, 600, 20):
+        pygame.draw.rect(surface, ((seed * 37 + i) % 256, (i * 3) % 256, (seed * 11) % 256), (i, 0, 20, 600))
+    pygame.draw.circle(surface, (240, 240, 240), (300, 300), 120)
+    pygame.image.save(surface, path)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def add_covers(folder, files, root):
+    # Erst hier: ohne mutagen meldet main() das und überspringt die Messung
+    from mutagen.id3 import APIC
+    from mutagen.wave import WAVE
+
+    for i, file in enumerate(files):
+        audio = WAVE(os.path.join(folder, file))
+        audio.add_tags()
+        audio.tags.add(APIC(encoding=3, mime="image/jpeg", type=3, desc="Cover",
+                            data=make_cover(os.path.join(root, "cover.jpg"), i)))
+        audio.save()
+
+
+def per_track(func, files):
+    start = time.perf_counter()
+    for file in files:
+        func(file)
+    return (time.perf_counter() - start) / len(files)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    if not load_mutagen():
+        print("mutagen nicht verfügbar, Cover können nicht eingebettet werden - übersprungen")
+        return
+    root = tempfile.mkdtemp()
+    try:
+        pygame.init()
+        folder = os.path.join(root, "music")
+        files = make_library(folder, count)
+        add_covers(folder, files, root)
+
+        direct = per_track(lambda f: make_thumbnail(extract_cover(os.path.join(folder, f)), ART_SIZE), files)
+
+        cache = AlbumArtCache(folder, cache_dir=os.path.join(root, "art"), max_entries=count)
+        first = per_track(cache.load, files)
+        memory = per_track(cache.load, files)
+        # Neuer Cache auf demselben Ordner: wie nach einem Neustart, nur die Dateien liegen vor
+        cache = AlbumArtCache(folder, cache_dir=os.path.join(root, "art"), max_entries=count)
+        disk = per_track(cache.load, files)
+        assert cache.disk_loads == count and cache.extractions == 0
+
+        screen = pygame.Surface((160, 128), 0, 16, RGB565_MASKS)
+        art = cache.get(files[0])
+        blit = per_track(lambda f: screen.blit(art, (10, 34)), files * 50)
+
+        print(f"{count} Tracks, Cover 600x600 JPEG -> {ART_SIZE}x{ART_SIZE} RGB565")
+        print(f"direkt       {direct * 1000:8.3f} ms pro Track")
+        print(f"erstes Mal   {first * 1000:8.3f} ms pro Track (inkl. Schreiben in den Cache)")
+        print(f"Platte       {disk * 1000:8.3f} ms pro Track")
+        print(f"Speicher     {memory * 1000:8.3f} ms pro Track")
+        print(f"blit         {blit * 1000:8.3f} ms")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""End-to-End-Benchmark: der echte Zustandsautomat aus main.py auf den Hardware-Attrappen.
+
+Skriptgesteuerte Sitzungen (Menüs durchblättern, Abspielen, Interpreten-Auswahl) drücken
+die Buttons des FakeSeesaw, während der Hauptloop normal läuft. Pro Frame werden Zeichnen,
+RGB565-Umwandlung und Übertragung sowie die SPI-Bytes gemessen, dazu die Startzeit bis
+zum ersten Frame. Das Ergebnis wird mit einer gespeicherten Baseline verglichen (die Zeiten
+hängen vom Rechner ab, die Baseline daher auf dem Vergleichsrechner neu anlegen).
+
+Harte Grenze sind der Median der Frame-Zeit und die CPU-Last jeder Sitzung: liegt einer
+davon um mehr als die Toleranz über der Baseline, endet das Skript mit Exit-Code 1. Die
+übrigen Werte werden nur zur Information mit ausgegeben. Jede Sitzung läuft mehrmals, pro
+Wert zählt der Median der Durchläufe, damit ein einzelner Ausreißer den Lauf nicht kippt.
+
+Aufruf: python benchmarks/bench_end_to_end.py [--save-baseline] [--tolerance 0.2] [--runs 5]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from bench_library_index import make_library
+from main import create_fake_app
+from startup import Startup
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_end_to_end.json")
+HOLD = 0.05  # Wie lange ein Button gedrückt bleibt und die Pause danach
+# Nur diese Werte brechen den Lauf ab; die p95-Werte im Sub-ms-Bereich rauschen zu stark
+GATED = ("frame_p50_ms", "cpu_percent")
+
+# Aktionen: (Button,) drücken, ("rotate", Schritte), ("wait", Sekunden)
+SESSIONS = {
+    "menu": [
+        ("select",), ("select",),                        # Musik -> Alle Songs
+        *[("rotate", 1)] * 20, *[("rotate", -1)] * 5,
+        ("up",), ("up",),
+    ],
+    "play": [
+        ("select",), ("select",), ("rotate", 3), ("select",),  # Song abspielen
+        ("wait", 2.0),
+        ("rotate", 2), ("wait", 1.2),                    # Lautstärke
+        ("right",), ("wait", 0.5), ("left",),
+        ("down",), ("wait", 1.0), ("down",),             # Pause
+        ("up",), ("up",), ("up",),
+    ],
+    "artist": [
+        ("select",), ("rotate", 1), ("select",),         # Musik -> Interpret
+        ("select",), ("rotate", 2), ("select",),         # erster Interpret, dritter Song
+        ("wait", 1.0),
+        ("up",), ("up",), ("up",), ("up",),
+    ],
+}
+
+
+def make_session_library(folder, count):
+    """WAV-Bibliothek, jeder dritte Titel ist so lang, dass er als Lauftext scrollt."""
+    files = make_library(folder, count)
+    for i, name in enumerate(files):
+        if i % 3 == 0:
+            os.rename(os.path.join(folder, name),
+                      os.path.join(folder, f"Interpret {i % 7} - Ein ziemlich langer Titel {i:05d}.wav"))
+
+
+def play_script(device, actions):
+    for action in actions:
+        if action[0] == "wait":
+            time.sleep(action[1])
+        elif action[0] == "rotate":
+            device.rotate(action[1])
+            time.sleep(HOLD)
+        else:
+            device.press(action[0])
+            time.sleep(HOLD)
+            device.release(action[0])
+            time.sleep(HOLD)
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def run_session(app, actions):
+    app.state = "main_menu"
+    app.selected_index = 0
+    app.scheduler.invalidate()
+    display = app.display_controller
+
+    script = threading.Thread(target=play_script, args=(app.seesaw_input.device, actions))
+    script.start()
+    render, convert, flush, spi_bytes = [], [], [], []
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    while script.is_alive():
+        if app.step():
+            render.append(app.last_render_time)
+            convert.append(display.last_convert_time)
+            flush.append(display.last_flush_time)
+            spi_bytes.append(display.last_frame_bytes)
+    script.join()
+    # CPU-Zeit des ganzen Prozesses (Hauptloop, Abspielen, Eingabe) relativ zur Laufzeit
+    cpu_percent = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start) * 100
+
+    result = {"frames": len(render), "spi_bytes_per_frame": sum(spi_bytes) / max(1, len(spi_bytes)),
+              "cpu_percent": cpu_percent}
+    for name, samples in (("render", render), ("convert", convert), ("flush", flush)):
+        result[f"{name}_p50_ms"] = percentile(samples, 0.5) * 1000
+        result[f"{name}_p95_ms"] = percentile(samples, 0.95) * 1000
+    frame = [r + c + f for r, c, f in zip(render, convert, flush)]
+    result["frame_p50_ms"] = percentile(frame, 0.5) * 1000
+    result["frame_p95_ms"] = percentile(frame, 0.95) * 1000
+    return result
+
+
+def median_result(runs):
+    """Fasst mehrere Durchläufe einer Sitzung zusammen, pro Wert der Median."""
+    return {key: percentile([run[key] for run in runs], 0.5) for key in runs[0]}
+
+
+def compare(results, baseline, tolerance):
+    """Gibt alle Werte mit Baseline aus, True wenn ein Wert aus GATED um mehr als tolerance schlechter ist."""
+    regressed = False
+    print(f"\n{'Messwert':<32} {'aktuell':>10} {'Baseline':>10} {'Änderung':>9}")
+    for section, values in results.items():
+        for key, value in values.items():
+            old = baseline.get(section, {}).get(key)
+            if old is None or key == "frames":
+                continue
+            change = (value - old) / old if old else 0.0
+            flag = ""
+            if change > tolerance:
+                if key in GATED:
+                    flag = "  <-- schlechter"
+                    regressed = True
+                else:
+                    flag = "  (nur Info)"
+            print(f"{section + '.' + key:<32} {value:10.2f} {old:10.2f} {change * 100:+8.1f}%{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="erlaubte Verschlechterung (Anteil)")
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=5, help="Durchläufe pro Sitzung")
+    args = parser.parse_args()
+
+    pygame.init()
+    root = tempfile.mkdtemp()
+    try:
+        folder = os.path.join(root, "music")
+        make_session_library(folder, args.files)
+
+        # Synchron senden, damit Umwandlung und Übertragung dem Frame zugeordnet werden können
+        boot = Startup()
+        app = create_fake_app(folder, boot, async_display=False)
+        app.audio_player.wait_for_scan()
+        scanned = boot.elapsed()
+        results = {"startup": {"first_frame_ms": boot.marks["first_frame"] * 1000,
+                               "playable_ms": boot.marks["playable"] * 1000,
+                               "scan_complete_ms": scanned * 1000}}
+
+        runs = {name: [] for name in SESSIONS}
+        for _ in range(args.runs):
+            for name, actions in SESSIONS.items():
+                runs[name].append(run_session(app, actions))
+        for name, session_runs in runs.items():
+            results[name] = median_result(session_runs)
+        spi = app.display_controller.spi
+        app.shutdown()
+
+        for section, values in results.items():
+            print(f"{section}: " + ", ".join(f"{key} {value:.2f}" for key, value in values.items()))
+        print(f"SPI gesamt: {spi.bytes_written} Bytes in {spi.transfers} Transfers")
+
+        if args.save_baseline:
+            with open(BASELINE_FILE, "w") as f:
+                json.dump(results, f, indent=2)
+            print(f"Baseline gespeichert: {BASELINE_FILE}")
+        elif os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE) as f:
+                baseline = json.load(f)
+            if compare(results, baseline, args.tolerance):
+                print(f"FEHLER: Frame-Zeit oder CPU-Last mehr als {args.tolerance:.0%} über der Baseline")
+                sys.exit(1)
+            print(f"ok: Frame-Zeit und CPU-Last innerhalb von {args.tolerance:.0%} der Baseline")
+        else:
+            print("Keine Baseline vorhanden, mit --save-baseline anlegen.")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""CPU-Last und SPI-Datenrate im Leerlauf: fester 30-fps-Takt gegen FrameScheduler.
+
+Die App steht auf einem unveränderten Menü, niemand drückt etwas. Verglichen wird:
+
+  vorher       jeder Durchlauf zeichnet und sendet, mit höchstens 30 fps (wie früher
+               clock.tick(30)); nachgebildet mit invalidate() vor jedem step()
+  nachher      FrameScheduler: gezeichnet wird nur bei Änderungen, sonst mit idle_fps;
+               der InputPoller liest den Seesaw im Leerlauf alle 40 ms
+  mit INT      dazu ist die INT-Leitung des Seesaw angeschlossen, der InputPoller wartet
+               im Leerlauf auf ihre Flanke statt den Bus zu lesen
+
+Gemessen werden Prozess-CPU (inkl. Eingabe-Thread), I2C-Transaktionen und die SPI-Bytes
+pro Sekunde, dazu die Werte, die der Scheduler selbst über update_metrics meldet
+(Debug-Screen, Profiler).
+Mit den Dirty Rectangles aus DisplayController bleibt die SPI-Rate eines statischen
+Menüs schon beim festen Takt klein; zum Vergleich steht darunter die Rate, wenn jeder
+Frame vollständig gesendet würde.
+
+Aufruf: python benchmarks/bench_idle.py [sekunden]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from bench_library_index import make_library
+from main import HEIGHT, WIDTH, create_fake_app
+
+
+def measure(app, seconds, fixed_rate):
+    app.state = "main_menu"
+    app.selected_index = 0
+    app.scheduler.invalidate()
+    app.step()
+    display = app.display_controller
+    frames = app.scheduler.frames_rendered
+    spi_bytes = display.bytes_sent
+    i2c = app.seesaw_input.i2c_transactions
+    cpu = time.process_time()
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        if fixed_rate:
+            app.scheduler.invalidate()
+        app.step()
+    wall = time.monotonic() - start
+    return {
+        "fps": (app.scheduler.frames_rendered - frames) / wall,
+        "cpu_percent": (time.process_time() - cpu) / wall * 100,
+        "spi_bytes_per_second": (display.bytes_sent - spi_bytes) / wall,
+        "i2c_per_second": (app.seesaw_input.i2c_transactions - i2c) / wall,
+        "scheduler": app.scheduler.metrics(),
+    }
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    pygame.init()
+    root = tempfile.mkdtemp()
+    try:
+        folder = os.path.join(root, "music")
+        make_library(folder, 50)
+        # Synchron senden, damit die Übertragung im Hauptthread gezählt wird
+        app = create_fake_app(folder, async_display=False)
+        app.audio_player.wait_for_scan()
+        before = measure(app, seconds, fixed_rate=True)
+        after = measure(app, seconds, fixed_rate=False)
+        app.shutdown()
+
+        app = create_fake_app(folder, async_display=False, seesaw_interrupt=True)
+        app.audio_player.wait_for_scan()
+        interrupt = measure(app, seconds, fixed_rate=False)
+        app.shutdown()
+
+        print(f"Statisches Hauptmenü, je {seconds:.0f} s")
+        print(f"{'':<10}{'fps':>8}{'CPU':>9}{'I2C':>9}{'SPI':>13}   {'Scheduler-Metriken (letzte Sekunde)'}")
+        for name, result in (("vorher", before), ("nachher", after), ("mit INT", interrupt)):
+            metrics = result["scheduler"]
+            print(f"{name:<10}{result['fps']:8.1f}{result['cpu_percent']:8.2f}%{result['i2c_per_second']:7.1f}/s"
+                  f"{result['spi_bytes_per_second']:9.0f} B/s"
+                  f"   {metrics['fps']:.1f} fps, {metrics['cpu_percent']:.1f} %, {metrics['spi_bytes_per_second']:.0f} B/s")
+        for name, result in (("nachher", after), ("mit INT", interrupt)):
+            print(f"CPU {name}/vorher: 1/{before['cpu_percent'] / max(result['cpu_percent'], 1e-3):.0f}")
+        full_frame = WIDTH * HEIGHT * 2
+        print(f"Ohne Dirty Rectangles: vorher {before['fps'] * full_frame:.0f} B/s, "
+              f"nachher {after['fps'] * full_frame:.0f} B/s")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Button-zu-Aktion-Latenz und Frame-Takt: time.sleep(0.2)-Entprellung gegen InputPoller.
+
+Ein simuliertes Seesaw-Board spielt ein festes Drück-Skript ab (einzelne Tastendrücke
+und mehrere Buttons gleichzeitig). Der Loop zeichnet 5 ms pro Frame bei 30 fps.
+
+Aufruf: python benchmarks/bench_input_latency.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backends import FakeSeesaw
+from seesaw_input import SeesawInput, SELECT_PIN, UP_PIN, LEFT_PIN, DOWN_PIN, RIGHT_PIN
+from input_events import InputPoller, PRESS
+
+PINS = {"select": SELECT_PIN, "up": UP_PIN, "left": LEFT_PIN, "down": DOWN_PIN, "right": RIGHT_PIN}
+FRAME_TIME = 1 / 30
+RENDER_TIME = 0.005
+
+# (Start in s, Dauer in s, Buttons)
+SCRIPT = [
+    (0.3, 0.1, ("select",)),
+    (0.8, 0.1, ("down",)),
+    (1.3, 0.15, ("up", "down", "select")),
+    (2.0, 0.1, ("right",)),
+    (2.5, 0.15, ("left", "right", "up")),
+]
+
+
+class ScriptedSeesaw(FakeSeesaw):
+    def __init__(self):
+        super().__init__()
+        self.start = time.monotonic()
+
+    def digital_read_bulk(self, pins, delay=0.008):
+        now = time.monotonic() - self.start
+        self._transaction(delay)
+        for begin, duration, buttons in SCRIPT:
+            if begin <= now < begin + duration:
+                for button in buttons:
+                    pins &= ~(1 << PINS[button])
+        return pins
+
+
+def latencies(actions):
+    """Erste Aktion je Skript-Eintrag und Button, relativ zum Drückzeitpunkt."""
+    result = []
+    for begin, _, buttons in SCRIPT:
+        for button in buttons:
+            times = [t for b, t in actions if b == button and t >= begin]
+            if times:
+                result.append(times[0] - begin)
+    return result
+
+
+def run_loop(name, read_actions, start, duration=3.0):
+    actions = []
+    frame_times = []
+    last = time.monotonic()
+    while time.monotonic() - start < duration:
+        for button, at in read_actions():
+            actions.append((button, at - start))
+        time.sleep(RENDER_TIME)
+        now = time.monotonic()
+        time.sleep(max(0.0, FRAME_TIME - (now - last)))
+        now = time.monotonic()
+        frame_times.append(now - last)
+        last = now
+    lat = sorted(latencies(actions))
+    print(f"{name:<12} Latenz Median {lat[len(lat) // 2] * 1000:6.1f} ms  Max {lat[-1] * 1000:6.1f} ms   "
+          f"längster Frame {max(frame_times) * 1000:6.1f} ms")
+
+
+def main():
+    device = ScriptedSeesaw()
+    legacy = SeesawInput(device=device)
+
+    def legacy_actions():
+        snapshot = legacy.poll()
+        handled = []
+        for button in ("select", "up", "down", "left", "right"):
+            if getattr(snapshot, button):
+                time.sleep(0.2)
+                handled.append((button, time.monotonic()))
+        return handled
+
+    run_loop("sleep(0.2)", legacy_actions, device.start)
+
+    device = ScriptedSeesaw()
+    poller = InputPoller(SeesawInput(device=device))
+    poller.start()
+    run_loop("InputPoller",
+             lambda: [(event.button, time.monotonic()) for event in poller.get_events() if event.type == PRESS],
+             device.start)
+    poller.stop()
+
+
+if __name__ == "__main__":
+    main()
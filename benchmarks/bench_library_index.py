@@ -0,0 +1,61 @@
+"""Kalt- und Warmstart des Bibliotheksindex auf einer synthetischen WAV-Bibliothek.
+
+Aufruf: python benchmarks/bench_library_index.py [anzahl_dateien]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_index import LibraryIndex, read_track_info
+
+
+def make_library(folder, count):
+    """Legt count kurze Stille-WAVs an (0,1 s, 8 kHz mono)."""
+    os.makedirs(folder)
+    silence = b"\x00\x00" * 800
+    for i in range(count):
+        with wave.open(os.path.join(folder, f"track_{i:05d}.wav"), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(silence)
+    return sorted(os.listdir(folder))
+
+
+def timed_sync(folder, files):
+    index = LibraryIndex(folder)
+    start = time.perf_counter()
+    index.sync(files, read_track_info)
+    elapsed = time.perf_counter() - start
+    index.close()
+    return elapsed, index.parsed, index.pruned
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = tempfile.mkdtemp()
+    try:
+        folder = os.path.join(root, "music")
+        files = make_library(folder, count)
+
+        elapsed, parsed, _ = timed_sync(folder, files)
+        print(f"Kaltstart:  {elapsed * 1000:8.1f} ms ({parsed} Dateien gelesen)")
+        elapsed, parsed, _ = timed_sync(folder, files)
+        print(f"Warmstart:  {elapsed * 1000:8.1f} ms ({parsed} Dateien gelesen)")
+
+        # Eine Datei ändern, eine löschen
+        os.utime(os.path.join(folder, files[0]), ns=(0, 0))
+        os.remove(os.path.join(folder, files[-1]))
+        elapsed, parsed, pruned = timed_sync(folder, files[:-1])
+        print(f"Inkrementell: {elapsed * 1000:6.1f} ms ({parsed} gelesen, {pruned} entfernt)")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Interpret-/Album-Abfragen: lineare Suche über die Metadaten gegen die Hash-Indizes.
+
+Aufruf: python benchmarks/bench_library_lookup.py [anzahl_tracks]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from track_library import TrackLibrary
+
+
+def build_library(count, seed=0):
+    """Synthetische Bibliothek: ca. 25 Tracks pro Interpret, 10 pro Album."""
+    rng = random.Random(seed)
+    files = [f"track_{i:06d}.mp3" for i in range(count)]
+    library = TrackLibrary(files)
+    artists = [f"Interpret {i}" for i in range(max(1, count // 25))]
+    for track_id in rng.sample(range(count), count):
+        artist = rng.choice(artists)
+        library.set_track_info(track_id, artist, f"{artist} - Album {track_id % 3}")
+    return library
+
+
+def per_lookup_us(func, names):
+    start = time.perf_counter()
+    for name in names:
+        func(name)
+    return (time.perf_counter() - start) * 1e6 / len(names)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    start = time.perf_counter()
+    library = build_library(count)
+    print(f"{count} Tracks, {len(library.artists)} Interpreten, {len(library.albums)} Alben "
+          f"(Aufbau {time.perf_counter() - start:.2f}s)")
+
+    rng = random.Random(1)
+    artists = rng.choices(library.artists, k=200)
+    albums = rng.choices(library.albums, k=200)
+    metadata = library.metadata
+
+    rows = [
+        ("Songs nach Interpret", lambda a: [s for s in metadata if s['artist'] == a],
+         library.get_songs_by_artist, artists),
+        ("Songs nach Album", lambda a: [s for s in metadata if s['album'] == a],
+         library.get_songs_by_album, albums),
+        ("Interpret vorhanden", lambda a: a in library.artists, library.has_artist, artists),
+    ]
+    for name, linear, indexed, names in rows:
+        assert linear(names[0]) == indexed(names[0])
+        print(f"{name:<22} linear {per_lookup_us(linear, names):10.1f} µs   "
+              f"Index {per_lookup_us(indexed, names):8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
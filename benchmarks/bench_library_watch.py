@@ -0,0 +1,105 @@
+"""Aufwand für eine neu hinzugefügte Datei: inkrementelles Update gegen kompletten Neu-Scan.
+
+Die Bibliothek liegt verschachtelt als Interpret/Album/Titel.wav vor. Verglichen wird:
+
+  komplett     rekursiver Scan, Abgleich mit dem (warmen) Index, neue TrackLibrary
+  inkrementell Index-Update der einen Datei und Umbau der TrackLibrary (wie im Watcher)
+
+Zusätzlich wird die Zeit vom Schreiben der Datei bis zur fertig vorbereiteten Bibliothek
+über den echten LibraryWatcher gemessen (inklusive der Ruhezeit von settle Sekunden).
+
+Aufruf: python benchmarks/bench_library_watch.py [anzahl_dateien]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_player import AudioPlayer
+from fake_backends import fake_vlc
+from library_index import read_track_info, scan_audio_files
+from track_library import TrackLibrary
+
+
+def write_wav(path):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\x00\x00" * 800)
+
+
+def make_nested_library(folder, count, per_album=10, albums_per_artist=5):
+    for i in range(count):
+        album = i // per_album
+        directory = os.path.join(folder, f"Interpret {album // albums_per_artist:03d}", f"Album {album:04d}")
+        os.makedirs(directory, exist_ok=True)
+        write_wav(os.path.join(directory, f"{i % per_album:02d} Titel {i:05d}.wav"))
+
+
+def full_rescan(player):
+    stats = scan_audio_files(player.folder)
+    files = sorted(stats)
+    library = TrackLibrary(files)
+    for file, info in player.library_index.sync(files, read_track_info, stats=stats).items():
+        library.set_track_info(library.positions[file], *info)
+    return library
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    root = tempfile.mkdtemp()
+    try:
+        folder = os.path.join(root, "music")
+        make_nested_library(folder, count)
+        player = AudioPlayer(folder, vlc_module=fake_vlc)
+        player.wait_for_scan()
+        player.play_song(count // 2)
+        playing = player.audio_files[player.current_index]
+
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            full_rescan(player)
+            samples.append(time.perf_counter() - start)
+        print(f"komplett      {min(samples) * 1000:8.1f} ms ({count} Dateien)")
+
+        # Direkt aufgerufen, ohne die Ruhezeit des Watchers
+        samples = []
+        for i in range(5):
+            name = os.path.join("Interpret 000", "Album 0000", f"neu {i}.wav")
+            write_wav(os.path.join(folder, name))
+            start = time.perf_counter()
+            player._on_library_change({name}, set())
+            samples.append(time.perf_counter() - start)
+            player.apply_library_update()
+        print(f"inkrementell  {min(samples) * 1000:8.1f} ms (1 Datei)")
+
+        # Über inotify: Datei schreiben und warten, bis die neue Bibliothek bereitsteht
+        if player.watcher is not None:
+            # Die Ereignisse der Dateien von oben erst abklingen lassen
+            time.sleep(player.watcher.settle * 2)
+            player.apply_library_update()
+            start = time.perf_counter()
+            write_wav(os.path.join(folder, "Interpret 001", "neu.wav"))
+            while not player.library_update_pending and time.perf_counter() - start < 5:
+                time.sleep(0.001)
+            elapsed = time.perf_counter() - start
+            player.apply_library_update()
+            print(f"über inotify  {elapsed * 1000:8.1f} ms (davon {player.watcher.settle * 1000:.0f} ms Ruhezeit)")
+        else:
+            print("inotify nicht verfügbar")
+
+        assert player.audio_files[player.current_index] == playing, "laufender Titel verschoben"
+        print(f"laufender Titel unverändert: {playing}")
+        player.close()
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Zeit bis zu einem beliebigen Eintrag in einer langen Liste: ohne Beschleunigung, mit
+EncoderAcceleration und mit Buchstabensprüngen (Links halten + drehen) plus Beschleunigung.
+
+Gemessen wird eine flache Liste (Interpreten- oder Albumnamen, Dateien direkt im
+Musikordner) und "Alle Songs" einer verschachtelten Bibliothek (Interpret/Album/01 - Titel.mp3),
+dort mit den Sprunggruppen von main.song_group_key.
+
+Der Bediener wird einfach nachgebildet: weit weg vom Ziel dreht er schnell, in der Nähe
+langsamer und zuletzt einzeln (Rastungen pro Sekunde in RATES). Der Seesaw wird alle POLL
+Sekunden gelesen (zwei I2C-Reads plus Pause des InputPollers). Gerechnet wird in
+simulierter Zeit, zusätzlich werden Aufbau und Sprung des JumpIndex wirklich gemessen.
+
+Aufruf: python benchmarks/bench_list_navigation.py [anzahl_songs]
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jump_index import JumpIndex, group_key
+from main import song_group_key
+from seesaw_input import EncoderAcceleration
+
+POLL = 0.021
+# (ab Entfernung, Rastungen pro Sekunde)
+RATES = ((300, 30.0), (20, 12.0), (0, 5.0))
+# Rastungen pro Sekunde beim Springen zwischen Buchstabengruppen
+JUMP_RATE = 6.0
+WORDS = ("Alpha", "Blue", "Crystal", "Dance", "Echo", "Fire", "Ghost", "Heart", "Island", "Jazz",
+         "Kings", "Love", "Moon", "Night", "Ocean", "Paper", "Queen", "River", "Silver", "Time",
+         "Under", "Velvet", "Wild", "Xylo", "Young", "Zero", "Über", "99")
+
+
+def make_names(count, rng):
+    names = {f"{rng.choice(WORDS)} {rng.choice(WORDS).lower()} {i:05d}.mp3" for i in range(count)}
+    return sorted(names)
+
+
+def make_nested_names(count, rng, per_album=12, albums_per_artist=4):
+    """Pfade wie nach dem rekursiven Scan: Interpret/Album/01 - Titel.mp3, nach Pfad sortiert."""
+    names = set()
+    artists = {}
+    for i in range(count):
+        album_number = i // per_album
+        artist_number = album_number // albums_per_artist
+        if artist_number not in artists:
+            artists[artist_number] = f"{rng.choice(WORDS)} {rng.choice(WORDS).lower()} {artist_number}"
+        title = f"{rng.choice(WORDS)} {rng.choice(WORDS).lower()}"
+        names.add(os.path.join(artists[artist_number], f"Album {album_number:04d}",
+                               f"{i % per_album + 1:02d} - {title}.mp3"))
+    return sorted(names)
+
+
+def rate_for(distance):
+    for threshold, rate in RATES:
+        if distance > threshold:
+            return rate
+    return RATES[-1][1]
+
+
+def navigate(start, target, count, accelerate, jump_index=None):
+    """Simulierte Sekunden und Frames von start bis target."""
+    t = 0.0
+    frames = 0
+    position = start
+    if jump_index is not None:
+        target_group = jump_index.group_of(target)
+        while jump_index.group_of(position) != target_group:
+            t += 1 / JUMP_RATE
+            frames += 1
+            position = jump_index.jump(position, 1 if target_group > jump_index.group_of(position) else -1)
+    acceleration = EncoderAcceleration()
+    pending = 0.0
+    while position != target:
+        distance = target - position
+        pending += rate_for(abs(distance)) * POLL
+        t += POLL
+        detents = int(pending)
+        if not detents:
+            continue
+        pending -= detents
+        delta = detents if distance > 0 else -detents
+        step = acceleration.apply(delta, t) if accelerate else delta
+        position = max(0, min(count - 1, position + step))
+        frames += 1
+    return t, frames
+
+
+def run(title, names, key, rng):
+    count = len(names)
+    start = time.perf_counter()
+    jump_index = JumpIndex(names, key)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    position = 0
+    for _ in range(10000):
+        position = jump_index.jump(position, 1)
+    jump = (time.perf_counter() - start) / 10000
+    print(f"{title}: {count} Einträge, {len(jump_index)} Buchstabengruppen")
+    print(f"JumpIndex aufbauen {build * 1000:.2f} ms, ein Sprung {jump * 1e6:.2f} µs")
+
+    targets = [(rng.randrange(count), rng.randrange(count)) for _ in range(50)]
+    print(f"{'':<24}{'Mittel':>9}{'Max':>9}{'Frames':>8}")
+    for name, accelerate, index in (("eine Rastung = 1", False, None),
+                                    ("Beschleunigung", True, None),
+                                    ("Sprünge + Beschl.", True, jump_index)):
+        results = [navigate(a, b, count, accelerate, index) for a, b in targets]
+        seconds = [r[0] for r in results]
+        frames = sum(r[1] for r in results) / len(results)
+        print(f"{name:<24}{sum(seconds) / len(seconds):8.1f}s{max(seconds):8.1f}s{frames:8.0f}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(1)
+    run("Flache Liste", make_names(count, rng), group_key, rng)
+    print()
+    run("Alle Songs, verschachtelt", make_nested_names(count, rng), song_group_key, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Frame-Zeit der Listenmenüs bei 100, 10.000 und 100.000 Einträgen.
+
+Dank ListView werden nur die sichtbaren Zeilen gezeichnet, die Zeit pro Frame sollte
+daher unabhängig von der Listenlänge sein.
+
+Aufruf: python benchmarks/bench_list_rendering.py [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from user_interface import UserInterface
+
+WIDTH, HEIGHT = 160, 128
+
+
+def frame_ms(draw, count, frames):
+    # Auswahl wandert durch die Mitte der Liste, wie beim Drehen am Encoder
+    start_index = count // 2
+    start = time.perf_counter()
+    for i in range(frames):
+        draw((start_index + i) % count)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    ui = UserInterface(WIDTH, HEIGHT)
+
+    print(f"{'Einträge':>9}  {'Alle Songs':>12}  {'Generisches Menü':>17}")
+    for count in (100, 10000, 100000):
+        files = [f"Interpret {i % 300} - Titel Nummer {i:06d}.mp3" for i in range(count)]
+        names = [f"Interpret {i:06d}" for i in range(count)]
+        songs = frame_ms(lambda sel: ui.draw_all_songs_menu(screen, files, sel, 3, False, 0), count, frames)
+        menu = frame_ms(lambda sel: ui.draw_generic_menu(screen, names, sel, "Interpreten"), count, frames)
+        print(f"{count:>9}  {songs:9.3f} ms  {menu:14.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Allokationszählung für Lauftexte: temporäre Surface pro Frame (bisher) gegen Marquee.
+
+Zählt neu angelegte pygame.Surface-Objekte und die Python-Speicherspitze pro Frame im
+eingeschwungenen Zustand. Geprüft werden Marquee.draw allein und der Weg über den
+Marquee-Cache der UserInterface, so wie draw_play_menu ihn pro Frame geht. Legt einer der
+beiden Pfade eine Surface pro Frame an (oder bleibt Speicher liegen), endet das Skript mit
+Exit-Code 1 und taugt damit als Regressionstest.
+
+Aufruf: python benchmarks/bench_marquee.py [frames]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+
+class CountingSurface(pygame.Surface):
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingSurface.created += 1
+        super().__init__(*args, **kwargs)
+
+
+pygame.Surface = CountingSurface
+
+from marquee import Marquee  # noqa: E402
+from user_interface import UserInterface  # noqa: E402
+
+WIDTH, HEIGHT = 160, 128
+AREA = pygame.Rect(10, 10, WIDTH - 20, 20)
+BG, FG = (0, 0, 0), (0, 215, 0)
+
+
+def legacy_scroll(screen, title_surface, offset):
+    """Früherer Lauftext aus draw_play_menu."""
+    title_width = title_surface.get_width()
+    scroll_pos = offset % title_width
+    temp_surface = pygame.Surface(AREA.size, pygame.SRCALPHA)
+    temp_surface.fill(BG)
+    temp_surface.blit(title_surface, (0, 0), (scroll_pos, 0, AREA.width, 20))
+    if scroll_pos + AREA.width > title_width:
+        remaining_width = title_width - scroll_pos
+        temp_surface.blit(title_surface, (remaining_width, 0), (0, 0, AREA.width - remaining_width, 20))
+    screen.blit(temp_surface, AREA.topleft)
+
+
+def measure(name, draw, frames):
+    for offset in range(0, 20, 2):  # Aufwärmen
+        draw(offset)
+    CountingSurface.created = 0
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw(frame * 2)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    print(f"{name:<10} {elapsed * 1e6 / frames:7.1f} µs/Frame   "
+          f"{CountingSurface.created / frames:4.1f} Surfaces/Frame   Speicherspitze {peak} B")
+    return CountingSurface.created, peak
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pygame.init()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    font = pygame.font.SysFont(None, 18)
+    title_surface = font.render("Ein sehr langer Songtitel, der scrollen muss" + Marquee.GAP, True, FG)
+
+    measure("bisher", lambda offset: legacy_scroll(screen, title_surface, offset), frames)
+    marquee = Marquee(title_surface, BG, AREA.width, AREA.height)
+    results = {"Marquee": measure("Marquee", lambda offset: marquee.draw(screen, AREA.x, AREA.y, offset), frames)}
+
+    ui = UserInterface(WIDTH, HEIGHT)
+    title = "Ein sehr langer Songtitel, der scrollen muss"
+    results["Play-Menü"] = measure(
+        "Play-Menü", lambda offset: ui.play_title_marquee(title).draw(screen, AREA.x, AREA.y, offset), frames)
+
+    failed = False
+    for name, (surfaces, peak) in results.items():
+        # Kleine int-Objekte für den Offset sind unvermeidbar, Surfaces und Rects nicht
+        if surfaces:
+            print(f"FEHLER: {name} legt {surfaces / frames:.2f} Surfaces pro Frame an")
+            failed = True
+        if peak > 256:
+            print(f"FEHLER: {name} hat eine Speicherspitze von {peak} B")
+            failed = True
+    if failed:
+        sys.exit(1)
+    print("ok: keine Allokationen pro Frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Durchsatz des parallelen Metadaten-Scans bei 1/2/4/8 Worker-Threads.
+
+Die synthetische Bibliothek liegt meist im RAM-gestützten Temp-Ordner. Um das Verhalten
+einer SD-Karte nachzubilden, wird jedem Lesezugriff eine feste Latenz hinzugefügt.
+
+Aufruf: python benchmarks/bench_metadata_scan.py [anzahl_dateien] [latenz_ms]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_library_index import make_library
+from library_index import LibraryIndex, read_track_info
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5.0) / 1000
+
+    def slow_read(path):
+        time.sleep(latency)
+        return read_track_info(path)
+
+    root = tempfile.mkdtemp()
+    try:
+        folder = os.path.join(root, "music")
+        files = make_library(folder, count)
+        print(f"{count} Dateien, {latency * 1000:.1f} ms Latenz pro Datei")
+        for workers in (1, 2, 4, 8):
+            # Jeder Lauf ist ein Kaltstart mit leerem Index
+            index = LibraryIndex(folder, db_path=":memory:")
+            first = []
+            start = time.perf_counter()
+            index.sync(files, slow_read, workers,
+                       lambda file, info: first or first.append(time.perf_counter() - start))
+            elapsed = time.perf_counter() - start
+            index.close()
+            print(f"{workers} Worker: {count / elapsed:8.1f} Dateien/s   "
+                  f"erstes Ergebnis nach {first[0] * 1000:6.1f} ms")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""libvlc gegen das native Backend: Speicher (RSS), CPU beim Abspielen und Startlatenz.
+
+Jedes Backend läuft in einem eigenen Prozess, damit RSS und CPU nur ihm zugerechnet werden.
+Gespielt wird eine erzeugte WAV-Datei (44,1 kHz Stereo), beim nativen Backend über die
+"null"-Ausgabe in Echtzeit, bei libvlc über die Dummy-Ausgabe. Gemessen wird:
+
+  Laden        Import des Moduls und Erzeugen von Instanz und Player
+  Start        play() aus dem Leerlauf bis zum ersten Block an der Ausgabe
+               (libvlc: bis get_time() > 0)
+  Wechsel      Trackwechsel während der Wiedergabe mit vorab geparstem Medium (wie im
+               AudioPlayer); enthält das Abbrechen des gerade laufenden Schreibvorgangs
+  CPU          Prozess-CPU während seconds Sekunden Wiedergabe
+  RSS          Resident Set Size danach
+
+Danach prüft ein Durchlauf Pause und Fortsetzen des nativen Backends mit der "null"-Ausgabe
+(mit und ohne Pause der Ausgabe, wie default/dmix auf dem Pi) und der WAV-Ausgabe: kein
+Fehler-Event, die Position steht während der Pause und läuft danach weiter. Schlägt das
+fehl, endet das Skript mit Exit-Code 1.
+
+Fehlt python-vlc/libvlc oder miniaudio, wird das gemeldet und übersprungen.
+
+Aufruf: python benchmarks/bench_playback_backend.py [sekunden]
+"""
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_test_file(path, seconds=20):
+    import numpy as np
+    t = np.arange(int(44100 * seconds)) / 44100
+    tone = (8000 * np.sin(2 * np.pi * 440 * t)).astype('<i2')
+    with wave.open(path, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(44100)
+        w.writeframes(np.repeat(tone, 2).tobytes())
+
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def wait_for(condition, timeout=5.0):
+    start = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError("Wiedergabe startet nicht")
+        time.sleep(0.0005)
+    return time.perf_counter() - start
+
+
+def child_native(path, seconds):
+    start = time.perf_counter()
+    from native_playback import NativeBackend, miniaudio
+    instance = NativeBackend(sink="null").Instance()
+    player = instance.media_player_new()
+    load = time.perf_counter() - start
+
+    player.set_media(instance.media_new(path))
+    player.play()
+    latency = wait_for(lambda: player.first_write_time is not None)
+
+    media = instance.media_new(path)
+    media.parse_with_options(0, 0)
+    time.sleep(0.2)
+    player.set_media(media)
+    player.play()
+    preparsed = wait_for(lambda: player.first_write_time is not None)
+
+    cpu = cpu_seconds()
+    time.sleep(seconds)
+    cpu = cpu_seconds() - cpu
+    return {"decoder": "miniaudio" if miniaudio else "wave", "load": load, "latency": latency,
+            "preparsed": preparsed, "cpu": cpu / seconds, "rss": rss_kb()}
+
+
+def child_vlc(path, seconds):
+    start = time.perf_counter()
+    import vlc
+    instance = vlc.Instance("--aout=dummy", "--no-video", "--quiet")
+    player = instance.media_player_new()
+    load = time.perf_counter() - start
+
+    player.set_media(instance.media_new(path))
+    player.play()
+    latency = wait_for(lambda: player.get_time() > 0)
+
+    media = instance.media_new(path)
+    media.parse_with_options(vlc.MediaParseFlag.local, 0)
+    time.sleep(0.2)
+    player.set_media(media)
+    player.play()
+    preparsed = wait_for(lambda: player.get_time() > 0)
+
+    cpu = cpu_seconds()
+    time.sleep(seconds)
+    cpu = cpu_seconds() - cpu
+    player.stop()
+    return {"decoder": "libvlc", "load": load, "latency": latency, "preparsed": preparsed,
+            "cpu": cpu / seconds, "rss": rss_kb()}
+
+
+def check_pause(path, wav_path):
+    """Pause und Fortsetzen mit den Test-Ausgaben. Gibt die Namen der fehlgeschlagenen zurück."""
+    from native_playback import NativeBackend, NullSink, WavFileSink
+    failed = []
+    for name, sink in (("null", NullSink()),
+                       ("null ohne Pause", NullSink(hardware_pause=False)),
+                       ("wav", WavFileSink(wav_path, realtime=True))):
+        backend = NativeBackend(sink=sink)
+        instance = backend.Instance()
+        player = instance.media_player_new()
+        events = []
+        for event_type in (backend.EventType.MediaPlayerEndReached, backend.EventType.MediaPlayerEncounteredError):
+            player.event_manager().event_attach(event_type, lambda event, event_type=event_type: events.append(event_type))
+        player.set_media(instance.media_new(path))
+        player.play()
+        time.sleep(0.5)
+        player.pause()
+        # Der Block, der gerade geschrieben wird, läuft noch aus, bis die Ausgabe pausiert
+        time.sleep(0.1)
+        paused_at = player.get_time()
+        time.sleep(0.3)
+        still = player.get_time()
+        player.pause()
+        time.sleep(0.5)
+        resumed = player.get_time()
+        player.stop()
+        sink.close()
+        ok = not events and still == paused_at and resumed >= paused_at + 300
+        if not ok:
+            failed.append(name)
+        print(f"{name:<18}{'ok' if ok else 'FEHLER':<8}pausiert bei {paused_at} ms, nach der Pause {still} ms, "
+              f"0,5 s später {resumed} ms{'  Events: ' + ', '.join(events) if events else ''}")
+    return failed
+
+
+def run_child(backend, path, seconds):
+    result = subprocess.run([sys.executable, __file__, "--child", backend, path, str(seconds)],
+                            capture_output=True, text=True)
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        error = (result.stderr.strip().splitlines() or ["unbekannter Fehler"])[-1]
+        return None, error
+    return json.loads(lines[-1]), None
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        backend, path, seconds = sys.argv[2], sys.argv[3], float(sys.argv[4])
+        result = (child_native if backend == "native" else child_vlc)(path, seconds)
+        print(json.dumps(result))
+        return
+
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    root = tempfile.mkdtemp()
+    try:
+        path = os.path.join(root, "test.wav")
+        write_test_file(path, seconds + 5)
+        print(f"{'':<10}{'Laden':>10}{'Start':>10}{'Wechsel':>12}{'CPU':>8}{'RSS':>10}")
+        for backend in ("vlc", "native"):
+            result, error = run_child(backend, path, seconds)
+            if result is None:
+                print(f"{backend:<10}nicht verfügbar: {error}")
+                continue
+            print(f"{backend:<10}{result['load'] * 1000:8.1f}ms{result['latency'] * 1000:8.1f}ms"
+                  f"{result['preparsed'] * 1000:10.1f}ms{result['cpu'] * 100:7.1f}%{result['rss'] / 1024:8.1f}MB"
+                  f"  ({result['decoder']})")
+        print("\nPause/Fortsetzen (natives Backend)")
+        failed = check_pause(path, os.path.join(root, "output.wav"))
+    finally:
+        shutil.rmtree(root)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Kosten der Profiler-Aufrufe pro Frame, ausgeschaltet und eingeschaltet.
+
+Ein Frame im Hauptloop misst sechs Stufen (input, draw, display, convert, spi, frame).
+
+Aufruf: python benchmarks/bench_profiler.py [frames]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profiler import Profiler
+
+
+def frame(profiler):
+    frame_start = profiler.start()
+    profiler.stop("input", frame_start)
+    profiler.record("draw", 0.002)
+    start = profiler.start()
+    profiler.stop("display", start)
+    profiler.record("convert", 0.0001)
+    profiler.record("spi", 0.001)
+    profiler.frame_done(frame_start)
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for enabled in (False, True):
+        profiler = Profiler(enabled=enabled)
+        start = time.perf_counter()
+        for _ in range(frames):
+            frame(profiler)
+        per_frame = (time.perf_counter() - start) / frames
+        print(f"{'an' if enabled else 'aus':<4} {per_frame * 1e6:6.2f} µs/Frame "
+              f"({per_frame * 30 * 100:.4f} % CPU bei 30 fps)")
+    start = time.perf_counter()
+    lines = profiler.report_lines()
+    print(f"Auswertung für den Debug-Screen: {(time.perf_counter() - start) * 1000:.2f} ms ({len(lines)} Zeilen)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Micro-Benchmark: alte RGB565-Umwandlung (array3d/dstack/tolist) gegen RGB565Converter,
+einmal aus einem 24-Bit-Surface und einmal aus einem 16-Bit-Surface im Panel-Format.
+
+Aufruf: python benchmarks/bench_rgb565.py [frames]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+
+from rgb565 import RGB565_MASKS, RGB565Converter
+
+WIDTH, HEIGHT = 160, 128
+
+
+def legacy_convert(screen):
+    """Der frühere Pfad aus DisplayController.update_display."""
+    arr = pygame.surfarray.array3d(screen)
+    arr = np.transpose(arr, (1, 0, 2))
+    r = arr[:, :, 0].astype(np.uint16)
+    g = arr[:, :, 1].astype(np.uint16)
+    b = arr[:, :, 2].astype(np.uint16)
+    color = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+    high = (color >> 8) & 0xFF
+    low = color & 0xFF
+    return np.dstack((high, low)).flatten().tolist()
+
+
+def converter_convert(converter, screen):
+    pixels = pygame.surfarray.pixels3d(screen)
+    converter.convert(pixels)
+    del pixels
+    return converter.pack_region(0, 0, WIDTH - 1, HEIGHT - 1)
+
+
+def converter_load_rgb565(converter, surface16):
+    pixels = pygame.surfarray.pixels2d(surface16)
+    converter.load_rgb565(pixels)
+    del pixels
+    return converter.pack_region(0, 0, WIDTH - 1, HEIGHT - 1)
+
+
+def measure(name, func, frames):
+    func()  # Aufwärmen
+    start = time.perf_counter()
+    for _ in range(frames):
+        func()
+    ms_per_frame = (time.perf_counter() - start) * 1000 / frames
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    func()
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    print(f"{name:<12} {ms_per_frame:8.3f} ms/Frame   Spitze {peak / 1024:8.1f} KiB   neue Blöcke {blocks}")
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pygame.init()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    rng = np.random.default_rng(0)
+    pygame.surfarray.blit_array(screen, rng.integers(0, 256, (WIDTH, HEIGHT, 3), dtype=np.uint8))
+
+    converter = RGB565Converter(WIDTH, HEIGHT)
+    # Beide Pfade müssen dieselben Bytes liefern
+    assert legacy_convert(screen) == converter_convert(converter, screen).tolist()
+    # Dasselbe Bild als 16-Bit-Surface (pygame rundet beim Blit genauso ab)
+    surface16 = pygame.Surface((WIDTH, HEIGHT), 0, 16, RGB565_MASKS)
+    surface16.blit(screen, (0, 0))
+    assert legacy_convert(screen) == converter_load_rgb565(converter, surface16).tolist()
+
+    print(f"{frames} Frames à {WIDTH}x{HEIGHT}")
+    measure("legacy", lambda: legacy_convert(screen), frames)
+    measure("converter", lambda: converter_convert(converter, screen), frames)
+    measure("rgb565", lambda: converter_load_rgb565(converter, surface16), frames)
+
+
+if __name__ == "__main__":
+    main()
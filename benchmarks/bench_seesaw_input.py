@@ -0,0 +1,58 @@
+"""I2C-Transaktionen und Lesezeit pro Frame: Einzel-Reads (bisher) gegen Bulk-Read und Interrupt.
+
+Ein simuliertes Seesaw-Board zählt die Transaktionen und wartet bei jedem Lesezugriff
+die Register-Verzögerung ab, wie es die Seesaw-Bibliothek auf dem Pi tut.
+
+Aufruf: python benchmarks/bench_seesaw_input.py [frames]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backends import FakeSeesaw
+from seesaw_input import SeesawInput, SELECT_PIN, RIGHT_PIN
+
+
+class IdleInterruptPin:
+    value = True  # INT nicht aktiv
+
+
+def legacy_poll(device, state):
+    """Frühere Abfolge: Encoder-Position plus fünf einzelne DigitalIO-Reads."""
+    position = device.encoder_position()
+    state["delta"], state["last"] = position - state["last"], position
+    return [not device.digital_read_bulk(1 << pin) for pin in range(SELECT_PIN, RIGHT_PIN + 1)]
+
+
+def run(name, poll, device, frames):
+    device.transactions = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        poll()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14} {elapsed * 1000 / frames:7.2f} ms/Frame   "
+          f"{device.transactions / frames:4.1f} Transaktionen/Frame   "
+          f"{device.transactions / elapsed:7.1f} Transaktionen/s")
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    device = FakeSeesaw()
+    state = {"last": 0, "delta": 0}
+    run("einzeln", lambda: legacy_poll(device, state), device, frames)
+
+    device = FakeSeesaw()
+    bulk = SeesawInput(device=device)
+    run("Bulk-Read", bulk.poll, device, frames)
+
+    device = FakeSeesaw()
+    interrupt = SeesawInput(device=device)
+    interrupt.interrupt = IdleInterruptPin()
+    run("Interrupt", interrupt.poll, device, frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Startzeit: der frühere sequentielle Ablauf gegen den parallelen Start aus main.start_app.
+
+Die Attrappen bilden die Wartezeiten nach, die auf dem Pi anfallen: Reset-Sequenz des
+Displays (echte time.sleep-Aufrufe im DisplayController), DAC-Reset und PLL-Konfiguration,
+das Laden der libvlc-Plugins und der Seesaw-Test über I2C. Gemessen werden die Zeit bis
+zum ersten Frame auf dem Panel und bis der Player bedienbar ist.
+
+Aufruf: python benchmarks/bench_startup.py [dac_ms] [vlc_ms]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from audio_player import AudioPlayer
+from bench_library_index import make_library
+from display_controller import DisplayController
+from fake_backends import FakeDAC, FakeGPIO, FakeInstance, FakeSPI, FakeSeesaw, fake_vlc
+from main import DC_PIN, HEIGHT, RESET_PIN, WIDTH, MusicPlayerApp, start_app
+from seesaw_input import SeesawInput
+from startup import Startup
+
+DAC_SECONDS = (float(sys.argv[1]) if len(sys.argv) > 1 else 60.0) / 1000
+VLC_SECONDS = (float(sys.argv[2]) if len(sys.argv) > 2 else 400.0) / 1000
+
+
+def factories(folder):
+    def create_dac():
+        time.sleep(DAC_SECONDS)
+        return FakeDAC()
+
+    return (
+        lambda: DisplayController(WIDTH, HEIGHT, DC_PIN, RESET_PIN, spi=FakeSPI(), gpio=FakeGPIO()),
+        create_dac,
+        lambda: AudioPlayer(folder, vlc_instance=FakeInstance(init_seconds=VLC_SECONDS), vlc_module=fake_vlc),
+        lambda: SeesawInput(device=FakeSeesaw()),
+    )
+
+
+def sequential(folder):
+    """Reihenfolge wie früher in main.py: DAC, Player, Display, Seesaw, danach der erste Frame."""
+    boot = Startup()
+    create_display, create_dac, create_player, create_input = factories(folder)
+    pygame.init()
+    dac = create_dac()
+    audio_player = create_player()
+    display_controller = create_display()
+    seesaw_input = create_input()
+    app = MusicPlayerApp(audio_player, display_controller, seesaw_input, dac, async_display=False)
+    boot.mark("playable")
+    app.step()
+    boot.mark("first_frame")
+    return boot, app
+
+
+def staged(folder):
+    boot = Startup()
+    app = start_app(boot, *factories(folder), async_display=False)
+    return boot, app
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        folder = os.path.join(root, "music")
+        make_library(folder, 200)
+        print(f"DAC {DAC_SECONDS * 1000:.0f} ms, libvlc {VLC_SECONDS * 1000:.0f} ms")
+        for name, run in (("sequentiell", sequential), ("parallel", staged)):
+            boot, app = run(folder)
+            print(f"{name:<12} erster Frame {boot.marks['first_frame'] * 1000:7.1f} ms   "
+                  f"bedienbar {boot.marks['playable'] * 1000:7.1f} ms")
+            app.shutdown()
+            app.audio_player.wait_for_scan()
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Render-Zeit pro Frame mit und ohne Text-Cache sowie dessen Trefferquote.
+
+Zwei Szenarien:
+- Sitzung: Songliste mit wanderndem Cursor, danach der Play-Screen mit laufender Zeit
+  (die Zeitanzeige ändert sich einmal pro Sekunde, also alle 30 Frames).
+- Lange Titel: volle Songliste mit langen Titeln samt Umlauten, der Cursor steht und der
+  Lauftext der ausgewählten Zeile scrollt, die Liste wird also jeden Frame neu gezeichnet.
+  Ohne Cache wird dabei jede sichtbare Zeile in voller Länge neu gerendert.
+
+Dazu der Speicher, den die gecachten Surfaces belegen.
+
+Aufruf: python benchmarks/bench_text_cache.py [frames]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from text_cache import TextCache
+from user_interface import UserInterface
+
+WIDTH, HEIGHT = 160, 128
+
+
+def session(ui, screen, files, frames):
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Der Cursor bewegt sich alle 10 Frames eine Zeile weiter
+        ui.draw_all_songs_menu(screen, files, (frame // 10) % len(files), 0, False, 0)
+    for frame in range(frames):
+        elapsed = frame / 30
+        ui.draw_play_menu(screen, "Ein ziemlich langer Songtitel zum Scrollen", elapsed / 200, elapsed, 200,
+                          True, frame * 2, 0.5, 0, 1.0)
+    return (time.perf_counter() - start) * 1000 / (2 * frames)
+
+
+def long_titles(ui, screen, files, frames):
+    start = time.perf_counter()
+    for frame in range(frames):
+        ui.draw_all_songs_menu(screen, files, 40, 0, False, frame * 2)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def cached_bytes(cache):
+    return sum(s.get_width() * s.get_height() * s.get_bytesize() for s in cache._surfaces.values())
+
+
+def compare(name, scenario, screen, files, frames):
+    print(name)
+    ui = UserInterface(WIDTH, HEIGHT)
+    ui.text_cache = TextCache(max_entries=0)
+    print(f"  ohne Cache: {scenario(ui, screen, files, frames):7.3f} ms/Frame")
+
+    ui = UserInterface(WIDTH, HEIGHT)
+    ms = scenario(ui, screen, files, frames)
+    cache = ui.text_cache
+    print(f"  mit Cache:  {ms:7.3f} ms/Frame   Trefferquote {cache.hit_rate * 100:5.1f} %   "
+          f"{len(cache._surfaces)} Surfaces, {cached_bytes(cache) / 1024:.0f} KiB")
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    pygame.init()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+
+    files = [f"Interpret {i % 30} - Titel {i:04d}.mp3" for i in range(500)]
+    compare("Sitzung", session, screen, files, frames)
+
+    files = [f"Die Ärzte & Gäste - Live im Großen Saal ({i % 12} Zugaben) - Übermäßig lange Fassung {i:04d}.mp3"
+             for i in range(500)]
+    compare("Lange Titel", long_titles, screen, files, frames)
+
+
+if __name__ == "__main__":
+    main()
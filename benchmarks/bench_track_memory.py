@@ -0,0 +1,56 @@
+"""Speicherbedarf pro 10.000 Tracks: Liste von Dicts (bisher) gegen TrackLibrary.
+
+Aufruf: python benchmarks/bench_track_memory.py [anzahl_tracks]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from track_library import TrackLibrary
+
+
+def tags(i):
+    # Wie bei mutagen entsteht für jeden Track ein eigenes String-Objekt
+    return f"Interpret {i % 400}", f"Album {i % 1000}", 180.0 + i % 60
+
+
+def build_dicts(files):
+    audio_files = list(files)
+    metadata = []
+    for i, file in enumerate(audio_files):
+        artist, album, _ = tags(i)
+        metadata.append({'file': file, 'artist': artist, 'album': album, 'original_index': i})
+    durations = {file: tags(i)[2] for i, file in enumerate(audio_files)}
+    return audio_files, metadata, durations
+
+
+def build_table(files):
+    audio_files = list(files)
+    library = TrackLibrary(audio_files)
+    for i in range(len(audio_files)):
+        library.set_track_info(i, *tags(i))
+    return audio_files, library
+
+
+def measure(build, files):
+    tracemalloc.start()
+    result = build(files)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    files = [f"Interpret {i % 400} - Titel {i:05d}.mp3" for i in range(count)]
+    scale = 10000 / count
+    for name, build in (("Dicts", build_dicts), ("TrackLibrary", build_table)):
+        used = measure(build, files)
+        print(f"{name:<13} {used / 1024:9.1f} KiB gesamt   {used * scale / 1024:9.1f} KiB pro 10k Tracks")
+
+
+if __name__ == "__main__":
+    main()
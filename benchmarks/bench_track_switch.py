@@ -0,0 +1,75 @@
+"""Misst die Umschaltzeit zwischen Tracks mit einem simulierten libvlc-Backend.
+
+Das Fake-Backend bildet die Kosten nach, die auf dem Pi anfallen: media_new ist billig,
+das erste Abspielen eines ungeparsten Mediums muss die Datei erst öffnen und analysieren.
+Gemessen werden next_song/previous_song und die Lücke zwischen Songende-Event und
+dem Start des nächsten Tracks.
+
+Aufruf: python benchmarks/bench_track_switch.py [parse_ms]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_player import AudioPlayer
+from bench_library_index import make_library
+from fake_backends import FakeInstance, fake_vlc
+
+PARSE_SECONDS = (float(sys.argv[1]) if len(sys.argv) > 1 else 30.0) / 1000
+
+
+def stats(samples):
+    samples = sorted(samples)
+    return f"Median {samples[len(samples) // 2] * 1000:7.2f} ms   Max {samples[-1] * 1000:7.2f} ms"
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        folder = os.path.join(root, "music")
+        make_library(folder, 50)
+        player = AudioPlayer(folder, vlc_instance=FakeInstance(parse_seconds=PARSE_SECONDS), vlc_module=fake_vlc)
+        player.wait_for_scan()
+        fake = player.player
+
+        player.play_song(0)
+        time.sleep(PARSE_SECONDS * 2)  # Vorladen abwarten
+
+        for name, switch in (("next_song", player.next_song), ("previous_song", player.previous_song)):
+            samples = []
+            for _ in range(20):
+                start = time.perf_counter()
+                switch()
+                samples.append(time.perf_counter() - start)
+                time.sleep(PARSE_SECONDS * 2)
+            print(f"{name:<14} {stats(samples)}")
+
+        # Direkter Sprung ohne vorgeladenes Medium zum Vergleich
+        samples = []
+        for i in range(10):
+            start = time.perf_counter()
+            player.play_song(player.current_index + 10)
+            samples.append(time.perf_counter() - start)
+            time.sleep(PARSE_SECONDS * 2)
+        print(f"{'Sprung (kalt)':<14} {stats(samples)}")
+
+        # Lücke: Songende-Event bis zum Start des nächsten Tracks
+        samples = []
+        for _ in range(20):
+            fake.started.clear()
+            start = time.perf_counter()
+            fake.events.fire(fake_vlc.EventType.MediaPlayerEndReached)
+            fake.started.wait()
+            samples.append(time.perf_counter() - start)
+            time.sleep(PARSE_SECONDS * 2)
+        print(f"{'Lücke am Ende':<14} {stats(samples)}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
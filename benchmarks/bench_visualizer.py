@@ -0,0 +1,118 @@
+"""CPU-Kosten des Spektrum-Visualizers pro Analyse und im laufenden Betrieb.
+
+  Analyse      SpectrumAnalyzer.analyze (Fenster, rfft, Bänder, dB) für mehrere FFT-Größen,
+               zum Vergleich eine naive Variante (Fenster und Bandgrenzen bei jedem Aufruf,
+               Bänder in einer Python-Schleife)
+  Betrieb      Visualizer-Thread bei max_rate, gespeist mit 44,1 kHz Stereo in 512er-Perioden:
+               Anteil der Analysezeit an der Laufzeit, danach simulierte Überlast (at_risk)
+               und die Rate, auf die er zurückgeht
+  Zeichnen     UserInterface.draw_visualizer in das 16-Bit-Surface
+
+Aufruf: python benchmarks/bench_visualizer.py
+"""
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+
+from main import HEIGHT, VISUALIZER_RECT, WIDTH
+from rgb565 import RGB565_MASKS
+from user_interface import UserInterface
+from visualizer import PCMTap, SpectrumAnalyzer, Visualizer
+
+SAMPLE_RATE = 44100
+
+
+def test_signal(count, offset=0):
+    t = (np.arange(count) + offset) / SAMPLE_RATE
+    mix = 0.4 * np.sin(2 * np.pi * 110 * t) + 0.2 * np.sin(2 * np.pi * 1500 * t) + 0.05 * np.random.randn(count)
+    return (mix * 32767).astype(np.float32)
+
+
+def naive_analyze(samples, bands, min_freq=60.0, max_freq=16000.0):
+    window = np.hanning(len(samples))
+    spectrum = np.abs(np.fft.rfft(samples * window)) ** 2
+    frequencies = np.fft.rfftfreq(len(samples), 1.0 / SAMPLE_RATE)
+    edges = np.geomspace(min_freq, max_freq, bands + 1)
+    levels = []
+    for low, high in zip(edges[:-1], edges[1:]):
+        values = [p for f, p in zip(frequencies, spectrum) if low <= f < high] or [0.0]
+        levels.append(10 * np.log10(sum(values) / len(values) + 1e-12))
+    return levels
+
+
+def per_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def feed(tap, running):
+    """Schreibt Stereo-Perioden in Echtzeit in den Tap, wie eine Audioquelle."""
+    offset = 0
+    period = 512
+    while running.is_set():
+        mono = test_signal(period, offset).astype(np.int16)
+        tap.write(np.repeat(mono, 2))
+        offset += period
+        time.sleep(period / SAMPLE_RATE)
+
+
+def main():
+    print("Analyse pro Frame:")
+    for fft_size in (512, 1024, 2048):
+        for bands in (16, 32):
+            analyzer = SpectrumAnalyzer(SAMPLE_RATE, fft_size, bands)
+            samples = test_signal(fft_size)
+            fast = per_call(lambda: analyzer.analyze(samples), 2000)
+            naive = per_call(lambda: naive_analyze(samples, bands), 20)
+            print(f"  FFT {fft_size:5d}, {bands:2d} Bänder   {fast * 1e6:7.1f} µs   naiv {naive * 1e6:9.1f} µs")
+
+    tap = PCMTap()
+    running = threading.Event()
+    running.set()
+    feeder = threading.Thread(target=feed, args=(tap, running), daemon=True)
+    feeder.start()
+    overload = threading.Event()
+    visualizer = Visualizer(tap, at_risk=overload.is_set, recover=1.0)
+    visualizer.start()
+    visualizer.set_active(True)
+
+    time.sleep(0.2)
+    analyses = visualizer.analyses
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    time.sleep(3.0)
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    count = visualizer.analyses - analyses
+    print(f"Betrieb: {count / wall:.1f} Analysen/s, letzte Analyse {visualizer.last_analysis_time * 1e6:.0f} µs, "
+          f"Prozess-CPU (inkl. Einspeisung) {cpu / wall * 100:.1f} %")
+
+    overload.set()
+    time.sleep(1.0)
+    print(f"Überlast: Rate {visualizer.rate:.1f}/s (min {visualizer.min_rate:.0f})")
+    overload.clear()
+    time.sleep(4.0)
+    print(f"danach:   Rate {visualizer.rate:.1f}/s (max {visualizer.max_rate:.0f})")
+    visualizer.stop()
+    running.clear()
+    feeder.join()
+
+    pygame.init()
+    ui = UserInterface(WIDTH, HEIGHT, rgb565=True)
+    screen = pygame.Surface((WIDTH, HEIGHT), 0, 16, RGB565_MASKS)
+    levels = visualizer.analyzer.levels
+    draw = per_call(lambda: ui.draw_visualizer(screen, levels, VISUALIZER_RECT), 2000)
+    print(f"Zeichnen: {draw * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Loop-Zeit während eines schnellen Lautstärke-Sweeps: amixer pro Detent gegen VolumeController.
+
+Der alte Weg startet für jede Änderung amixer. Auf Rechnern ohne alsa-utils wird
+stattdessen "true" gestartet; das misst nur fork+exec ohne die Arbeit von amixer und wird
+daher als Untergrenze ausgewiesen, nicht als amixer-Zeit. Der neue Weg schreibt in einem
+eigenen Thread in ein simuliertes DAC-Register mit 1 ms I2C-Dauer.
+
+Aufruf: python benchmarks/bench_volume_sweep.py [frames]
+"""
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_backends import FakeDAC
+from volume_control import VolumeController
+
+FRAME_WORK = 0.005  # Übrige Arbeit pro Frame (Zeichnen usw.)
+
+
+def sweep(set_volume, frames):
+    """Jeder Frame dreht den Encoder um einen Detent."""
+    samples = []
+    volume = 0.0
+    for i in range(frames):
+        start = time.perf_counter()
+        volume = (i % 20) / 20
+        set_volume(volume)
+        time.sleep(FRAME_WORK)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000, samples[-1] * 1000
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    if shutil.which("amixer"):
+        def spawn(volume):
+            subprocess.run(["amixer", "-q", "set", "Master", f"{int(volume * 100)}%"], capture_output=True)
+        label = "amixer"
+    else:
+        def spawn(volume):
+            subprocess.run(["true"], capture_output=True)
+        label = "fork+exec"
+        print("amixer nicht gefunden, der alte Weg wird nur als Untergrenze (fork+exec von true) gemessen")
+
+    median, worst = sweep(spawn, frames)
+    print(f"{label:<18} Median {median:6.2f} ms/Frame   Max {worst:6.2f} ms"
+          + ("   (Untergrenze für amixer)" if label == "fork+exec" else ""))
+
+    controller = VolumeController(FakeDAC(write_time=0.001))
+    median, worst = sweep(controller.set_volume, frames)
+    time.sleep(0.1)
+    print(f"{'VolumeController':<18} Median {median:6.2f} ms/Frame   Max {worst:6.2f} ms   "
+          f"({controller.requests} Anfragen, {controller.writes} Schreibzugriffe)")
+
+
+if __name__ == "__main__":
+    main()
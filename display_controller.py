@@ -1,11 +1,23 @@
 import time
-import spidev
-import lgpio
+import threading
 import numpy as np
 import pygame
 
+from rgb565 import RGB565Converter
+from profiler import profiler
+
+# Ohne spidev/lgpio (z.B. am PC) nur mit übergebenen Backends nutzbar, siehe fake_backends
+try:
+    import spidev
+except ImportError:
+    spidev = None
+try:
+    import lgpio
+except ImportError:
+    lgpio = None
+
 class DisplayController:
-    def __init__(self, width, height, dc_pin, reset_pin):
+    def __init__(self, width, height, dc_pin, reset_pin, spi=None, gpio=None):
         self.width = width
         self.height = height
         self.dc_pin = dc_pin
@@ -21,24 +33,60 @@ class DisplayController:
         self.RASET   = 0x2B  
         self.RAMWR   = 0x2C  
 
-        # SPI und GPIO initialisieren
-        self.spi = spidev.SpiDev()
+        # Partielles Neuzeichnen: Ab diesem Anteil geänderter Fläche wird der ganze Frame gesendet
+        self.FULL_REFRESH_RATIO = 0.6
+        # Maximale Lücke (in Zeilen), die noch zu einem Rechteck zusammengefasst wird
+        self.DIRTY_ROW_GAP = 4
+        self.last_frame = None
+        self.last_frame_bytes = 0
+        self.bytes_sent = 0
+        self.spi_transfers = 0
+        self.converter = RGB565Converter(width, height)
+
+        # Asynchroner Modus: Doppelpuffer für Roh-Pixel und Sende-Thread
+        self.frames_produced = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self._sender = None
+        self._running = False
+        self._frame_ready = threading.Condition()
+        self._pending = None
+        self._working = None
+        self._has_pending = False
+        self._pending_full = False
+        # Dauer von Umrechnung und Übertragung des letzten Frames (Sekunden)
+        self.last_convert_time = 0.0
+        self.last_flush_time = 0.0
+
+        # SPI und GPIO initialisieren (spi: spidev.SpiDev-kompatibel, gpio: lgpio-kompatibel)
+        if spi is None:
+            if spidev is None:
+                raise RuntimeError("spidev nicht gefunden, bitte ein SPI-Backend übergeben")
+            spi = spidev.SpiDev()
+        self.spi = spi
         self.spi.open(0, 0)
         self.spi.max_speed_hz = 4000000  
         self.spi.mode = 0b00
 
-        self.h = lgpio.gpiochip_open(0)
-        lgpio.gpio_claim_output(self.h, self.dc_pin)
-        lgpio.gpio_claim_output(self.h, self.reset_pin)
+        if gpio is None:
+            if lgpio is None:
+                raise RuntimeError("lgpio nicht gefunden, bitte ein GPIO-Backend übergeben")
+            gpio = lgpio
+        self.gpio = gpio
+        self.h = self.gpio.gpiochip_open(0)
+        self.gpio.gpio_claim_output(self.h, self.dc_pin)
+        self.gpio.gpio_claim_output(self.h, self.reset_pin)
 
         self.init_display()
 
     def send_command(self, cmd, data=None):
-        lgpio.gpio_write(self.h, self.dc_pin, 0)  # Befehl-Modus
+        self.gpio.gpio_write(self.h, self.dc_pin, 0)  # Befehl-Modus
         self.spi.xfer([cmd])
+        self.spi_transfers += 1
         if data is not None:
-            lgpio.gpio_write(self.h, self.dc_pin, 1)  # Daten-Modus
+            self.gpio.gpio_write(self.h, self.dc_pin, 1)  # Daten-Modus
             self.spi.xfer(data)
+            self.spi_transfers += 1
 
     def set_rotation(self, rotation):
         rotations = [0x00, 0x60, 0xC0, 0xA0]
@@ -51,9 +99,9 @@ class DisplayController:
 
     def init_display(self):
         # Hardware-Reset
-        lgpio.gpio_write(self.h, self.reset_pin, 0)
+        self.gpio.gpio_write(self.h, self.reset_pin, 0)
         time.sleep(0.1)
-        lgpio.gpio_write(self.h, self.reset_pin, 1)
+        self.gpio.gpio_write(self.h, self.reset_pin, 1)
         time.sleep(0.1)
 
         self.send_command(self.SWRESET)
@@ -64,22 +112,135 @@ class DisplayController:
         self.set_rotation(1)
         self.send_command(self.DISPON)
         time.sleep(0.1)
+        # Nach einem Reset ist der Panel-Inhalt unbekannt
+        self.last_frame = None
+
+    def start_async(self):
+        """Startet den Sende-Thread. Danach kehrt update_display sofort zurück."""
+        if self._sender is not None:
+            return
+        # Die Puffer werden beim ersten Frame passend zum Surface-Format angelegt
+        self._pending = None
+        self._working = None
+        self._has_pending = False
+        self._running = True
+        self._sender = threading.Thread(target=self._sender_loop, name="display-sender", daemon=True)
+        self._sender.start()
+
+    def stop_async(self):
+        """Beendet den Sende-Thread, ein noch wartender Frame wird vorher gesendet."""
+        if self._sender is None:
+            return
+        with self._frame_ready:
+            self._running = False
+            self._frame_ready.notify()
+        self._sender.join()
+        self._sender = None
+
+    def update_display(self, screen, force_full=False):
+        # Direkter Zugriff auf die Pixel der Surface (keine Kopie). Ein 16-Bit-Surface
+        # enthält bereits RGB565 und muss nicht mehr umgerechnet werden.
+        if screen.get_bitsize() == 16:
+            pixels = pygame.surfarray.pixels2d(screen)
+        else:
+            pixels = pygame.surfarray.pixels3d(screen)
+        if self._sender is not None:
+            self._submit(pixels, force_full)
+        else:
+            self._flush(pixels, force_full)
+            self.frames_produced += 1
+            self.frames_sent += 1
+        del pixels  # Surface wieder freigeben
+
+    def _submit(self, pixels, force_full):
+        """Legt den Frame im Doppelpuffer ab, ein noch nicht gesendeter Frame wird ersetzt."""
+        with self._frame_ready:
+            if self._pending is None or self._pending.shape != pixels.shape or self._pending.dtype != pixels.dtype:
+                self._pending = np.empty(pixels.shape, dtype=pixels.dtype)
+            np.copyto(self._pending, pixels)
+            if self._has_pending:
+                self.frames_dropped += 1
+            self._has_pending = True
+            self._pending_full = self._pending_full or force_full
+            self.frames_produced += 1
+            self._frame_ready.notify()
+
+    def _sender_loop(self):
+        while True:
+            with self._frame_ready:
+                while self._running and not self._has_pending:
+                    self._frame_ready.wait()
+                if not self._has_pending:
+                    return
+                # Puffer tauschen, damit der Hauptloop sofort weiterschreiben kann
+                frame = self._pending
+                self._pending = self._working
+                self._working = frame
+                force_full = self._pending_full
+                self._has_pending = False
+                self._pending_full = False
+            self._flush(frame, force_full)
+            self.frames_sent += 1
+
+    def _flush(self, pixels, force_full):
+        start = time.perf_counter()
+        if pixels.ndim == 2:
+            self.converter.load_rgb565(pixels)
+        else:
+            self.converter.convert(pixels)
+        converted = time.perf_counter()
+
+        # Nur geänderte Bereiche übertragen (Dirty Rectangles)
+        if force_full or self.last_frame is None:
+            boxes = [(0, 0, self.width - 1, self.height - 1)]
+        else:
+            boxes = self._dirty_boxes(self.converter.diff())
+            dirty_area = sum((x1 - x0 + 1) * (y1 - y0 + 1) for x0, y0, x1, y1 in boxes)
+            # Wenn sich der Großteil geändert hat, ist ein kompletter Push günstiger
+            if dirty_area > self.width * self.height * self.FULL_REFRESH_RATIO:
+                boxes = [(0, 0, self.width - 1, self.height - 1)]
+
+        self.last_frame_bytes = 0
+        for x0, y0, x1, y1 in boxes:
+            self._send_region(x0, y0, x1, y1)
+        self.converter.swap()
+        self.last_frame = self.converter.last_frame
+        self.last_convert_time = converted - start
+        self.last_flush_time = time.perf_counter() - converted
+        profiler.record("convert", self.last_convert_time)
+        profiler.record("spi", self.last_flush_time)
+
+    def invalidate(self):
+        """Erzwingt beim nächsten update_display eine komplette Übertragung."""
+        self.last_frame = None
 
-    def update_display(self, screen):
-        # Hole die Pixel-Daten als NumPy-Array
-        arr = pygame.surfarray.array3d(screen)
-        # Transponiere, damit die Dimensionen (Höhe, Breite, 3) stimmen
-        arr = np.transpose(arr, (1, 0, 2))
-        r = arr[:, :, 0].astype(np.uint16)
-        g = arr[:, :, 1].astype(np.uint16)
-        b = arr[:, :, 2].astype(np.uint16)
-        color = ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
-        high = (color >> 8) & 0xFF
-        low = color & 0xFF
-        rgb565 = np.dstack((high, low)).flatten().tolist()
-        self.set_window(0, 0, self.width - 1, self.height - 1)
-        lgpio.gpio_write(self.h, self.dc_pin, 1)
-        CHUNK_SIZE = 4096
-        for i in range(0, len(rgb565), CHUNK_SIZE):
-            self.spi.xfer2(rgb565[i:i+CHUNK_SIZE])
+    def _dirty_boxes(self, changed):
+        """Fasst geänderte Pixel zu Rechtecken (x0, y0, x1, y1) zusammen."""
+        rows = np.flatnonzero(changed.any(axis=1))
+        if rows.size == 0:
+            return []
+        # Zeilen mit kleinen Lücken zu Bändern zusammenfassen, jedes Fenster kostet
+        # drei Befehle, daher lohnen sich viele kleine Rechtecke nicht
+        splits = np.flatnonzero(np.diff(rows) > self.DIRTY_ROW_GAP) + 1
+        boxes = []
+        for band in np.split(rows, splits):
+            y0, y1 = int(band[0]), int(band[-1])
+            cols = np.flatnonzero(changed[y0:y1 + 1].any(axis=0))
+            boxes.append((int(cols[0]), y0, int(cols[-1]), y1))
+        return boxes
 
+    def _send_region(self, x0, y0, x1, y1):
+        data = self.converter.pack_region(x0, y0, x1, y1)
+        self.set_window(x0, y0, x1, y1)
+        self.gpio.gpio_write(self.h, self.dc_pin, 1)
+        if hasattr(self.spi, "writebytes2"):
+            # writebytes2 nimmt den Puffer direkt und teilt ihn selbst in Blöcke auf
+            self.spi.writebytes2(data)
+            self.spi_transfers += 1
+        else:
+            CHUNK_SIZE = 4096
+            for i in range(0, len(data), CHUNK_SIZE):
+                self.spi.xfer2(data[i:i+CHUNK_SIZE].tolist())
+                self.spi_transfers += 1
+        self.last_frame_bytes += len(data)
+        self.bytes_sent += len(data)
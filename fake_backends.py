@@ -0,0 +1,300 @@
+"""Hardware-Attrappen, mit denen der Player ohne Pi laufen kann (Benchmarks, Debugging am PC).
+
+Jede Klasse bildet nur die Schnittstelle nach, die der Player tatsächlich benutzt, und zählt
+mit, was auf dem Bus landen würde:
+
+    FakeSPI      spidev.SpiDev      (gesendete Bytes und Transfers)
+    FakeGPIO     lgpio              (Pin-Schreibvorgänge, Flanken-Alerts für die INT-Leitung)
+    FakeSeesaw   adafruit_seesaw    (I2C-Transaktionen, per press/release/rotate steuerbar)
+    FakeDAC      adafruit_tlv320    (Register-Schreibvorgänge)
+    fake_vlc     vlc                (Modul mit Instance, EventType und MediaParseFlag)
+"""
+import threading
+import time
+import types
+
+from seesaw_input import SELECT_PIN, UP_PIN, LEFT_PIN, DOWN_PIN, RIGHT_PIN
+
+BUTTON_PINS = {"select": SELECT_PIN, "up": UP_PIN, "left": LEFT_PIN, "down": DOWN_PIN, "right": RIGHT_PIN}
+
+
+class FakeSPI:
+    """spidev.SpiDev-Ersatz. Mit simulate_timing dauert jeder Transfer so lange wie bei max_speed_hz."""
+
+    def __init__(self, simulate_timing=False):
+        self.simulate_timing = simulate_timing
+        self.max_speed_hz = 0
+        self.mode = 0
+        self.bytes_written = 0
+        self.transfers = 0
+
+    def open(self, bus, device):
+        pass
+
+    def close(self):
+        pass
+
+    def _write(self, count):
+        self.transfers += 1
+        self.bytes_written += count
+        if self.simulate_timing and self.max_speed_hz:
+            time.sleep(count * 8 / self.max_speed_hz)
+
+    def xfer(self, data):
+        self._write(len(data))
+        return [0] * len(data)
+
+    xfer2 = xfer
+
+    def writebytes2(self, data):
+        self._write(len(data))
+
+
+class FakeGPIO:
+    """lgpio-Ersatz (die Funktionen werden wie beim Modul über das Objekt aufgerufen)."""
+
+    FALLING_EDGE = 2
+    SET_PULL_UP = 32
+
+    def __init__(self):
+        self.levels = {}
+        self.writes = 0
+        self._alerts = {}
+
+    def gpiochip_open(self, chip):
+        return chip
+
+    def gpiochip_close(self, handle):
+        pass
+
+    def gpio_claim_output(self, handle, pin, level=0):
+        self.levels[pin] = level
+
+    def gpio_write(self, handle, pin, level):
+        self.writes += 1
+        self.levels[pin] = level
+
+    def gpio_claim_alert(self, handle, pin, edge, flags=0):
+        self.levels[pin] = 1 if flags & self.SET_PULL_UP else 0
+
+    def callback(self, handle, pin, edge, func):
+        self._alerts.setdefault(pin, []).append(func)
+        return types.SimpleNamespace(cancel=lambda: self._alerts[pin].remove(func))
+
+    def gpio_read(self, handle, pin):
+        return self.levels.get(pin, 0)
+
+    # --- Steuerung ---
+    def set_input(self, pin, level):
+        """Pegel eines Eingangs von außen setzen (z.B. INT des FakeSeesaw), meldet fallende Flanken."""
+        falling = self.levels.get(pin, 0) and not level
+        self.levels[pin] = level
+        if falling:
+            for func in list(self._alerts.get(pin, ())):
+                func(0, pin, level, time.monotonic_ns())
+
+
+class FakeSeesaw:
+    """adafruit_seesaw.Seesaw-Ersatz für Encoder und Buttons.
+
+    Jeder Lesezugriff wartet bus_time plus die angefragte Register-Verzögerung ab, wie
+    die Seesaw-Bibliothek auf dem Pi. press/release/rotate dürfen aus einem anderen Thread
+    aufgerufen werden (Skripte in den Benchmarks).
+    """
+
+    INPUT_PULLUP = 2
+
+    def __init__(self, bus_time=0.0005):
+        self.bus_time = bus_time
+        self.transactions = 0
+        self.position = 0
+        self._pressed = 0
+        self._delta = 0
+        self._lock = threading.Lock()
+        # INT-Leitung (FakeGPIO und Pin), siehe connect_interrupt
+        self._interrupt = None
+        self._interrupts_enabled = False
+
+    def connect_interrupt(self, gpio, pin):
+        """INT an einen FakeGPIO-Eingang anschließen: Änderungen ziehen ihn auf low, bis das
+        Interrupt-Flag gelesen wird."""
+        self._interrupt = (gpio, pin)
+
+    def _signal(self):
+        if self._interrupt is not None and self._interrupts_enabled:
+            gpio, pin = self._interrupt
+            gpio.set_input(pin, 0)
+
+    def _transaction(self, delay):
+        self.transactions += 1
+        time.sleep(self.bus_time + delay)
+
+    # --- Steuerung ---
+    def press(self, button):
+        with self._lock:
+            self._pressed |= 1 << BUTTON_PINS[button]
+        self._signal()
+
+    def release(self, button):
+        with self._lock:
+            self._pressed &= ~(1 << BUTTON_PINS[button])
+        self._signal()
+
+    def rotate(self, steps):
+        with self._lock:
+            self._delta += steps
+            self.position += steps
+        self._signal()
+
+    # --- Seesaw-Schnittstelle ---
+    def get_version(self):
+        return 5740 << 16
+
+    def pin_mode_bulk(self, pins, mode):
+        pass
+
+    def pin_mode(self, pin, mode):
+        pass
+
+    def set_GPIO_interrupts(self, pins, enabled):
+        self._interrupts_enabled = enabled
+
+    def enable_encoder_interrupt(self):
+        self._interrupts_enabled = True
+
+    def get_GPIO_interrupt_flag(self, delay=0.008):
+        self._transaction(delay)
+        if self._interrupt is not None:
+            gpio, pin = self._interrupt
+            gpio.set_input(pin, 1)
+        return 0
+
+    def digital_read_bulk(self, pins, delay=0.008):
+        self._transaction(delay)
+        # Gedrückte Buttons ziehen den Pin auf Masse
+        return pins & ~self._pressed
+
+    def encoder_position(self):
+        self._transaction(0.008)
+        return self.position
+
+    def encoder_delta(self):
+        self._transaction(0.008)
+        with self._lock:
+            delta, self._delta = self._delta, 0
+        return delta
+
+
+class FakeDAC:
+    """TLV320DAC3100-Ersatz, jeder Zugriff auf dac_volume dauert write_time Sekunden."""
+
+    def __init__(self, write_time=0.0):
+        self.write_time = write_time
+        self.headphone_output = False
+        self.speaker_output = False
+        self.volume_writes = 0
+        self._volume = 0.0
+
+    def configure_clocks(self, sample_rate=44100, bit_depth=16):
+        pass
+
+    @property
+    def dac_volume(self):
+        return self._volume
+
+    @dac_volume.setter
+    def dac_volume(self, db):
+        if self.write_time:
+            time.sleep(self.write_time)
+        self.volume_writes += 1
+        self._volume = db
+
+
+# --- libvlc ---
+
+class FakeMedia:
+    def __init__(self, path, parse_seconds=0.0):
+        self.path = path
+        self.parse_seconds = parse_seconds
+        self.parsed = False
+
+    def parse_with_options(self, flags, timeout):
+        # libvlc parst im Hintergrund, hier genügt ein Thread
+        def parse():
+            time.sleep(self.parse_seconds)
+            self.parsed = True
+        threading.Thread(target=parse, daemon=True).start()
+
+    def release(self):
+        pass
+
+
+class FakeEventManager:
+    def __init__(self):
+        self.callbacks = {}
+
+    def event_attach(self, event_type, callback):
+        self.callbacks[event_type] = callback
+
+    def fire(self, event_type, **fields):
+        """Löst ein Event aus, fields landen wie bei libvlc in event.u."""
+        event = types.SimpleNamespace(u=types.SimpleNamespace(**fields))
+        self.callbacks[event_type](event)
+
+
+class FakePlayer:
+    """MediaPlayer-Ersatz: ein noch nicht geparstes Medium kostet beim Abspielen parse_seconds."""
+
+    def __init__(self):
+        self.events = FakeEventManager()
+        self.media = None
+        self.playing = False
+        self.started = threading.Event()
+
+    def event_manager(self):
+        return self.events
+
+    def set_media(self, media):
+        self.media = media
+
+    def play(self):
+        if not self.media.parsed:
+            time.sleep(self.media.parse_seconds)
+            self.media.parsed = True
+        self.playing = True
+        self.started.set()
+
+    def pause(self):
+        self.playing = not self.playing
+
+    def stop(self):
+        self.playing = False
+
+    def get_time(self):
+        return 0
+
+    def set_time(self, ms):
+        pass
+
+
+class FakeInstance:
+    """libvlc-Instanz; init_seconds bildet das Laden der Plugins beim Erzeugen nach."""
+
+    def __init__(self, *args, parse_seconds=0.0, init_seconds=0.0):
+        if init_seconds:
+            time.sleep(init_seconds)
+        self.parse_seconds = parse_seconds
+        self.player = FakePlayer()
+
+    def media_player_new(self):
+        return self.player
+
+    def media_new(self, path):
+        return FakeMedia(path, self.parse_seconds)
+
+
+fake_vlc = types.ModuleType("vlc")
+fake_vlc.Instance = FakeInstance
+fake_vlc.EventType = types.SimpleNamespace(
+    MediaPlayerEndReached="end", MediaPlayerTimeChanged="time", MediaPlayerEncounteredError="error")
+fake_vlc.MediaParseFlag = types.SimpleNamespace(local=0)
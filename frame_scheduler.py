@@ -0,0 +1,91 @@
+import time
+
+
+class FrameScheduler:
+    """Entscheidet, wann ein neuer Frame gezeichnet und gesendet werden muss.
+
+    Gezeichnet wird nur, wenn etwas den Screen ungültig gemacht hat (invalidate, z.B. bei
+    Eingaben) oder ein geplanter Zeitpunkt erreicht ist (schedule_in, z.B. nächste Sekunde
+    der Zeitanzeige, nächster Lauftext-Schritt, Ende der Lautstärkeanzeige). Höchstens mit
+    max_fps, und ohne Änderungen zur Sicherheit noch mit idle_fps.
+    """
+
+    def __init__(self, max_fps=30, idle_fps=1):
+        self.min_interval = 1.0 / max_fps
+        self.idle_interval = 1.0 / idle_fps
+        self.dirty = True
+        self.deadline = float('inf')
+        self.last_render = 0.0
+
+        # Metriken, werden einmal pro Sekunde in update_metrics aktualisiert
+        self.frames_rendered = 0
+        self.fps = 0.0
+        self.cpu_percent = 0.0
+        self.spi_bytes_per_second = 0.0
+        self._metrics_time = time.monotonic()
+        self._metrics_cpu = time.process_time()
+        self._metrics_frames = 0
+        self._metrics_spi_bytes = 0
+
+    def invalidate(self):
+        """Markiert den Screen als geändert, der nächste Frame wird gezeichnet."""
+        self.dirty = True
+
+    def schedule_in(self, seconds):
+        """Plant spätestens in seconds Sekunden einen neuen Frame ein."""
+        self.deadline = min(self.deadline, time.monotonic() + max(0.0, seconds))
+
+    def _next_due(self):
+        if self.dirty:
+            due = self.last_render
+        else:
+            due = min(self.deadline, self.last_render + self.idle_interval)
+        return max(due, self.last_render + self.min_interval)
+
+    def wait(self, wakeup=None):
+        """Schläft bis zum nächsten fälligen Frame oder bis wakeup (threading.Event) gesetzt wird."""
+        timeout = self._next_due() - time.monotonic()
+        if timeout <= 0:
+            return
+        if wakeup is None:
+            time.sleep(timeout)
+            return
+        if wakeup.wait(timeout):
+            wakeup.clear()
+            # Auch bei Eingaben nicht schneller als max_fps zeichnen
+            remaining = self.last_render + self.min_interval - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def should_render(self):
+        now = time.monotonic()
+        return self.dirty or now >= self.deadline or now >= self.last_render + self.idle_interval
+
+    def begin_frame(self):
+        """Aufruf direkt vor dem Zeichnen; schedule_in-Aufrufe danach gelten für den nächsten Frame."""
+        self.dirty = False
+        self.deadline = float('inf')
+        self.last_render = time.monotonic()
+        self.frames_rendered += 1
+
+    def update_metrics(self, spi_bytes_total):
+        now = time.monotonic()
+        elapsed = now - self._metrics_time
+        if elapsed < 1.0:
+            return
+        cpu = time.process_time()
+        self.fps = (self.frames_rendered - self._metrics_frames) / elapsed
+        self.cpu_percent = (cpu - self._metrics_cpu) / elapsed * 100
+        self.spi_bytes_per_second = (spi_bytes_total - self._metrics_spi_bytes) / elapsed
+        self._metrics_time = now
+        self._metrics_cpu = cpu
+        self._metrics_frames = self.frames_rendered
+        self._metrics_spi_bytes = spi_bytes_total
+
+    def metrics(self):
+        return {
+            "fps": self.fps,
+            "cpu_percent": self.cpu_percent,
+            "spi_bytes_per_second": self.spi_bytes_per_second,
+            "frames_rendered": self.frames_rendered,
+        }
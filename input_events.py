@@ -0,0 +1,153 @@
+import queue
+import threading
+import time
+
+from profiler import profiler
+
+# Ereignistypen
+PRESS = "press"
+RELEASE = "release"
+LONG_PRESS = "long_press"
+REPEAT = "repeat"
+ROTATE = "rotate"
+
+BUTTONS = ("select", "up", "left", "down", "right")
+
+
+class InputEvent:
+    __slots__ = ('type', 'button', 'delta', 'fast_delta', 'timestamp')
+
+    def __init__(self, type, button=None, delta=0, timestamp=0.0, fast_delta=None):
+        self.type = type
+        self.button = button
+        self.delta = delta
+        # Beschleunigtes Delta (siehe seesaw_input.EncoderAcceleration)
+        self.fast_delta = delta if fast_delta is None else fast_delta
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f"InputEvent({self.type}, {self.button}, {self.delta})"
+
+
+class _ButtonState:
+    __slots__ = ('pressed', 'changed_at', 'pressed_since', 'long_sent', 'next_repeat')
+
+    def __init__(self):
+        self.pressed = False      # entprellter Zustand
+        self.changed_at = float('-inf')
+        self.pressed_since = 0.0
+        self.long_sent = False
+        self.next_repeat = 0.0
+
+
+class InputPoller:
+    """Liest SeesawInput in einem Hintergrund-Thread und erzeugt entprellte Ereignisse.
+
+    Ein Zustandswechsel wird sofort gemeldet, Prellen in den debounce Sekunden danach
+    wird ignoriert (so kostet die Entprellung keine Reaktionszeit). Gehaltene Buttons erzeugen nach long_press Sekunden ein
+    LONG_PRESS und ab repeat_delay alle repeat_interval Sekunden ein REPEAT. Der Hauptloop
+    holt die Ereignisse mit get_events() ab, ohne zu warten.
+
+    Schnell (alle poll_interval Sekunden) wird nur gelesen, solange ein Button gehalten
+    wird oder der Encoder vor weniger als idle_after Sekunden bewegt wurde, sonst alle
+    idle_poll_interval Sekunden. Mit INT-Leitung wartet der Thread im Leerlauf auf sie,
+    jeweils höchstens interrupt_timeout Sekunden (so lange dauert stop() im Leerlauf).
+    """
+
+    def __init__(self, seesaw_input, poll_interval=0.005, debounce=0.02,
+                 long_press=0.8, repeat_delay=0.4, repeat_interval=0.2, wakeup=None,
+                 idle_poll_interval=0.04, idle_after=0.5, interrupt_timeout=0.5):
+        self.seesaw_input = seesaw_input
+        # Optionales threading.Event, das bei jedem Ereignis gesetzt wird (weckt den Hauptloop)
+        self.wakeup = wakeup
+        self.poll_interval = poll_interval
+        self.idle_poll_interval = idle_poll_interval
+        self.idle_after = idle_after
+        self.interrupt_timeout = interrupt_timeout
+        self.last_activity = float('-inf')
+        self.debounce = debounce
+        self.long_press = long_press
+        self.repeat_delay = repeat_delay
+        self.repeat_interval = repeat_interval
+        self.events = queue.Queue()
+        self._buttons = {button: _ButtonState() for button in BUTTONS}
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._poll_loop, name="input-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get_events(self):
+        """Gibt alle seit dem letzten Aufruf angefallenen Ereignisse zurück (blockiert nie)."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def is_held(self, button):
+        """Entprellter Zustand eines Buttons."""
+        return self._buttons[button].pressed
+
+    def is_active(self, now):
+        """Ein Button ist gehalten oder der Encoder wurde gerade gedreht."""
+        if any(state.pressed for state in self._buttons.values()):
+            self.last_activity = now
+        return now - self.last_activity < self.idle_after
+
+    def _poll_loop(self):
+        seesaw_input = self.seesaw_input
+        while self._running:
+            start = profiler.start()
+            snapshot = seesaw_input.poll()
+            profiler.stop("i2c", start)
+            self.process(snapshot)
+            if self.is_active(snapshot.timestamp):
+                time.sleep(self.poll_interval)
+            elif seesaw_input.interrupt is not None:
+                seesaw_input.wait_for_interrupt(self.interrupt_timeout)
+            else:
+                time.sleep(self.idle_poll_interval)
+
+    def _put(self, event):
+        self.events.put(event)
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def process(self, snapshot):
+        """Wertet einen InputSnapshot aus und legt die resultierenden Ereignisse ab."""
+        now = snapshot.timestamp
+        if snapshot.delta:
+            self.last_activity = now
+            self._put(InputEvent(ROTATE, delta=snapshot.delta, timestamp=now, fast_delta=snapshot.fast_delta))
+
+        for button, state in self._buttons.items():
+            raw = getattr(snapshot, button)
+            if raw != state.pressed and now - state.changed_at >= self.debounce:
+                state.pressed = raw
+                state.changed_at = now
+                if raw:
+                    state.pressed_since = now
+                    state.long_sent = False
+                    state.next_repeat = now + self.repeat_delay
+                    self._put(InputEvent(PRESS, button, timestamp=now))
+                else:
+                    self._put(InputEvent(RELEASE, button, timestamp=now))
+            elif state.pressed:
+                if not state.long_sent and now - state.pressed_since >= self.long_press:
+                    state.long_sent = True
+                    self._put(InputEvent(LONG_PRESS, button, timestamp=now))
+                if now >= state.next_repeat:
+                    state.next_repeat = now + self.repeat_interval
+                    self._put(InputEvent(REPEAT, button, timestamp=now))
@@ -0,0 +1,55 @@
+import unicodedata
+from bisect import bisect_right
+
+
+def group_key(name):
+    """Sprunggruppe eines Eintrags: Anfangsbuchstabe ohne Akzente (Ä -> A), sonst "#"."""
+    for char in name:
+        if char.isalnum():
+            base = unicodedata.normalize("NFKD", char)[0].upper()
+            return base if "A" <= base <= "Z" else "#"
+    return "#"
+
+
+class JumpIndex:
+    """Anfangspositionen der Buchstabengruppen einer sortierten Liste.
+
+    Wird einmal pro Liste aufgebaut (ein Durchlauf), danach kostet jeder Sprung nur eine
+    binäre Suche. Eine Gruppe beginnt überall dort, wo sich group_key ändert; ist die Liste
+    nicht nach Groß-/Kleinschreibung gefaltet sortiert, kann ein Buchstabe also mehrmals
+    vorkommen.
+    """
+
+    def __init__(self, names, key=group_key):
+        self.starts = []
+        self.labels = []
+        previous = None
+        for i, name in enumerate(names):
+            label = key(name)
+            if label != previous:
+                self.starts.append(i)
+                self.labels.append(label)
+                previous = label
+
+    def __len__(self):
+        return len(self.starts)
+
+    def group_of(self, index):
+        """Nummer der Gruppe, in der index liegt."""
+        return max(0, bisect_right(self.starts, index) - 1)
+
+    def label(self, index):
+        return self.labels[self.group_of(index)] if self.starts else ""
+
+    def jump(self, index, steps):
+        """Position nach steps Gruppen vorwärts (negativ: rückwärts), am Ende wird umgebrochen.
+
+        Rückwärts springt der erste Schritt an den Anfang der eigenen Gruppe, wenn index
+        mitten in ihr liegt (wie "zurück" bei einem Player).
+        """
+        if not self.starts:
+            return index
+        group = self.group_of(index)
+        if steps < 0 and index > self.starts[group]:
+            steps += 1
+        return self.starts[(group + steps) % len(self.starts)]
@@ -0,0 +1,273 @@
+import os
+import sqlite3
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# mutagen wird erst beim ersten Lesen von Metadaten importiert (load_mutagen), das
+# verkürzt den Start und passiert dann ohnehin im Scan-Thread
+MP3 = None
+WAVE = None
+FLAC = None
+MutagenError = None
+_mutagen_loaded = False
+_mutagen_lock = threading.Lock()
+
+UNKNOWN_ARTIST = "Unbekannter Interpret"
+UNKNOWN_ALBUM = "Unbekanntes Album"
+DEFAULT_LENGTH = 180.0
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.flac')
+
+
+def is_audio_file(name):
+    return name.lower().endswith(AUDIO_EXTENSIONS) and not name.startswith('.')
+
+
+def scan_audio_files(folder, subfolder=""):
+    """Sucht rekursiv alle Audiodateien unter folder/subfolder.
+
+    Gibt ein Dict {relativer Pfad: (größe, mtime_ns)} zurück. os.scandir liefert den
+    Eintragstyp direkt aus dem Verzeichnis, stat wird nur einmal pro Audiodatei aufgerufen
+    (LibraryIndex.sync übernimmt das Ergebnis, statt die Dateien erneut abzufragen).
+    Versteckte Einträge werden übersprungen, symbolischen Links auf Ordner wird nicht
+    gefolgt (keine Endlosschleifen).
+    """
+    found = {}
+    pending = [subfolder]
+    while pending:
+        relative = pending.pop()
+        try:
+            entries = os.scandir(os.path.join(folder, relative))
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                path = os.path.join(relative, entry.name)
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(path)
+                    elif is_audio_file(entry.name) and entry.is_file():
+                        st = entry.stat()
+                        found[path] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    # Datei während des Scans verschwunden
+                    continue
+    return found
+
+
+def load_mutagen():
+    """Importiert mutagen beim ersten Aufruf. Gibt False zurück, wenn mutagen fehlt."""
+    global MP3, WAVE, FLAC, MutagenError, _mutagen_loaded
+    if not _mutagen_loaded:
+        with _mutagen_lock:
+            if not _mutagen_loaded:
+                try:
+                    from mutagen.mp3 import MP3
+                    from mutagen.wave import WAVE
+                    from mutagen.flac import FLAC
+                    from mutagen import MutagenError
+                except ImportError:
+                    pass
+                _mutagen_loaded = True
+    return MutagenError is not None
+
+
+def get_mutagen_audio(path):
+    """Lädt das passende mutagen-Objekt basierend auf der Dateiendung."""
+    load_mutagen()
+    if path.lower().endswith('.flac') and FLAC:
+        return FLAC(path)
+    if path.lower().endswith('.mp3') and MP3:
+        return MP3(path)
+    if path.lower().endswith('.wav') and WAVE:
+        return WAVE(path)
+    return None
+
+
+def read_track_info(path):
+    """Liest Interpret, Album und Länge mit einem einzigen Öffnen der Datei."""
+    artist = UNKNOWN_ARTIST
+    album = UNKNOWN_ALBUM
+    length = DEFAULT_LENGTH
+    if load_mutagen():
+        try:
+            audio = get_mutagen_audio(path)
+            if audio:
+                if 'artist' in audio:
+                    artist = audio['artist'][0]
+                if 'album' in audio:
+                    album = audio['album'][0]
+                length = audio.info.length
+        except MutagenError:
+            print(f"Fehler beim Lesen der Metadaten von {os.path.basename(path)}")
+    elif path.lower().endswith('.wav'):
+        # Ohne mutagen lässt sich zumindest die Länge von WAV-Dateien bestimmen
+        try:
+            with wave.open(path) as w:
+                length = w.getnframes() / float(w.getframerate())
+        except (wave.Error, OSError):
+            pass
+    return artist, album, length
+
+
+def _read_or_default(read_info, path):
+    """read_info für den Scan: unerwartete Fehler (kaputte Datei) ergeben die Standardwerte,
+    statt den ganzen Scan abzubrechen."""
+    try:
+        return read_info(path)
+    except Exception as e:
+        print(f"Fehler beim Lesen der Metadaten von {os.path.basename(path)}: {e}")
+        return UNKNOWN_ARTIST, UNKNOWN_ALBUM, DEFAULT_LENGTH
+
+
+class LibraryIndex:
+    """Persistenter Metadaten-Index (SQLite) neben dem Musikordner.
+
+    Einträge sind über Pfad, Größe und Änderungszeit geschlüsselt, so dass beim Start
+    nur neue oder geänderte Dateien neu gelesen werden müssen.
+    """
+
+    def __init__(self, folder, db_path=None):
+        self.folder = folder
+        if db_path is None:
+            folder_abs = os.path.abspath(folder)
+            db_path = os.path.join(os.path.dirname(folder_abs), f".{os.path.basename(folder_abs)}_index.db")
+        self.db_path = db_path
+        try:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self._create_table()
+        except sqlite3.Error as e:
+            # z.B. schreibgeschützte SD-Karte: Index nur für diese Sitzung im Speicher halten
+            print(f"Bibliotheksindex {db_path} nicht nutzbar ({e}), verwende Index im Speicher.")
+            self.db = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create_table()
+
+        self.parsed = 0
+        self.pruned = 0
+        self.last_sync_time = 0.0
+
+    def _create_table(self):
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS tracks ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "artist TEXT, album TEXT, duration REAL)"
+        )
+
+    def sync(self, files, read_info=read_track_info, workers=4, on_result=None, stats=None):
+        """Gleicht den Index mit der Dateiliste ab.
+
+        Gibt ein Dict {datei: (interpret, album, länge)} zurück. Nur neue oder geänderte
+        Dateien werden mit read_info gelesen, verteilt auf bis zu workers Threads; nicht mehr
+        vorhandene werden entfernt. on_result(datei, info) wird für jede Datei aufgerufen,
+        sobald ihre Daten vorliegen, bei gelesenen Dateien also in Fertigstellungs-Reihenfolge.
+        stats ({datei: (größe, mtime_ns)}, z.B. von scan_audio_files) erspart das erneute stat.
+        """
+        start = time.time()
+        cached = {row[0]: row[1:] for row in self.db.execute(
+            "SELECT path, size, mtime_ns, artist, album, duration FROM tracks")}
+
+        result = {}
+        stale = []
+        for file in files:
+            if stats is not None:
+                size, mtime_ns = stats[file]
+            else:
+                st = os.stat(os.path.join(self.folder, file))
+                size, mtime_ns = st.st_size, st.st_mtime_ns
+            entry = cached.pop(file, None)
+            if entry is not None and entry[0] == size and entry[1] == mtime_ns:
+                result[file] = entry[2:]
+                if on_result:
+                    on_result(file, entry[2:])
+            else:
+                stale.append((file, size, mtime_ns))
+
+        updates = []
+        for file, size, mtime_ns, info in self._scan(stale, read_info, workers):
+            result[file] = info
+            updates.append((file, size, mtime_ns) + tuple(info))
+            if on_result:
+                on_result(file, info)
+
+        # Was jetzt noch in cached steht, existiert nicht mehr
+        self._write(updates, cached)
+
+        self.parsed = len(updates)
+        self.pruned = len(cached)
+        self.last_sync_time = time.time() - start
+        return result
+
+    def update(self, files, read_info=read_track_info, removed=()):
+        """Inkrementeller Abgleich für einzelne Dateien (z.B. vom LibraryWatcher gemeldet).
+
+        files werden gelesen, sofern sie neu oder geändert sind, removed aus dem Index
+        gelöscht. Gibt {datei: (interpret, album, länge)} für alle noch vorhandenen files zurück.
+        """
+        start = time.time()
+        result = {}
+        stale = []
+        for file in files:
+            try:
+                st = os.stat(os.path.join(self.folder, file))
+            except OSError:
+                continue  # schon wieder weg
+            row = self.db.execute("SELECT size, mtime_ns, artist, album, duration FROM tracks WHERE path = ?",
+                                  (file,)).fetchone()
+            if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+                result[file] = row[2:]
+            else:
+                stale.append((file, st.st_size, st.st_mtime_ns))
+
+        updates = []
+        for file, size, mtime_ns, info in self._scan(stale, read_info, workers=1):
+            result[file] = info
+            updates.append((file, size, mtime_ns) + tuple(info))
+        self._write(updates, removed)
+
+        self.parsed = len(updates)
+        self.pruned = len(removed)
+        self.last_sync_time = time.time() - start
+        return result
+
+    def _write(self, updates, removed):
+        """Schreibt gelesene Einträge und löscht entfernte Dateien aus dem Index.
+
+        Lässt sich die Datei öffnen, aber nicht beschreiben (z.B. schreibgeschützte SD-Karte
+        mit vorhandenem Index), geht es wie im Konstruktor mit einem Index im Speicher weiter.
+        """
+        try:
+            self._write_rows(updates, removed)
+        except sqlite3.Error as e:
+            print(f"Bibliotheksindex {self.db_path} nicht beschreibbar ({e}), verwende Index im Speicher.")
+            self.db.close()
+            self.db = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create_table()
+            self._write_rows(updates, ())
+
+    def _write_rows(self, updates, removed):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?, ?)", updates)
+            self.db.executemany("DELETE FROM tracks WHERE path = ?", [(f,) for f in removed])
+
+    def _scan(self, stale, read_info, workers):
+        """Liest die Dateien parallel und liefert (datei, größe, mtime, info) sobald fertig."""
+        if not stale:
+            return
+        if workers <= 1:
+            for file, size, mtime_ns in stale:
+                yield file, size, mtime_ns, _read_or_default(read_info, os.path.join(self.folder, file))
+            return
+        # Das Lesen der Tags wartet fast nur auf die SD-Karte, daher reichen Threads
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metadata") as pool:
+            futures = {pool.submit(_read_or_default, read_info, os.path.join(self.folder, file)):
+                       (file, size, mtime_ns)
+                       for file, size, mtime_ns in stale}
+            for future in as_completed(futures):
+                file, size, mtime_ns = futures[future]
+                yield file, size, mtime_ns, future.result()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,212 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+
+from library_index import is_audio_file, scan_audio_files
+
+# Konstanten aus <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class LibraryWatcher:
+    """Meldet Änderungen im Musikordner und allen Unterordnern über inotify.
+
+    inotify wird direkt über ctypes angesprochen, ein Zusatzpaket ist nicht nötig. Jeder
+    Ordner bekommt eine eigene Watch; neue Ordner werden sofort aufgenommen und einmal
+    durchsucht, da Dateien schon vor der Watch angekommen sein können. Änderungen werden
+    gesammelt und erst nach settle Sekunden Ruhe als on_change(hinzugefügt, entfernt)
+    gemeldet, so dass ein kopiertes Album ein einziges Update auslöst. Neu geschriebene
+    bekannte Dateien stehen in hinzugefügt (der Index liest sie dann neu).
+
+    known_stats ({datei: (größe, mtime_ns)}) ist der Stand, auf dem known_files beruht.
+    Damit sucht der Watcher nach dem Setzen der Watches einmal den ganzen Ordner durch und
+    meldet, was sich seitdem geändert hat (z.B. während des ersten Metadaten-Scans).
+    """
+
+    def __init__(self, folder, on_change, known_files=(), settle=0.5, known_stats=None):
+        self.folder = folder
+        self.on_change = on_change
+        self.settle = settle
+        self.known = set(known_files)
+        self._known_stats = known_stats
+        self._libc = _load_libc()
+        self._fd = -1
+        self._watches = {}  # Watch-Deskriptor -> relativer Ordnerpfad
+        self._added = set()
+        self._removed = set()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Beginnt mit der Beobachtung, False wenn inotify nicht verfügbar ist."""
+        if self._libc is None:
+            print("inotify nicht verfügbar, neue Dateien werden erst beim nächsten Start erkannt.")
+            return False
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            print(f"inotify_init1 fehlgeschlagen: {os.strerror(ctypes.get_errno())}")
+            return False
+        self._fd = fd
+        self._add_tree("")
+        self._running = True
+        self._thread = threading.Thread(target=self._watch_loop, name="library-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_tree(self, relative):
+        """Setzt Watches auf relative und alle Unterordner."""
+        pending = [relative]
+        while pending:
+            current = pending.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(os.path.join(self.folder, current)), WATCH_MASK)
+            if wd < 0:
+                print(f"Ordner {current or '.'} kann nicht beobachtet werden: {os.strerror(ctypes.get_errno())}")
+                continue
+            self._watches[wd] = current
+            try:
+                with os.scandir(os.path.join(self.folder, current)) as entries:
+                    for entry in entries:
+                        if not entry.name.startswith('.') and entry.is_dir(follow_symlinks=False):
+                            pending.append(os.path.join(current, entry.name))
+            except OSError:
+                continue
+
+    def _remove_tree(self, relative):
+        """Entfernt die Watches eines verschobenen Ordners (sonst stimmen die Pfade nicht mehr)."""
+        prefix = relative + os.sep
+        for wd, path in list(self._watches.items()):
+            if path == relative or path.startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _watch_loop(self):
+        deadline = None
+        if self._known_stats is not None:
+            # Die Watches stehen schon, was danach passiert, kommt als Ereignis
+            self._rescan(self._known_stats)
+            self._known_stats = None
+            deadline = time.monotonic()
+        while self._running:
+            timeout = 0.5 if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], timeout)
+            if readable:
+                self._read_events()
+                deadline = time.monotonic() + self.settle
+            elif deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                self._flush()
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            self._handle_event(wd, mask, name)
+
+    def _handle_event(self, wd, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            # Ereignisse verloren gegangen: mit einem vollständigen Scan abgleichen
+            self._rescan()
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+        directory = self._watches.get(wd)
+        if directory is None or not name:
+            return
+        path = os.path.join(directory, name)
+
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+                for file in scan_audio_files(self.folder, path):
+                    self._file_added(file)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self._remove_tree(path)
+                prefix = path + os.sep
+                for file in [f for f in self.known if f.startswith(prefix)]:
+                    self._file_removed(file)
+            return
+
+        if not is_audio_file(name):
+            return
+        # Neue Dateien erst melden, wenn sie fertig geschrieben sind (nicht schon bei IN_CREATE)
+        if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+            self._file_added(path)
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            self._file_removed(path)
+
+    def _rescan(self, stats=None):
+        """Gleicht known mit einem vollständigen Scan ab. Mit stats werden auch bekannte
+        Dateien gemeldet, deren Größe oder Änderungszeit nicht mehr stimmt."""
+        current = scan_audio_files(self.folder)
+        for file in self.known - current.keys():
+            self._file_removed(file)
+        for file, stat in current.items():
+            if file not in self.known or (stats is not None and stats.get(file, stat) != stat):
+                self._file_added(file)
+
+    def _file_added(self, path):
+        self.known.add(path)
+        self._added.add(path)
+        self._removed.discard(path)
+
+    def _file_removed(self, path):
+        self._added.discard(path)
+        if path in self.known:
+            self.known.discard(path)
+            self._removed.add(path)
+
+    def _flush(self):
+        added, removed = self._added, self._removed
+        self._added, self._removed = set(), set()
+        if not added and not removed:
+            return
+        try:
+            self.on_change(added, removed)
+        except Exception as e:
+            # Der Watcher soll wegen einer fehlerhaften Datei nicht stehen bleiben
+            print(f"Fehler beim Aktualisieren der Bibliothek: {e}")
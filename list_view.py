@@ -0,0 +1,33 @@
+class ListView:
+    """Scroll-Zustand einer vertikalen Liste mit fester Zeilenhöhe.
+
+    Liefert nur die Indizes der sichtbaren Zeilen, so dass beim Zeichnen nie die ganze
+    Liste durchlaufen werden muss - egal wie lang sie ist.
+    """
+
+    def __init__(self, top, height, line_height):
+        self.top = top                  # y-Position der ersten Zeile auf dem Screen
+        self.height = height            # verfügbare Höhe für Zeilen
+        self.line_height = line_height
+        self.scroll_y = 0
+
+    def ensure_visible(self, index):
+        """Scrollt so, dass die Zeile index vollständig sichtbar ist."""
+        y = index * self.line_height - self.scroll_y
+        if y < 0:
+            self.scroll_y = index * self.line_height
+        elif y + self.line_height > self.height:
+            self.scroll_y = (index + 1) * self.line_height - self.height
+
+    def visible_range(self, count):
+        """range der Zeilen, die (auch teilweise) im sichtbaren Bereich liegen."""
+        first = self.scroll_y // self.line_height
+        last = (self.scroll_y + self.height + self.line_height - 1) // self.line_height
+        return range(min(first, count), min(last, count))
+
+    def row_y(self, index):
+        """y-Position einer Zeile auf dem Screen."""
+        return self.top + index * self.line_height - self.scroll_y
+
+    def reset(self):
+        self.scroll_y = 0
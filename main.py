@@ -1,404 +1,854 @@
 import os
+import signal
 import sys
 import time
+# Bezugspunkt für die Startzeiten (vor den großen Imports wie pygame und numpy)
+BOOT_TIME = time.perf_counter()
+import threading
+from bisect import bisect_left
 import pygame
 from pygame.locals import *
-import subprocess # Hinzugefügt für die Lautstärkeregelung
-import board # Hinzugefügt für DAC-Initialisierung
-import digitalio # Hinzugefügt für DAC-Initialisierung
-import adafruit_tlv320 # Hinzugefügt für DAC-Initialisierung
 
 from audio_player import AudioPlayer
 from display_controller import DisplayController
 from seesaw_input import SeesawInput
-from user_interface import UserInterface
+from input_events import InputPoller, PRESS, LONG_PRESS, REPEAT, ROTATE
+from user_interface import UserInterface, song_title
+from volume_control import VolumeController
+from frame_scheduler import FrameScheduler
+from rgb565 import RGB565_MASKS
+from profiler import profiler
+from startup import Startup
+from jump_index import JumpIndex, group_key
+from album_art import AlbumArtCache
+from visualizer import AlsaLoopbackSource, PCMTap, Visualizer
 
 # Konstanten
 WIDTH, HEIGHT = 160, 128
 DC_PIN = 24
 RESET_PIN = 25
 mp3_folder = "mp3_files"
+# Lautstärke über das DAC-Register statt über amixer setzen
+USE_DAC_VOLUME = True
+# Direkt in ein 16-Bit-Surface im Panel-Format (RGB565) zeichnen. Für das Debug-Fenster
+# am PC auf False setzen, dann wird wie bisher ins 24-Bit-Fenster gezeichnet.
+RENDER_RGB565 = True
+# Display-Frames in einem eigenen Thread senden, damit der Hauptloop nicht auf SPI wartet
+ASYNC_DISPLAY = True
+
+# Stufen-Zeitmessung von Anfang an einschalten (sonst erst beim Öffnen des Debug-Screens:
+# im Hauptmenü "Hoch" gedrückt halten). SIGUSR1 schreibt die Werte nach PROFILE_DUMP_FILE.
+PROFILING = False
+PROFILE_DUMP_FILE = "profile.json"
+
+# GPIO-Pin (board-Name) für den Reset des DAC
+DAC_RESET_PIN = "D26"
+# INT-Leitung des Seesaw-Boards (board-Pin); im Leerlauf wartet der Input-Thread auf sie.
+# None = ohne Interrupt regelmäßig lesen (alle 5 ms bei Eingaben, sonst alle 40 ms)
+SEESAW_INT_PIN = None
 
-DAC_RESET_PIN = board.D26
-
-pygame.init()
-
-# --- TLV320DAC INITIALISIERUNG ---
-# Dieser Block initialisiert den DAC über I2C. Ohne diesen Schritt kommt kein Ton.
-print("Initialisiere TLV320DAC3100...")
-try:
-    # I2C-Bus einrichten (wird von SeesawInput und DAC geteilt)
-    i2c = board.I2C()
-
-    # Reset-Pin für den DAC konfigurieren
-    reset_pin_dac = digitalio.DigitalInOut(DAC_RESET_PIN)
-    reset_pin_dac.direction = digitalio.Direction.OUTPUT
-
-    # DAC-Reset durchführen (essentiell!) [1, 2, 3, 4]
-    reset_pin_dac.value = False
-    time.sleep(0.01)
-    reset_pin_dac.value = True
-    print("TLV320DAC3100 Reset durchgeführt.")
-
-    # DAC-Objekt instanziieren und konfigurieren
-    dac = adafruit_tlv320.TLV320DAC3100(i2c)
-    
-    # --- HIER IST DIE FEHLENDE ZEILE ---
-    # Konfiguriert die interne Takt-PLL. Ohne das ist der DAC stumm! [1, 2, 3]
-    dac.configure_clocks(sample_rate=44100, bit_depth=16)
-    print("Interne Taktgeber (PLL) konfiguriert.")
-
-    # Kopfhörerausgang aktivieren und Lautsprecherausgang deaktivieren für beste Qualität [1, 2, 5]
-    dac.headphone_output = True
-    dac.speaker_output = False
-    
-    # Eine sichere, moderate Anfangslautstärke auf dem Chip selbst einstellen (0dB ist max)
-    dac.dac_volume = 0
-    
-    print("TLV320DAC3100 erfolgreich initialisiert.")
-
-except (ValueError, RuntimeError) as e:
-    print(f"Fehler bei der Initialisierung des TLV320DAC3100: {e}")
-    print("Stellen Sie sicher, dass der DAC korrekt verkabelt ist (I2C an SDA/SCL, RST an GPIO 26).")
-    print("Führen Sie 'i2cdetect -y 1' aus, um zu prüfen, ob die Adresse 0x18 erkannt wird.")
-    sys.exit()
-# --- ENDE DAC INITIALISIERUNG ---
-
-
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Music Player")
-
-# Komponenten initialisieren
-audio_player = AudioPlayer(mp3_folder)
-display_controller = DisplayController(WIDTH, HEIGHT, DC_PIN, RESET_PIN)
-seesaw_input = SeesawInput()
-ui = UserInterface(WIDTH, HEIGHT)
-
-# --- NEUE FUNKTION ZUR LAUTSTäRKEREGELUNG ---
-def set_system_volume(volume_level):
-    """Setzt die Systemlautstärke mit amixer. Erwartet einen Wert zwischen 0.0 und 1.0."""
-    volume_percent = int(volume_level * 100)
+VOLUME_DISPLAY_DURATION = 1.0
+# Wiedergabe: "vlc" (libvlc) oder "native" (native_playback: miniaudio dekodiert, Ausgabe
+# direkt über ALSA). Beim Start mit --native bzw. --sink=<ausgabe> überschreibbar.
+AUDIO_BACKEND = "vlc"
+# Ausgabe des nativen Backends: "alsa", "alsa:<gerät>", "null" oder "wav:<datei>"
+NATIVE_SINK = "alsa"
+# Ringpuffer zwischen Decoder und Ausgabe, Periodengröße und Anzahl Perioden im ALSA-Puffer
+NATIVE_BUFFER_MS = 500
+NATIVE_PERIOD_FRAMES = 1024
+NATIVE_PERIODS = 4
+
+# Spektrum auf dem Play-Screen. Mit dem nativen Backend kommen die Samples direkt aus dem
+# Player, mit libvlc von der ALSA-Loopback-Karte (snd-aloop, Ausgabe per multi-Plugin in
+# /etc/asound.conf zusätzlich dorthin), gelesen mit pyalsaaudio.
+VISUALIZER = False
+VISUALIZER_DEVICE = "hw:Loopback,1,0"
+VISUALIZER_RECT = (10, 84, 140, 16)
+
+# Cover auf dem Play-Screen. Die Thumbnails liegen in .<musikordner>_art neben dem Musikordner.
+ALBUM_ART = True
+
+# So lange bleibt nach einem Buchstabensprung (Links halten + drehen) der Buchstabe sichtbar
+JUMP_LABEL_DURATION = 0.6
+
+
+def init_dac():
+    """Initialisiert den TLV320DAC3100 über I2C. Ohne diesen Schritt kommt kein Ton."""
+    import board
+    import digitalio
+    import adafruit_tlv320
+
+    print("Initialisiere TLV320DAC3100...")
     try:
-        # Wir verwenden den Mixer "PCM", der in /etc/asound.conf definiert wird
-        subprocess.run(["amixer", "set", "Master", f"{volume_percent}%"], check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
-        print(f"Fehler beim Setzen der Lautstärke mit amixer: {e}")
-        print("Stellen Sie sicher, dass 'alsa-utils' installiert ist und /etc/asound.conf korrekt konfiguriert ist.")
+        # I2C-Bus einrichten (wird von SeesawInput und DAC geteilt)
+        i2c = board.I2C()
 
+        # Reset-Pin für den DAC konfigurieren
+        reset_pin_dac = digitalio.DigitalInOut(getattr(board, DAC_RESET_PIN))
+        reset_pin_dac.direction = digitalio.Direction.OUTPUT
 
+        # DAC-Reset durchführen (essentiell!) [1, 2, 3, 4]
+        reset_pin_dac.value = False
+        time.sleep(0.01)
+        reset_pin_dac.value = True
+        print("TLV320DAC3100 Reset durchgeführt.")
 
-# --- ZUSTANDSVERWALTUNG ---
-state = "main_menu"
-selected_index = 0
-main_menu_options = ["Musik", "Einstellungen"]
-music_menu_options = ["Alle Songs", "Interpret", "Album"]
-settings_menu_options = ["Grün", "Purple", "White"]
+        # DAC-Objekt instanziieren und konfigurieren
+        dac = adafruit_tlv320.TLV320DAC3100(i2c)
 
-# Temporäre Listen für gefilterte Songs
-current_song_list = []
-current_menu_title = ""
+        # --- HIER IST DIE FEHLENDE ZEILE ---
+        # Konfiguriert die interne Takt-PLL. Ohne das ist der DAC stumm! [1, 2, 3]
+        dac.configure_clocks(sample_rate=44100, bit_depth=16)
+        print("Interne Taktgeber (PLL) konfiguriert.")
 
-current_song_index = None
-paused = False
-clock = pygame.time.Clock()
+        # Kopfhörerausgang aktivieren und Lautsprecherausgang deaktivieren für beste Qualität [1, 2, 5]
+        dac.headphone_output = True
+        dac.speaker_output = False
 
-# Scroll-Variablen
-play_scroll_offset = 0
-last_play_scroll_time = time.time()
-main_scroll_offset = 0
-last_main_scroll_time = time.time()
-main_menu_scroll_y = 0
+        # Eine sichere, moderate Anfangslautstärke auf dem Chip selbst einstellen (0dB ist max)
+        dac.dac_volume = 0
 
-volume = 0.5
-set_system_volume(volume)
+        print("TLV320DAC3100 erfolgreich initialisiert.")
+        return dac
 
-VOLUME_DISPLAY_DURATION = 1.0
-last_volume_change_time = time.time()
-
-# Hauptloop
-while True:
-    # --- Tastatur-Events (für Debugging am PC) ---
-    for event in pygame.event.get():
-        if event.type == QUIT:
-            pygame.quit()
-            sys.exit()
-        elif event.type == KEYDOWN:
-             # Globale "Zurück"-Taste
-            if event.key == K_r:
-                if state == "play":
-                    # Entscheiden, wohin zurückgekehrt werden soll
-                    if current_menu_title == "Alle Songs":
-                        state = "all_songs_menu"
-                    else: # Zurück zur gefilterten Liste
-                         state = "filtered_songs_menu"
-                elif state == "all_songs_menu":
-                    state = "music_menu"
-                    selected_index = 0
-                elif state == "filtered_songs_menu":
-                    if current_menu_title in audio_player.artists:
-                        state = "artist_menu"
-                    else:
-                        state = "album_menu"
-                    selected_index = 0
-                elif state in ["artist_menu", "album_menu", "music_menu", "settings_menu"]:
-                    state = "main_menu"
-                    selected_index = 0
-                    
-                    
-
-    # --- KORRIGIERTE ENCODER- UND TASTENSTEUERUNG ---
-
-    # 1. Encoder-Drehung (Navigation)
-    delta = seesaw_input.get_encoder_delta()
-    if delta != 0:
-        if state == "main_menu":
-            selected_index = (selected_index + delta) % len(main_menu_options)
-        elif state == "music_menu":
-            selected_index = (selected_index + delta) % len(music_menu_options)
-        elif state == "settings_menu":
-            selected_index = (selected_index + delta) % len(settings_menu_options)
-        elif state == "artist_menu":
-            selected_index = (selected_index + delta) % len(audio_player.artists)
-        elif state == "album_menu":
-            selected_index = (selected_index + delta) % len(audio_player.albums)
-        elif state == "all_songs_menu":
-            selected_index = (selected_index + delta) % len(audio_player.audio_files)
-            main_scroll_offset = 0
-        elif state == "filtered_songs_menu":
-            selected_index = (selected_index + delta) % len(current_song_list)
-            main_scroll_offset = 0
-        elif state == "play":
-            volume = max(0.0, min(1.0, volume + (delta * 0.05)))
-            set_system_volume(volume) # NEU
-            last_volume_change_time = time.time()
-            
-    # 2. Select-Taste (Auswählen)
-    if seesaw_input.is_select_pressed():
-        time.sleep(0.2)
-        if state == "main_menu":
-            if selected_index == 0: state = "music_menu"; selected_index = 0
-            elif selected_index == 1: state = "settings_menu"; selected_index = 0
-        elif state == "music_menu":
-            if selected_index == 0: # Alle Songs
-                state = "all_songs_menu"
-                current_menu_title = "Alle Songs"
-                current_song_list = audio_player.metadata # Liste aller Songs
-                selected_index = 0
-            elif selected_index == 1: # Interpret
-                state = "artist_menu"
-                selected_index = 0
-            elif selected_index == 2: # Album
-                state = "album_menu"
-                selected_index = 0
-        elif state == "settings_menu":
-            ui.set_theme(selected_index)
-        elif state == "artist_menu":
-            selected_artist = audio_player.artists[selected_index]
-            current_song_list = audio_player.get_songs_by_artist(selected_artist)
-            current_menu_title = selected_artist
-            state = "filtered_songs_menu"
-            selected_index = 0
-        elif state == "album_menu":
-            selected_album = audio_player.albums[selected_index]
-            current_song_list = audio_player.get_songs_by_album(selected_album)
-            current_menu_title = selected_album
-            state = "filtered_songs_menu"
-            selected_index = 0
-        elif state == "all_songs_menu" or state == "filtered_songs_menu":
-            song_to_play_info = current_song_list[selected_index]
-            original_idx = song_to_play_info['original_index']
-            if current_song_index == original_idx:
-                state = "play"
+    except (ValueError, RuntimeError) as e:
+        print(f"Fehler bei der Initialisierung des TLV320DAC3100: {e}")
+        print("Stellen Sie sicher, dass der DAC korrekt verkabelt ist (I2C an SDA/SCL, RST an GPIO 26).")
+        print("Führen Sie 'i2cdetect -y 1' aus, um zu prüfen, ob die Adresse 0x18 erkannt wird.")
+        sys.exit()
+
+
+def song_folder(filename):
+    """Oberster Ordner eines Songs (bei Interpret/Album/Titel der Interpret), None direkt im Musikordner."""
+    head, sep, _ = filename.partition(os.sep)
+    return head if sep else None
+
+
+def song_group_key(filename):
+    """Sprunggruppe in "Alle Songs": Anfangsbuchstabe des obersten Ordners.
+
+    Die Liste ist nach Pfad sortiert, die Gruppen folgen so der Sortierung. Dateien direkt
+    im Musikordner zählen mit ihrem Titel. Titel selbst taugen nicht als Schlüssel: sie
+    beginnen meist mit der Tracknummer ("01 - ..."), alles landete in "#".
+    """
+    return group_key(song_folder(filename) or song_title(filename))
+
+
+def song_jump_label(filename):
+    """Beschriftung nach einem Sprung in "Alle Songs": der Ordner, in dem die Auswahl liegt."""
+    return song_folder(filename) or song_group_key(filename)
+
+
+class MusicPlayerApp:
+    """Zustandsautomat des Players: Eingaben verarbeiten, Zustand wechseln, Frames zeichnen.
+
+    Die Hardware (Player, Display, Seesaw, DAC) wird übergeben, so dass derselbe Ablauf
+    auch mit den Attrappen aus fake_backends läuft. step() ist ein Durchlauf des Hauptloops.
+    """
+
+    def __init__(self, audio_player, display_controller, seesaw_input, dac=None,
+                 rgb565=RENDER_RGB565, async_display=ASYNC_DISPLAY, ui=None):
+        self.window = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Music Player")
+        if rgb565:
+            self.screen = pygame.Surface((WIDTH, HEIGHT), 0, 16, RGB565_MASKS)
+        else:
+            self.screen = self.window
+
+        # Komponenten
+        self.audio_player = audio_player
+        self.display_controller = display_controller
+        if async_display:
+            self.display_controller.start_async()
+        self.seesaw_input = seesaw_input
+        # Weckt den Hauptloop, sobald eine Eingabe vorliegt
+        self.input_wakeup = threading.Event()
+        self.input_poller = InputPoller(seesaw_input, wakeup=self.input_wakeup)
+        self.input_poller.start()
+        self.ui = ui or UserInterface(WIDTH, HEIGHT, rgb565=rgb565)
+        # Cover für den Play-Screen, im Hintergrund geladen und als RGB565 auf der SD-Karte gecacht
+        self.album_art = AlbumArtCache(audio_player.folder, on_ready=self._album_art_ready) if ALBUM_ART else None
+        self._art_index = None
+        # Optionales Spektrum, rechnet in einem eigenen Thread
+        self.pcm_source = None
+        self.visualizer = self._create_visualizer(getattr(audio_player.vlc, "tap", None)) if VISUALIZER else None
+        self._dropped_frames = 0
+        self._underruns = 0
+
+        # --- LAUTSTäRKEREGELUNG ---
+        # Schreibt direkt ins DAC-Register (statt amixer zu starten), gebündelt in einem eigenen Thread
+        self.volume_control = VolumeController(dac)
+
+        # --- ZUSTANDSVERWALTUNG ---
+        self.state = "main_menu"
+        self.selected_index = 0
+        self.main_menu_options = ["Musik", "Einstellungen"]
+        self.music_menu_options = ["Alle Songs", "Interpret", "Album"]
+        self.settings_menu_options = ["Grün", "Purple", "White"]
+
+        # Temporäre Listen für gefilterte Songs
+        self.current_song_list = []
+        self.current_song_filenames = []
+        self.current_menu_title = ""
+
+        self.current_song_index = None
+        self.paused = False
+        # Gezeichnet und gesendet wird nur, wenn sich etwas geändert hat (max. 30 fps, sonst 1 fps)
+        self.scheduler = FrameScheduler(max_fps=30, idle_fps=1)
+        # Dauer des letzten Zeichnens (Sekunden)
+        self.last_render_time = 0.0
+
+        # Scroll-Variablen
+        self.play_scroll_offset = 0
+        self.last_play_scroll_time = time.time()
+        self.main_scroll_offset = 0
+        self.last_main_scroll_time = time.time()
+
+        self.volume = 0.5
+        self.volume_control.set_volume(self.volume)
+        self.last_volume_change_time = time.time()
+
+        # Interpret-/Albumliste dieses Durchlaufs mit Zustand und ausgewähltem Namen. Der Scan
+        # ersetzt die Listen laufend durch neue, sync_selection hält die Auswahl auf dem Namen
+        self._browse_state = None
+        self._browse_list = None
+        self._browse_name = None
+
+        # Buchstabensprünge in langen Listen: JumpIndex je Menü, wird bei neuer Liste neu gebaut
+        self._jump_indexes = {}
+        self.last_jump_time = 0.0
+
+        # Versteckter Debug-Screen mit den Profiler-Werten
+        self.debug_line = 0
+        profiler.add_counter("i2c", lambda: seesaw_input.i2c_transactions)
+        profiler.add_counter("spi", lambda: display_controller.spi_transfers)
+        profiler.add_counter("spi_kb", lambda: display_controller.bytes_sent // 1024)
+        profiler.add_counter("dac", lambda: self.volume_control.writes)
+        profiler.add_counter("dropped", lambda: display_controller.frames_dropped)
+        # Leerlauf-Kennzahlen des FrameSchedulers (über die letzte Sekunde)
+        profiler.add_counter("fps", lambda: round(self.scheduler.fps, 1))
+        profiler.add_counter("cpu_%", lambda: round(self.scheduler.cpu_percent, 1))
+        profiler.add_counter("spi_B/s", lambda: int(self.scheduler.spi_bytes_per_second))
+
+    def shutdown(self):
+        self.input_poller.stop()
+        if self.visualizer is not None:
+            self.visualizer.stop()
+        if self.pcm_source is not None:
+            self.pcm_source.stop()
+        self.display_controller.stop_async()
+        self.audio_player.close()
+
+    def run(self):
+        while True:
+            self.step()
+
+    def step(self):
+        """Ein Durchlauf des Hauptloops. Gibt True zurück, wenn ein Frame gezeichnet wurde."""
+        self.scheduler.wait(self.input_wakeup)
+        frame_start = profiler.start()
+
+        # --- Tastatur-Events (für Debugging am PC) ---
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                self.shutdown()
+                pygame.quit()
+                sys.exit()
+            elif event.type == KEYDOWN:
+                self.scheduler.invalidate()
+                # Globale "Zurück"-Taste
+                if event.key == K_r:
+                    self.go_back()
+                elif event.key == K_d:
+                    self.open_debug_screen()
+
+        global _profile_dump_requested
+        if _profile_dump_requested:
+            _profile_dump_requested = False
+            print(f"Profiler-Werte gespeichert: {profiler.dump(PROFILE_DUMP_FILE)}")
+
+        self.sync_library()
+        self.sync_selection()
+        self.sync_song_list()
+        self.handle_input(self.input_poller.get_events())
+        self._remember_selection()
+        self.sync_playback()
+        if self.visualizer is not None:
+            self.visualizer.set_active(self.state == "play" and not self.paused)
+        profiler.stop("input", frame_start)
+
+        self.scheduler.update_metrics(self.display_controller.bytes_sent)
+        if not self.scheduler.should_render():
+            return False
+        self.scheduler.begin_frame()
+        start = time.perf_counter()
+        self.draw()
+        self.last_render_time = time.perf_counter() - start
+        profiler.record("draw", self.last_render_time)
+        start = profiler.start()
+        self.display_controller.update_display(self.screen)
+        profiler.stop("display", start)
+        profiler.frame_done(frame_start)
+        return True
+
+    def open_debug_screen(self):
+        # Ab jetzt messen, damit der Screen etwas anzuzeigen hat
+        profiler.enabled = True
+        self.state = "debug"
+        self.debug_line = 0
+
+    def go_back(self):
+        """Zurück-Taste der Tastatur (R)."""
+        if self.state == "play":
+            # Entscheiden, wohin zurückgekehrt werden soll
+            if self.current_menu_title == "Alle Songs":
+                self.state = "all_songs_menu"
+            else: # Zurück zur gefilterten Liste
+                self.state = "filtered_songs_menu"
+        elif self.state == "all_songs_menu":
+            self.state = "music_menu"
+            self.selected_index = 0
+        elif self.state == "filtered_songs_menu":
+            if self.audio_player.has_artist(self.current_menu_title):
+                self.state = "artist_menu"
             else:
-                current_song_index = audio_player.play_song(original_idx)
-                paused = False
-                state = "play"
-        elif state == "play":
-            audio_player.pause()
-            paused = not paused
-
-    # 3. Up-Taste (Zurück)
-    if seesaw_input.is_up_pressed():
-        time.sleep(0.2)
-        if state == "play":
-            if current_menu_title == "Alle Songs":
-                state = "all_songs_menu"
+                self.state = "album_menu"
+            self.selected_index = 0
+        elif self.state in ["artist_menu", "album_menu", "music_menu", "settings_menu", "debug"]:
+            self.state = "main_menu"
+            self.selected_index = 0
+
+    def handle_input(self, input_events):
+        # --- KORRIGIERTE ENCODER- UND TASTENSTEUERUNG ---
+        audio_player = self.audio_player
+
+        # Entprellte Ereignisse des Input-Threads (blockiert nicht)
+        delta = 0
+        fast_delta = 0
+        pressed = set()
+        long_pressed = set()
+        for input_event in input_events:
+            if input_event.type == ROTATE:
+                delta += input_event.delta
+                fast_delta += input_event.fast_delta
+            elif input_event.type == PRESS:
+                pressed.add(input_event.button)
+            elif input_event.type == LONG_PRESS:
+                long_pressed.add(input_event.button)
+            elif input_event.type == REPEAT and input_event.button in ("left", "right"):
+                # Gehaltenes Links/Rechts springt weiter durch die Songs
+                pressed.add(input_event.button)
+        if delta or pressed or long_pressed:
+            self.scheduler.invalidate()
+
+        # Versteckter Debug-Screen: im Hauptmenü "Hoch" gedrückt halten
+        if "up" in long_pressed and self.state == "main_menu":
+            self.open_debug_screen()
+            return
+
+        # 1. Encoder-Drehung (Navigation)
+        if delta != 0:
+            if self.state == "main_menu":
+                self.selected_index = (self.selected_index + delta) % len(self.main_menu_options)
+            elif self.state == "music_menu":
+                self.selected_index = (self.selected_index + delta) % len(self.music_menu_options)
+            elif self.state == "settings_menu":
+                self.selected_index = (self.selected_index + delta) % len(self.settings_menu_options)
+            elif self.state == "debug":
+                self.debug_line = max(0, self.debug_line + delta)
+            # Interpreten/Alben können während des Bibliotheks-Scans noch leer sein
+            elif self.state in ("artist_menu", "album_menu") and self._browse_list:
+                self.selected_index = self._scroll_list(self._browse_list, delta, fast_delta)
+            elif self.state == "all_songs_menu":
+                self.selected_index = self._scroll_list(audio_player.audio_files, delta, fast_delta,
+                                                        key=song_group_key)
+                self.main_scroll_offset = 0
+            elif self.state == "filtered_songs_menu":
+                # In Albumreihenfolge, Buchstabensprünge ergeben hier keinen Sinn
+                self.selected_index = self._scroll_list(self.current_song_filenames, delta, fast_delta,
+                                                        jumps=False)
+                self.main_scroll_offset = 0
+            elif self.state == "play":
+                self.volume = max(0.0, min(1.0, self.volume + (delta * 0.05)))
+                self.volume_control.set_volume(self.volume)
+                self.last_volume_change_time = time.time()
+
+        # 2. Select-Taste (Auswählen)
+        if "select" in pressed:
+            if self.state == "main_menu":
+                if self.selected_index == 0: self.state = "music_menu"; self.selected_index = 0
+                elif self.selected_index == 1: self.state = "settings_menu"; self.selected_index = 0
+            elif self.state == "music_menu":
+                if self.selected_index == 0: # Alle Songs
+                    self.state = "all_songs_menu"
+                    self.current_menu_title = "Alle Songs"
+                    self.current_song_list = audio_player.metadata # Liste aller Songs
+                    self.selected_index = 0
+                elif self.selected_index == 1: # Interpret
+                    self.state = "artist_menu"
+                    self.selected_index = 0
+                elif self.selected_index == 2: # Album
+                    self.state = "album_menu"
+                    self.selected_index = 0
+            elif self.state == "settings_menu":
+                self.ui.set_theme(self.selected_index)
+            elif self.state == "debug":
+                print(f"Profiler-Werte gespeichert: {profiler.dump(PROFILE_DUMP_FILE)}")
+            elif self.state == "artist_menu" and self._browse_list:
+                selected_artist = self._browse_list[self.selected_index]
+                self.current_song_list = audio_player.get_songs_by_artist(selected_artist)
+                self.current_song_filenames = [song['file'] for song in self.current_song_list]
+                self.current_menu_title = selected_artist
+                self.state = "filtered_songs_menu"
+                self.selected_index = 0
+            elif self.state == "album_menu" and self._browse_list:
+                selected_album = self._browse_list[self.selected_index]
+                self.current_song_list = audio_player.get_songs_by_album(selected_album)
+                self.current_song_filenames = [song['file'] for song in self.current_song_list]
+                self.current_menu_title = selected_album
+                self.state = "filtered_songs_menu"
+                self.selected_index = 0
+            elif self.state == "all_songs_menu" or self.state == "filtered_songs_menu":
+                song_to_play_info = self.current_song_list[self.selected_index]
+                original_idx = song_to_play_info['original_index']
+                if self.current_song_index == original_idx:
+                    self.state = "play"
+                else:
+                    self.current_song_index = audio_player.play_song(original_idx)
+                    self.paused = False
+                    self.state = "play"
+            elif self.state == "play":
+                audio_player.pause()
+                self.paused = not self.paused
+
+        # 3. Up-Taste (Zurück)
+        if "up" in pressed:
+            if self.state == "play":
+                if self.current_menu_title == "Alle Songs":
+                    self.state = "all_songs_menu"
+                else:
+                    self.state = "filtered_songs_menu"
+            elif self.state in ["all_songs_menu", "artist_menu", "album_menu"]:
+                self.state = "music_menu"
+                self.selected_index = 0
+            elif self.state == "filtered_songs_menu":
+                if audio_player.has_artist(self.current_menu_title):
+                    self.state = "artist_menu"
+                else:
+                    self.state = "album_menu"
+                self.selected_index = 0
+            elif self.state in ["music_menu", "settings_menu", "debug"]:
+                self.state = "main_menu"
+                self.selected_index = 0
+
+        # 4. Down-Taste (Pause/Play)
+        if "down" in pressed:
+            if self.state == "play" or self.state in ["all_songs_menu", "filtered_songs_menu"] and self.current_song_index is not None:
+                audio_player.pause()
+                self.paused = not self.paused
+
+        # 5. Links/Rechts-Tasten (Nächster/Vorheriger Song)
+        if self.state == "play":
+            if "left" in pressed:
+                self.current_song_index = audio_player.previous_song()
+            if "right" in pressed:
+                self.current_song_index = audio_player.next_song()
+
+    def _scroll_list(self, entries, delta, fast_delta, jumps=True, key=group_key):
+        """Neue Auswahl in einer langen Liste nach einer Encoder-Drehung.
+
+        Mit gehaltenem Links springt jede Rastung zur nächsten Buchstabengruppe. Sonst gilt
+        das beschleunigte Delta; ein beschleunigter Sprung bleibt am Listenende stehen statt
+        umzubrechen, nur einzelne Rastungen laufen wie bisher im Kreis.
+        """
+        if jumps and self.input_poller.is_held("left"):
+            self.last_jump_time = time.time()
+            return self._jump_index(entries, key).jump(self.selected_index, delta)
+        if fast_delta == delta:
+            return (self.selected_index + delta) % len(entries)
+        return max(0, min(len(entries) - 1, self.selected_index + fast_delta))
+
+    def _jump_index(self, entries, key=group_key):
+        """JumpIndex des aktuellen Menüs; neu gebaut, wenn die Liste ersetzt wurde oder gewachsen ist."""
+        cached = self._jump_indexes.get(self.state)
+        if cached is None or cached[0] is not entries or cached[1] != len(entries):
+            cached = (entries, len(entries), JumpIndex(entries, key))
+            self._jump_indexes[self.state] = cached
+        return cached[2]
+
+    def _draw_jump_label(self, entries, key=group_key, label=None):
+        """Buchstabe der aktuellen Gruppe (oder label(auswahl)) kurz nach einem Sprung über der Liste anzeigen."""
+        remaining = JUMP_LABEL_DURATION - (time.time() - self.last_jump_time)
+        if remaining > 0 and entries:
+            if label is not None:
+                text = label(entries[self.selected_index])
             else:
-                 state = "filtered_songs_menu"
-        elif state in ["all_songs_menu", "artist_menu", "album_menu"]:
-            state = "music_menu"
-            selected_index = 0
-        elif state == "filtered_songs_menu":
-            if current_menu_title in audio_player.artists:
-                state = "artist_menu"
+                text = self._jump_index(entries, key).label(self.selected_index)
+            self.ui.draw_jump_label(self.screen, text)
+            self.scheduler.schedule_in(remaining)
+
+    def _menu_entries(self):
+        """Die Einträge, aus denen im aktuellen Menü ausgewählt wird (None außerhalb von Listen)."""
+        audio_player = self.audio_player
+        if self.state == "all_songs_menu":
+            return audio_player.audio_files
+        if self.state == "filtered_songs_menu":
+            return self.current_song_filenames
+        if self.state == "artist_menu":
+            return audio_player.artists
+        if self.state == "album_menu":
+            return audio_player.albums
+        return None
+
+    def sync_selection(self):
+        """Hält die Auswahl im Interpret- und Albummenü auf demselben Namen.
+
+        Während des Scans ersetzt die TrackLibrary artists/albums durch neue Listen, in die
+        Namen auch vor der Auswahl eingefügt werden. Wie bei sync_library wird der gemerkte
+        Name in der neuen Liste gesucht; Eingaben und Zeichnen nutzen in diesem Durchlauf
+        dann dieselbe Liste (_browse_list), auch wenn der Scan sie inzwischen wieder ersetzt.
+        """
+        if self.state not in ("artist_menu", "album_menu"):
+            return
+        entries = self._menu_entries()
+        if entries is self._browse_list:
+            return
+        if self.state == self._browse_state and entries:
+            position = bisect_left(entries, self._browse_name) if self._browse_name is not None else 0
+            if position < len(entries) and entries[position] == self._browse_name:
+                self.selected_index = position
             else:
-                state = "album_menu"
-            selected_index = 0
-        elif state in ["music_menu", "settings_menu"]:
-            state = "main_menu"
-            selected_index = 0
-
-    # 4. Down-Taste (Pause/Play)
-    if seesaw_input.is_down_pressed():
-        time.sleep(0.2)
-        if state == "play" or state in ["all_songs_menu", "filtered_songs_menu"] and current_song_index is not None:
-            audio_player.pause()
-            paused = not paused
-
-    # 5. Links/Rechts-Tasten (Nächster/Vorheriger Song)
-    if state == "play":
-        if seesaw_input.is_left_pressed():
-            time.sleep(0.2)
-            current_song_index = audio_player.previous_song()
-        if seesaw_input.is_right_pressed():
-            time.sleep(0.2)
-            current_song_index = audio_player.next_song()
-            
-    # --- UI-Updates basierend auf dem Zustand ---
-    if state == "main_menu":
-        if audio_player.is_finished():
-            current_song_index = audio_player.next_song()
-            paused = False
-        ui.draw_generic_menu(screen, main_menu_options, selected_index, "Hauptmenü")
-    elif state == "music_menu":
-        if audio_player.is_finished():
-            current_song_index = audio_player.next_song()
-            paused = False
-        ui.draw_generic_menu(screen, music_menu_options, selected_index, "Musik")
-    elif state == "settings_menu":
-        if audio_player.is_finished():
-            current_song_index = audio_player.next_song()
-            paused = False
-        ui.draw_generic_menu(screen, settings_menu_options, selected_index, "Einstellungen")
-    elif state == "all_songs_menu":
-        if audio_player.is_finished():
-            current_song_index = audio_player.next_song()
-            paused = False
-        # Hier die Logik für das Scrollen beibehalten
-        line_height = ui.font.get_linesize() + 2
-        selected_y_on_screen = 5 + selected_index * line_height - main_menu_scroll_y
-        if selected_y_on_screen + line_height > HEIGHT:
-            main_menu_scroll_y = (selected_index + 1) * line_height - HEIGHT + 5
-        if selected_y_on_screen < 5:
-            main_menu_scroll_y = selected_index * line_height
-            
-        # Horizontalen Scroll-Offset für lange Titel berechnen
-        text_width = ui.font.size(os.path.splitext(audio_player.audio_files[selected_index])[0])[0]
-        if text_width > WIDTH - 30:
-            now = time.time()
-            if now - last_main_scroll_time > 0.1:
-                main_scroll_offset = (main_scroll_offset + 2)
-                last_main_scroll_time = now
+                self.selected_index = min(self.selected_index, len(entries) - 1)
+        self._browse_state = self.state
+        self._browse_list = entries
+        self.scheduler.invalidate()
+
+    def _remember_selection(self):
+        """Merkt sich nach den Eingaben Liste und Namen der Auswahl für sync_selection."""
+        if self.state not in ("artist_menu", "album_menu"):
+            self._browse_state = self._browse_list = self._browse_name = None
+            return
+        if self.state != self._browse_state:
+            # Gerade ins Menü gewechselt
+            self._browse_state = self.state
+            self._browse_list = self._menu_entries()
+        entries = self._browse_list
+        self._browse_name = entries[self.selected_index] if self.selected_index < len(entries) else None
+
+    def sync_library(self):
+        """Übernimmt Änderungen des LibraryWatchers. Die Auswahl bleibt auf demselben Eintrag."""
+        audio_player = self.audio_player
+        if not audio_player.library_update_pending:
+            return
+        entries = self._menu_entries()
+        selected = entries[self.selected_index] if entries and self.selected_index < len(entries) else None
+        if not audio_player.apply_library_update():
+            return
+
+        # Gefilterte Liste neu holen, sie enthält Track-IDs der alten Bibliothek
+        self._refresh_song_list()
+        if self.state == "filtered_songs_menu" and not self.current_song_list:
+            # Interpret/Album gibt es nicht mehr
+            self.state = "music_menu"
+            self.selected_index = 0
+        self._restore_selection(selected)
+
+    def sync_song_list(self):
+        """Baut eine während des Scans geöffnete gefilterte Songliste neu auf.
+
+        Der Scan trägt Tracks in die Indizes des Interpreten/Albums ein, ohne dass ein
+        Bibliotheks-Update ansteht. Kommen Songs dazu, wird die Liste neu geholt und die
+        Auswahl bleibt auf derselben Datei, wie bei sync_selection auf demselben Namen.
+        """
+        if self.state != "filtered_songs_menu":
+            return
+        audio_player = self.audio_player
+        title = self.current_menu_title
+        if audio_player.has_artist(title):
+            count = audio_player.count_songs_by_artist(title)
         else:
-            main_scroll_offset = 0
-        
-        ui.draw_all_songs_menu(screen, audio_player.audio_files, selected_index, current_song_index, paused, main_scroll_offset, main_menu_scroll_y)
-        
-    elif state == "artist_menu":
-        if audio_player.is_finished():
-            current_song_index = audio_player.next_song()
-            paused = False
-        # Hier die Logik für das Scrollen beibehalten
-        line_height = ui.font.get_linesize() + 2
-        selected_y_on_screen = 5 + selected_index * line_height - main_menu_scroll_y
-        if selected_y_on_screen + line_height > HEIGHT:
-            main_menu_scroll_y = (selected_index + 1) * line_height - HEIGHT + 5
-        if selected_y_on_screen < 5:
-            main_menu_scroll_y = selected_index * line_height
-            
-        # Horizontalen Scroll-Offset für lange Titel berechnen
-        text_width = ui.font.size(os.path.splitext(audio_player.audio_files[selected_index])[0])[0]
-        if text_width > WIDTH - 30:
-            now = time.time()
-            if now - last_main_scroll_time > 0.1:
-                main_scroll_offset = (main_scroll_offset + 2)
-                last_main_scroll_time = now
+            count = audio_player.count_songs_by_album(title)
+        if count == len(self.current_song_list):
+            return
+        entries = self.current_song_filenames
+        selected = entries[self.selected_index] if self.selected_index < len(entries) else None
+        self._refresh_song_list()
+        self._restore_selection(selected)
+
+    def _refresh_song_list(self):
+        """Holt die Songliste zum aktuellen Menütitel neu aus der Bibliothek."""
+        audio_player = self.audio_player
+        title = self.current_menu_title
+        if title == "Alle Songs":
+            self.current_song_list = audio_player.metadata
+        elif audio_player.has_artist(title):
+            self.current_song_list = audio_player.get_songs_by_artist(title)
+        elif audio_player.has_album(title):
+            self.current_song_list = audio_player.get_songs_by_album(title)
         else:
-            main_scroll_offset = 0
-        
-        ui.draw_generic_menu(screen, audio_player.artists, selected_index, "Interpreten")
-        
-    elif state == "album_menu":
-        if audio_player.is_finished():
-            current_song_index = audio_player.next_song()
-            paused = False
-        # Hier die Logik für das Scrollen beibehalten
-        line_height = ui.font.get_linesize() + 2
-        selected_y_on_screen = 5 + selected_index * line_height - main_menu_scroll_y
-        if selected_y_on_screen + line_height > HEIGHT:
-            main_menu_scroll_y = (selected_index + 1) * line_height - HEIGHT + 5
-        if selected_y_on_screen < 5:
-            main_menu_scroll_y = selected_index * line_height
-            
-        # Horizontalen Scroll-Offset für lange Titel berechnen
-        text_width = ui.font.size(os.path.splitext(audio_player.audio_files[selected_index])[0])[0]
-        if text_width > WIDTH - 30:
-            now = time.time()
-            if now - last_main_scroll_time > 0.1:
-                main_scroll_offset = (main_scroll_offset + 2)
-                last_main_scroll_time = now
-        else:
-            main_scroll_offset = 0
-        
-        ui.draw_generic_menu(screen, audio_player.albums, selected_index, "Alben")
-    
-    elif state == "filtered_songs_menu":
-        if audio_player.is_finished():
-            current_song_index = audio_player.next_song()
-            paused = False
-        
-        song_filenames = [song['file'] for song in current_song_list]
-
-        # KORREKTUR: Scroll-Logik von "all_songs_menu" hierher kopiert
-        line_height = ui.font.get_linesize() + 2
-        selected_y_on_screen = 5 + selected_index * line_height - main_menu_scroll_y
-        if selected_y_on_screen + line_height > HEIGHT:
-            main_menu_scroll_y = (selected_index + 1) * line_height - HEIGHT + 5
-        if selected_y_on_screen < 5:
-            main_menu_scroll_y = selected_index * line_height
-            
-        text_to_check = os.path.splitext(song_filenames[selected_index])[0]
-        text_width = ui.font.size(text_to_check)[0]
-        if text_width > WIDTH - 30:
+            self.current_song_list = []
+        if title != "Alle Songs":
+            self.current_song_filenames = [song['file'] for song in self.current_song_list]
+
+    def _restore_selection(self, selected):
+        """Setzt die Auswahl wieder auf den Eintrag selected, sonst bleibt die Position."""
+        entries = self._menu_entries()
+        if entries is not None:
+            if selected in entries:
+                self.selected_index = entries.index(selected)
+            else:
+                self.selected_index = max(0, min(self.selected_index, len(entries) - 1))
+        self.scheduler.invalidate()
+
+    def sync_playback(self):
+        # --- UI-Updates basierend auf dem Zustand ---
+        # Der Trackwechsel am Songende passiert im AudioPlayer (libvlc-Event), hier wird nur
+        # der lokal gespiegelte Wiedergabezustand gelesen
+        audio_player = self.audio_player
+        if audio_player.state.index is not None:
+            if self.current_song_index != audio_player.current_index or self.paused != audio_player.paused:
+                self.scheduler.invalidate()
+            if self.album_art is not None and self._art_index != audio_player.current_index:
+                # Cover des neuen Tracks und der Nachbarn schon laden, bevor der Play-Screen sie braucht
+                files = audio_player.audio_files
+                index = self._art_index = audio_player.current_index
+                self.album_art.prefetch([files[index], files[(index + 1) % len(files)], files[index - 1]])
+            self.current_song_index = audio_player.current_index
+            self.paused = audio_player.paused
+
+    def _create_visualizer(self, tap=None):
+        """Visualizer mit der Loopback-Quelle (oder einem übergebenen PCMTap), None wenn nicht verfügbar."""
+        if tap is None:
+            tap = PCMTap()
+            try:
+                self.pcm_source = AlsaLoopbackSource(tap, VISUALIZER_DEVICE)
+            except Exception as e:
+                # RuntimeError ohne pyalsaaudio, ALSAAudioError ohne Loopback-Gerät
+                print(f"Visualizer nicht verfügbar: {e}")
+                return None
+        visualizer = Visualizer(tap, at_risk=self._frame_budget_at_risk, on_update=self._visualizer_update)
+        visualizer.start()
+        return visualizer
+
+    def _frame_budget_at_risk(self):
+        """Für den Visualizer: Zeichnen braucht schon die Hälfte des Frames, Frames fallen weg
+        oder die Loopback-Quelle verliert Samples."""
+        dropped = self.display_controller.frames_dropped
+        at_risk = dropped > self._dropped_frames or self.last_render_time > self.scheduler.min_interval / 2
+        self._dropped_frames = dropped
+        # Das native Backend meldet, wenn die Soundkarte leer gelaufen ist
+        underruns = getattr(self.audio_player.player, "underruns", 0)
+        if underruns > self._underruns:
+            at_risk = True
+        self._underruns = underruns
+        if self.pcm_source is not None and self.pcm_source.overruns:
+            self.pcm_source.overruns = 0
+            at_risk = True
+        return at_risk
+
+    def _visualizer_update(self):
+        """Aus dem Visualizer-Thread: neues Spektrum zeichnen."""
+        if self.state == "play":
+            self.scheduler.invalidate()
+            self.input_wakeup.set()
+
+    def _album_art_ready(self, file):
+        """Aus dem Cover-Thread: neu zeichnen, wenn das Cover gerade gebraucht wird."""
+        if self.state == "play":
+            self.scheduler.invalidate()
+            self.input_wakeup.set()
+
+    def _advance_main_scroll(self, filename):
+        """Horizontaler Scroll-Offset für lange Titel (ob gescrollt wird, weiß der Lauftext)."""
+        if self.ui.song_title_marquee(filename).needs_scroll:
             now = time.time()
-            if now - last_main_scroll_time > 0.1:
-                main_scroll_offset = (main_scroll_offset + 2)
-                last_main_scroll_time = now
-        else:
-            main_scroll_offset = 0
-
-        # KORREKTUR: main_scroll_offset und main_menu_scroll_y werden jetzt übergeben
-        ui.draw_all_songs_menu(screen, song_filenames, selected_index, current_song_index, paused, main_scroll_offset, main_menu_scroll_y)
-
-
-
-    elif state == "play":
-        if audio_player.is_finished():
-            current_song_index = audio_player.next_song()
-            paused = False
-        
-        # Zeit immer vom Player holen
-        elapsed = audio_player.get_current_time()
-        progress = (elapsed / audio_player.song_length) if audio_player.song_length > 0 else 0
-        
-        if progress >= 1.0 and audio_player.song_length > 0:
-            current_song_index = audio_player.next_song()
-            paused = False
-
-        # BUGFIX 3: Horizontalen Scroll-Offset für Play-Screen
-        title_text = os.path.splitext(audio_player.audio_files[current_song_index])[0]
-        title_width = pygame.font.SysFont(None, 18).size(title_text)[0]
-        if title_width > WIDTH - 20:
-             now = time.time()
-             if now - last_play_scroll_time > 0.1:
-                 play_scroll_offset = (play_scroll_offset + 2)
-                 last_play_scroll_time = now
+            if now - self.last_main_scroll_time >= 0.1:
+                self.main_scroll_offset = (self.main_scroll_offset + 2)
+                self.last_main_scroll_time = now
+            self.scheduler.schedule_in(self.last_main_scroll_time + 0.1 - now)
         else:
-            play_scroll_offset = 0
-            
-        ui.draw_play_menu(screen, title_text, progress, elapsed, audio_player.song_length, not paused, play_scroll_offset, volume, last_volume_change_time, VOLUME_DISPLAY_DURATION)
+            self.main_scroll_offset = 0
 
+    def draw(self):
+        screen = self.screen
+        ui = self.ui
+        audio_player = self.audio_player
+        state = self.state
 
+        if state == "main_menu":
+            ui.draw_generic_menu(screen, self.main_menu_options, self.selected_index, "Hauptmenü")
+        elif state == "music_menu":
+            ui.draw_generic_menu(screen, self.music_menu_options, self.selected_index, "Musik")
+        elif state == "settings_menu":
+            ui.draw_generic_menu(screen, self.settings_menu_options, self.selected_index, "Einstellungen")
+        elif state == "debug":
+            ui.draw_debug_screen(screen, profiler.report_lines(), self.debug_line)
+            # Werte laufend aktualisieren
+            self.scheduler.schedule_in(0.5)
+        elif state == "all_songs_menu":
+            self._advance_main_scroll(audio_player.audio_files[self.selected_index])
+
+            # Vertikales Scrollen übernimmt die ListView der Oberfläche
+            ui.draw_all_songs_menu(screen, audio_player.audio_files, self.selected_index, self.current_song_index,
+                                   self.paused, self.main_scroll_offset)
+            self._draw_jump_label(audio_player.audio_files, label=song_jump_label)
+
+        elif state == "artist_menu":
+            ui.draw_generic_menu(screen, self._browse_list, self.selected_index, "Interpreten")
+            self._draw_jump_label(self._browse_list)
+
+        elif state == "album_menu":
+            ui.draw_generic_menu(screen, self._browse_list, self.selected_index, "Alben")
+            self._draw_jump_label(self._browse_list)
 
-    display_controller.update_display(screen)
-    clock.tick(30)
+        elif state == "filtered_songs_menu":
+            self._advance_main_scroll(self.current_song_filenames[self.selected_index])
+
+            ui.draw_all_songs_menu(screen, self.current_song_filenames, self.selected_index, self.current_song_index,
+                                   self.paused, self.main_scroll_offset)
+
+        elif state == "play":
+
+            # Zeit immer vom Player holen
+            elapsed = audio_player.get_current_time()
+            progress = (elapsed / audio_player.song_length) if audio_player.song_length > 0 else 0
+
+            # BUGFIX 3: Horizontalen Scroll-Offset für Play-Screen
+            current_file = audio_player.audio_files[self.current_song_index]
+            title_text = song_title(current_file)
+            if ui.play_title_marquee(title_text).needs_scroll:
+                now = time.time()
+                if now - self.last_play_scroll_time >= 0.1:
+                    self.play_scroll_offset = (self.play_scroll_offset + 2)
+                    self.last_play_scroll_time = now
+                self.scheduler.schedule_in(self.last_play_scroll_time + 0.1 - now)
+            else:
+                self.play_scroll_offset = 0
+
+            # Neu zeichnen, wenn die Zeitanzeige umspringt bzw. die Lautstärkeanzeige verschwindet
+            if not self.paused:
+                self.scheduler.schedule_in(1.0 - elapsed % 1.0)
+            volume_remaining = VOLUME_DISPLAY_DURATION - (time.time() - self.last_volume_change_time)
+            if volume_remaining > 0:
+                self.scheduler.schedule_in(volume_remaining)
+
+            art = self.album_art.get(current_file) if self.album_art is not None else None
+            ui.draw_play_menu(screen, title_text, progress, elapsed, audio_player.song_length, not self.paused,
+                              self.play_scroll_offset, self.volume, self.last_volume_change_time,
+                              VOLUME_DISPLAY_DURATION, art)
+            if self.visualizer is not None and not self.paused:
+                ui.draw_visualizer(screen, self.visualizer.levels, VISUALIZER_RECT)
+
+
+def start_app(boot, create_display, create_dac, create_player, create_input, rgb565=RENDER_RGB565, **kwargs):
+    """Startet Display, DAC, Player (libvlc, Bibliotheksindex) und Seesaw parallel.
+
+    Die Reset-Sequenz des Displays (knapp eine Sekunde Wartezeit) läuft so gleichzeitig
+    mit DAC-Reset, dem Laden von libvlc und dem Seesaw-Test. Sobald das Panel bereit ist,
+    wird ein Startbild gesendet, die App entsteht, wenn alle Schritte fertig sind.
+    """
+    boot.run("display", create_display)
+    boot.run("dac", create_dac)
+    boot.run("player", create_player)
+    boot.run("input", create_input)
+
+    pygame.init()
+    ui = UserInterface(WIDTH, HEIGHT, rgb565=rgb565)
+    if rgb565:
+        splash = pygame.Surface((WIDTH, HEIGHT), 0, 16, RGB565_MASKS)
+    else:
+        splash = pygame.Surface((WIDTH, HEIGHT))
+    ui.draw_splash(splash)
+
+    display_controller = boot.result("display")
+    display_controller.update_display(splash)
+    boot.mark("first_frame")
+
+    dac = boot.result("dac")
+    app = MusicPlayerApp(boot.result("player"), display_controller, boot.result("input"),
+                         dac if USE_DAC_VOLUME else None, rgb565=rgb565, ui=ui, **kwargs)
+    boot.mark("playable")
+    return app
+
+
+def create_audio_player(folder, backend=AUDIO_BACKEND, sink=NATIVE_SINK):
+    """AudioPlayer mit libvlc oder dem nativen Backend (siehe AUDIO_BACKEND)."""
+    if backend == "native":
+        from native_playback import NativeBackend
+        native = NativeBackend(sink, NATIVE_BUFFER_MS, NATIVE_PERIOD_FRAMES, NATIVE_PERIODS,
+                               tap=PCMTap() if VISUALIZER else None)
+        return AudioPlayer(folder, vlc_module=native)
+    return AudioPlayer(folder)
+
+
+def create_fake_app(folder, boot=None, create_player=None, seesaw_interrupt=False, **kwargs):
+    """Player mit den Hardware-Attrappen aus fake_backends (Debugging am PC, Benchmarks).
+
+    Ohne create_player spielt fake_vlc (keine Ausgabe), z.B. mit dem nativen Backend und
+    sink="alsa" ist am PC auch etwas zu hören. Mit seesaw_interrupt ist die INT-Leitung
+    des Seesaw (über einen FakeGPIO-Alert) angeschlossen.
+    """
+    from fake_backends import FakeDAC, FakeGPIO, FakeSeesaw, FakeSPI, fake_vlc
+
+    def create_input():
+        device = FakeSeesaw()
+        if not seesaw_interrupt:
+            return SeesawInput(device=device)
+        gpio = FakeGPIO()
+        device.connect_interrupt(gpio, 17)
+        return SeesawInput(int_pin=17, device=device, gpio=gpio)
+
+    return start_app(
+        boot or Startup(),
+        lambda: DisplayController(WIDTH, HEIGHT, DC_PIN, RESET_PIN, spi=FakeSPI(), gpio=FakeGPIO()),
+        FakeDAC,
+        create_player or (lambda: AudioPlayer(folder, vlc_module=fake_vlc)),
+        create_input,
+        **kwargs)
+
+
+def _request_profile_dump(signum, frame):
+    """Signal-Handler für SIGUSR1. Läuft im Hauptthread, womöglich mitten in profiler.record(),
+    darf also keine Locks nehmen: nur vormerken, geschrieben wird im nächsten step()."""
+    global _profile_dump_requested
+    _profile_dump_requested = True
+
+
+_profile_dump_requested = False
+
+
+def _command_line_option(name, default):
+    """Wert von --name=wert aus sys.argv."""
+    for arg in sys.argv[1:]:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return default
+
+
+def main():
+    boot = Startup(BOOT_TIME)
+    profiler.enabled = PROFILING
+    # Profiler-Werte im Feld abrufen: kill -USR1 <pid>
+    signal.signal(signal.SIGUSR1, _request_profile_dump)
+    backend = "native" if "--native" in sys.argv else AUDIO_BACKEND
+    sink = _command_line_option("sink", NATIVE_SINK)
+    if "--fake" in sys.argv:
+        # Ohne Pi: Attrappen statt Hardware, gezeichnet wird ins Debug-Fenster
+        create_player = (lambda: create_audio_player(mp3_folder, backend, sink)) if backend == "native" else None
+        app = create_fake_app(mp3_folder, boot, create_player, rgb565=False)
+        while True:
+            if app.step():
+                pygame.display.flip()
+
+    app = start_app(
+        boot,
+        lambda: DisplayController(WIDTH, HEIGHT, DC_PIN, RESET_PIN),
+        init_dac,
+        lambda: create_audio_player(mp3_folder, backend, sink),
+        lambda: SeesawInput(int_pin=SEESAW_INT_PIN))
+    print("Start:\n" + boot.report())
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import pygame
+
+
+class Marquee:
+    """Lauftext, der einmal als umlaufender Streifen vorgerendert wird.
+
+    Der Streifen enthält den Text zweimal hintereinander auf deckendem Hintergrund, so
+    dass jedes Fenster der Breite width ein zusammenhängendes Rechteck ist. Pro Frame wird
+    nur noch ein Ausschnitt geblittet - ohne neue Surfaces oder Rects.
+    """
+
+    GAP = "   "
+
+    def __init__(self, text_surface, bg, width, height):
+        self.width = width
+        self.height = height
+        self.period = text_surface.get_width()
+        self.needs_scroll = self.period > width
+        if self.needs_scroll:
+            self.strip = pygame.Surface((self.period + width, height))
+            self.strip.fill(bg)
+            self.strip.blit(text_surface, (0, 0))
+            self.strip.blit(text_surface, (self.period, 0))
+        else:
+            self.strip = text_surface
+        # Wiederverwendete Rects für Quellausschnitt und Zielposition; blits() mit
+        # doreturn=False legt im Gegensatz zu blit() auch kein Ergebnis-Rect an
+        self._source = pygame.Rect(0, 0, width, height)
+        self._target = pygame.Rect(0, 0, width, height)
+        self._blit_args = ((self.strip, self._target, self._source),)
+
+    def draw(self, screen, x, y, offset):
+        """Zeichnet den Ausschnitt ab offset (in Pixeln) an Position (x, y)."""
+        self._source.x = offset % self.period if self.needs_scroll else 0
+        self._target.x = x
+        self._target.y = y
+        screen.blits(self._blit_args, False)
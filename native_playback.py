@@ -0,0 +1,730 @@
+"""Schlankes Wiedergabe-Backend ohne libvlc: dekodieren, puffern, direkt an ALSA schreiben.
+
+NativeBackend bildet die Teile des vlc-Moduls nach, die der AudioPlayer benutzt (Instance,
+EventType, MediaParseFlag, MediaPlayer mit Events), und wird wie fake_vlc übergeben:
+
+    AudioPlayer(folder, vlc_module=NativeBackend(sink="alsa"))
+
+Dekodiert wird mit miniaudio (MP3, FLAC, WAV), ohne miniaudio nur WAV über das wave-Modul.
+Ein Decoder-Thread füllt einen festen Ringpuffer, ein zweiter Thread schreibt daraus
+periodenweise in die Ausgabe. Ausgaben: ALSA (pyalsaaudio), "null" (verwirft, in Echtzeit)
+und "wav:<datei>" (schreibt die Samples in eine Datei) für Tests ohne Hardware.
+"""
+import os
+import threading
+import time
+import types
+import wave
+
+import numpy as np
+
+from profiler import profiler
+
+# Beide optional: ohne miniaudio nur WAV, ohne pyalsaaudio nur die Test-Ausgaben
+try:
+    import miniaudio
+except ImportError:
+    miniaudio = None
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+# Ausgabeformat von miniaudio (passt zur Takt-Konfiguration des DAC)
+SAMPLE_RATE = 44100
+CHANNELS = 2
+# Ringpuffer-Größen sind ein Vielfaches davon, so passen ganze Frames bei 1 bis 8 Kanälen
+_FRAME_ALIGN = 48
+MAX_FRAME_BYTES = 16
+
+
+def _to_int16(data, width):
+    """8-, 24- und 32-Bit-PCM aus WAV-Dateien in int16 umrechnen."""
+    if width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.int16) - 128) << 8
+    elif width == 3:
+        # Little-Endian: die oberen zwei Bytes jedes Samples sind das int16
+        samples = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)[:, 1:].copy().view('<i2')
+    else:
+        samples = (np.frombuffer(data, dtype='<i4') >> 16).astype('<i2')
+    return samples.tobytes()
+
+
+class WavDecoder:
+    """Liest WAV-Dateien mit dem wave-Modul und liefert int16 im Format der Datei."""
+
+    def __init__(self, path, period_frames=1024):
+        self._file = wave.open(path, 'rb')
+        self.sample_rate = self._file.getframerate()
+        self.channels = self._file.getnchannels()
+        self._width = self._file.getsampwidth()
+        self._period_frames = period_frames
+
+    def read(self):
+        data = self._file.readframes(self._period_frames)
+        if self._width == 2 or not data:
+            return data
+        return _to_int16(data, self._width)
+
+    def seek(self, frame):
+        self._file.setpos(min(frame, self._file.getnframes()))
+
+    def close(self):
+        self._file.close()
+
+
+class MiniaudioDecoder:
+    """Dekodiert MP3/FLAC/WAV mit miniaudio, immer nach SAMPLE_RATE Stereo int16."""
+
+    def __init__(self, path, period_frames=1024):
+        self.path = path
+        self.sample_rate = SAMPLE_RATE
+        self.channels = CHANNELS
+        self._period_frames = period_frames
+        self._stream = None
+        self.seek(0)
+
+    def read(self):
+        while True:
+            try:
+                chunk = next(self._stream)
+            except StopIteration:
+                return b""
+            # Der Generator liefert zuerst ein leeres Array
+            if len(chunk):
+                return chunk.tobytes()
+
+    def seek(self, frame):
+        self.close()
+        self._stream = miniaudio.stream_file(self.path, miniaudio.SampleFormat.SIGNED16, self.channels,
+                                             self.sample_rate, self._period_frames, seek_frame=frame)
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+def open_decoder(path, period_frames=1024):
+    if miniaudio is not None:
+        return MiniaudioDecoder(path, period_frames)
+    if path.lower().endswith('.wav'):
+        return WavDecoder(path, period_frames)
+    raise RuntimeError(f"miniaudio nicht gefunden, {os.path.basename(path)} kann nicht dekodiert werden")
+
+
+class PCMRingBuffer:
+    """Fester Ringpuffer zwischen Decoder- und Ausgabe-Thread.
+
+    reset() beginnt eine neue Generation (neuer Track, Sprung): Der Inhalt wird verworfen,
+    ein Decoder der alten Generation bricht beim nächsten write() ab.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity - capacity % _FRAME_ALIGN
+        self._data = bytearray(self.capacity)
+        self._start = 0
+        self.fill = 0
+        self.finished = False  # Decoder am Dateiende
+        self.generation = 0
+        self._align = 4
+        self._changed = threading.Condition()
+
+    def reset(self, frame_bytes=4):
+        with self._changed:
+            self._start = 0
+            self.fill = 0
+            self.finished = False
+            self._align = frame_bytes
+            self.generation += 1
+            self._changed.notify_all()
+            return self.generation
+
+    def write(self, data, generation):
+        """Schreibt data vollständig, wartet dafür auf Platz. False, wenn die Generation vorbei ist."""
+        view = memoryview(data)
+        buffer = self._data
+        while len(view):
+            with self._changed:
+                while self.fill == self.capacity and generation == self.generation:
+                    self._changed.wait()
+                if generation != self.generation:
+                    return False
+                count = min(len(view), self.capacity - self.fill)
+                end = (self._start + self.fill) % self.capacity
+                first = min(count, self.capacity - end)
+                buffer[end:end + first] = view[:first]
+                buffer[:count - first] = view[first:count]
+                self.fill += count
+                self._changed.notify_all()
+            view = view[count:]
+        return True
+
+    def finish(self, generation):
+        with self._changed:
+            if generation == self.generation:
+                self.finished = True
+                self._changed.notify_all()
+
+    def read_into(self, out, timeout, generation):
+        """Kopiert bis zu len(out) Bytes (ganze Frames) nach out. 0, wenn nach timeout nichts da
+        ist oder die Generation inzwischen vorbei ist (die Daten gehören dann schon zum nächsten
+        Track, womöglich in einem anderen Format)."""
+        buffer = self._data
+        with self._changed:
+            if self.fill < self._align and not self.finished and generation == self.generation:
+                self._changed.wait(timeout)
+            if generation != self.generation:
+                return 0
+            count = min(len(out), self.fill)
+            count -= count % self._align
+            first = min(count, self.capacity - self._start)
+            out[:first] = buffer[self._start:self._start + first]
+            out[first:count] = buffer[:count - first]
+            self._start = (self._start + count) % self.capacity
+            self.fill -= count
+            if count:
+                self._changed.notify_all()
+            return count
+
+    def exhausted(self, generation):
+        return self.finished and self.fill < self._align and generation == self.generation
+
+
+# --- Ausgaben ---
+
+class NullSink:
+    """Verwirft die Samples. Mit realtime nimmt er sie nur so schnell an, wie eine Soundkarte
+    mit buffer_frames Puffer sie abspielen würde, sonst sofort. Ohne hardware_pause verhält
+    er sich beim Pausieren wie ein ALSA-Gerät ohne Pause (siehe AlsaSink.pause)."""
+
+    def __init__(self, realtime=True, buffer_frames=4096, hardware_pause=True):
+        self.realtime = realtime
+        self.hardware_pause = hardware_pause
+        self.buffer_frames = buffer_frames
+        self.sample_rate = SAMPLE_RATE
+        self.frame_bytes = CHANNELS * 2
+        self.frames_written = 0
+        self.underruns = 0
+        self._queued = 0.0
+        self._clock = time.monotonic()
+        self._paused = False
+
+    def open(self, sample_rate, channels):
+        self.sample_rate = sample_rate
+        self.frame_bytes = channels * 2
+        self.drop()
+
+    def _advance_clock(self):
+        now = time.monotonic()
+        if not self._paused:
+            self._queued = max(0.0, self._queued - (now - self._clock) * self.sample_rate)
+        self._clock = now
+
+    def write(self, data):
+        frames = len(data) // self.frame_bytes
+        if self.realtime:
+            self._advance_clock()
+            excess = self._queued + frames - self.buffer_frames
+            if excess > 0:
+                time.sleep(excess / self.sample_rate)
+                self._advance_clock()
+            self._queued += frames
+        self.frames_written += frames
+
+    def delay(self):
+        """Geschriebene, aber noch nicht gespielte Frames."""
+        if not self.realtime:
+            return 0
+        self._advance_clock()
+        return int(self._queued)
+
+    def pause(self, paused):
+        if not self.hardware_pause:
+            if paused:
+                self.drop()
+            return
+        self._advance_clock()
+        self._paused = paused
+
+    def drop(self):
+        self._queued = 0.0
+        self._paused = False
+        self._clock = time.monotonic()
+
+    def close(self):
+        pass
+
+
+class WavFileSink(NullSink):
+    """Schreibt alles Gespielte in eine WAV-Datei (jede Format-Änderung beginnt sie neu)."""
+
+    def __init__(self, path, realtime=False, buffer_frames=4096):
+        super().__init__(realtime, buffer_frames)
+        self.path = path
+        self._stream = None
+        self._file = None
+
+    def open(self, sample_rate, channels):
+        self.close()
+        super().open(sample_rate, channels)
+        # Datei selbst öffnen: wave.open() hinterlässt sonst bei einem ungültigen Pfad ein halbes
+        # Wave_write-Objekt, das beim Aufräumen noch einmal Fehler wirft
+        self._stream = open(self.path, 'wb')
+        self._file = wave.open(self._stream, 'wb')
+        self._file.setnchannels(channels)
+        self._file.setsampwidth(2)
+        self._file.setframerate(sample_rate)
+
+    def write(self, data):
+        super().write(data)
+        self._file.writeframes(data)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class AlsaSink:
+    """Ausgabe über pyalsaaudio. periods Perioden zu period_frames bilden den Hardware-Puffer."""
+
+    def __init__(self, device="default", period_frames=1024, periods=4):
+        if alsaaudio is None:
+            raise RuntimeError("pyalsaaudio nicht gefunden, bitte eine andere Ausgabe wählen (null, wav:<datei>)")
+        self.device = device
+        self.period_frames = period_frames
+        self.periods = periods
+        self.buffer_frames = period_frames * periods
+        self.sample_rate = SAMPLE_RATE
+        self.underruns = 0
+        self.pcm = None
+        self._xrun_state = None
+        self._hardware_pause = True
+
+    def open(self, sample_rate, channels):
+        self.close()
+        self.sample_rate = sample_rate
+        self.pcm = alsaaudio.PCM(alsaaudio.PCM_PLAYBACK, alsaaudio.PCM_NORMAL, device=self.device,
+                                 channels=channels, rate=sample_rate, format=alsaaudio.PCM_FORMAT_S16_LE,
+                                 periodsize=self.period_frames, periods=self.periods)
+        # PCM.state() gibt es erst ab pyalsaaudio 0.9, ohne bleibt underruns bei 0
+        self._xrun_state = getattr(alsaaudio, 'PCM_STATE_XRUN', None) if hasattr(self.pcm, 'state') else None
+
+    def write(self, data):
+        # pyalsaaudio behebt einen Unterlauf in write() selbst (snd_pcm_recover) und meldet ihn
+        # nicht, andere Fehler kommen als ALSAAudioError. Sichtbar ist der Unterlauf nur am
+        # Zustand vor dem Schreiben.
+        if self._xrun_state is not None and self.pcm.state() == self._xrun_state:
+            self.underruns += 1
+        # Blockiert, bis im Hardware-Puffer Platz ist
+        self.pcm.write(data)
+
+    def delay(self):
+        try:
+            return max(0, self.buffer_frames - self.pcm.avail())
+        except (AttributeError, alsaaudio.ALSAAudioError):
+            # Ältere pyalsaaudio-Versionen ohne avail(): voller Puffer angenommen
+            return self.buffer_frames
+
+    def pause(self, paused):
+        # default/dmix auf dem Pi können nicht pausieren. Dann wird beim Pausieren verworfen, was
+        # noch im Puffer steht; beim Fortsetzen füllt der Ringpuffer nach und die Position kommt
+        # wie immer aus den tatsächlich geschriebenen Frames (die verworfenen fehlen also)
+        if self._hardware_pause:
+            try:
+                self.pcm.pause(1 if paused else 0)
+                return
+            except alsaaudio.ALSAAudioError as e:
+                print(f"{self.device} kann nicht pausieren ({e}), Puffer wird stattdessen verworfen.")
+                self._hardware_pause = False
+                # Auch beim Fortsetzen: drop() holt ein pausiertes Gerät zurück
+                self.drop()
+                return
+        if paused:
+            self.drop()
+
+    def drop(self):
+        if hasattr(self.pcm, 'drop'):
+            self.pcm.drop()
+
+    def close(self):
+        if self.pcm is not None:
+            self.pcm.close()
+            self.pcm = None
+
+
+def create_sink(spec, period_frames=1024, periods=4):
+    """Ausgabe nach Name: "alsa", "alsa:<gerät>", "null" oder "wav:<datei>"."""
+    kind, _, argument = spec.partition(":")
+    if kind == "alsa":
+        return AlsaSink(argument or "default", period_frames, periods)
+    if kind == "null":
+        return NullSink(buffer_frames=period_frames * periods)
+    if kind == "wav":
+        return WavFileSink(argument or "native_output.wav", buffer_frames=period_frames * periods)
+    raise ValueError(f"Unbekannte Ausgabe: {spec}")
+
+
+# --- Nachbildung der libvlc-Schnittstelle ---
+
+class _EventManager:
+    def __init__(self):
+        self.callbacks = {}
+
+    def event_attach(self, event_type, callback):
+        self.callbacks[event_type] = callback
+
+    def fire(self, event_type, **fields):
+        callback = self.callbacks.get(event_type)
+        if callback is not None:
+            callback(types.SimpleNamespace(u=types.SimpleNamespace(**fields)))
+
+
+class NativeMedia:
+    """Eine Datei. parse_with_options öffnet den Decoder im Hintergrund und dekodiert schon die
+    ersten Perioden, damit play() sofort Samples hat (Gegenstück zum Vorparsen bei libvlc)."""
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.path = path
+        self._decoder = None
+        self._prebuffer = []
+        self._released = False
+        self._lock = threading.Lock()
+
+    def parse_with_options(self, flags, timeout):
+        threading.Thread(target=self._prepare, name="audio-prepare", daemon=True).start()
+
+    def _prepare(self):
+        with self._lock:
+            if self._released or self._decoder is not None:
+                return
+            try:
+                decoder = open_decoder(self.path, self.backend.period_frames)
+                for _ in range(self.backend.prebuffer_periods):
+                    data = decoder.read()
+                    if not data:
+                        break
+                    self._prebuffer.append(data)
+                self._decoder = decoder
+            except Exception:
+                # Der Fehler wird beim Abspielen erneut auftreten und dort gemeldet
+                self._prebuffer = []
+
+    def take(self):
+        """Übergibt Decoder und vorab dekodierte Daten (None, [] wenn nicht vorbereitet)."""
+        with self._lock:
+            decoder, prebuffer = self._decoder, self._prebuffer
+            self._decoder = None
+            self._prebuffer = []
+            return decoder, prebuffer
+
+    def release(self):
+        with self._lock:
+            self._released = True
+            if self._decoder is not None:
+                self._decoder.close()
+                self._decoder = None
+            self._prebuffer = []
+
+
+class NativePlayer:
+    """MediaPlayer mit Decoder-Thread, Ringpuffer und Ausgabe-Thread.
+
+    Nur der Ausgabe-Thread spricht mit der Ausgabe (ALSA ist nicht threadsicher). Nach jeder
+    Periode merkt er sich, wie viele Frames wirklich gespielt sind (geschrieben minus
+    Verzögerung der Ausgabe); get_time() rechnet von dort mit der Uhr weiter. Die Events
+    (Zeit, Ende, Fehler) kommen wie bei libvlc aus einem fremden Thread.
+    """
+
+    TIME_EVENT_INTERVAL = 0.25
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.events = _EventManager()
+        self.sink = backend.create_sink()
+        self.tap = backend.tap
+        frame_bytes = CHANNELS * 2
+        self.ring = PCMRingBuffer(int(backend.buffer_ms * SAMPLE_RATE / 1000) * frame_bytes)
+        self.media = None
+        self._lock = threading.RLock()
+        self._changed = threading.Condition()
+        self._generation = 0
+        self._format = None
+        self._playing = False
+        self._paused = False
+        self._error = False
+        self._base_frame = 0
+        self._total_written = 0  # Frames, die seit play()/Sprung an die Ausgabe gingen
+        self._played_frames = 0
+        self._played_at = None
+        self._sample_rate = SAMPLE_RATE
+        self.start_time = None  # Zeitpunkt von play(), für die Startlatenz
+        self.first_write_time = None
+        self._writer = threading.Thread(target=self._write_loop, name="audio-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def underruns(self):
+        return self.sink.underruns
+
+    def event_manager(self):
+        return self.events
+
+    def set_media(self, media):
+        self.stop()
+        self.media = media
+
+    def play(self):
+        with self._lock:
+            if self.media is None:
+                return -1
+            if self._playing and self._paused:
+                self.pause()
+                return 0
+            self.start_time = time.perf_counter()
+            decoder, prebuffer = self.media.take()
+            try:
+                if decoder is None:
+                    decoder = open_decoder(self.media.path, self.backend.period_frames)
+            except Exception as e:
+                print(f"{os.path.basename(self.media.path)} kann nicht geöffnet werden: {e}")
+                self._begin(None, error=True)
+                return -1
+            self._begin(decoder, prebuffer)
+            return 0
+
+    def _begin(self, decoder, prebuffer=(), frame=0, error=False):
+        with self._changed:
+            if decoder is not None:
+                self._format = (decoder.sample_rate, decoder.channels)
+                self._sample_rate = decoder.sample_rate
+            generation = self.ring.reset(decoder.channels * 2 if decoder is not None else 4)
+            self._generation = generation
+            self._base_frame = frame
+            self._total_written = 0
+            self._played_frames = 0
+            self._played_at = None
+            self.first_write_time = None
+            self._playing = True
+            self._paused = False
+            self._error = error
+            self._changed.notify_all()
+        if decoder is not None:
+            threading.Thread(target=self._decode_loop, args=(decoder, prebuffer, generation),
+                             name="audio-decode", daemon=True).start()
+
+    def pause(self):
+        with self._changed:
+            if not self._playing:
+                return
+            self._played_frames = self._current_frames()
+            self._played_at = time.monotonic() if self._paused else None
+            self._paused = not self._paused
+            self._changed.notify_all()
+
+    def stop(self):
+        with self._changed:
+            self.ring.reset()
+            self._generation = self.ring.generation
+            self._playing = False
+            self._paused = False
+            self._changed.notify_all()
+
+    def _current_frames(self):
+        frames = self._played_frames
+        if self._played_at is not None and not self._paused:
+            # Nicht über das hinaus, was schon an die Ausgabe ging
+            frames = min(self._total_written, frames + (time.monotonic() - self._played_at) * self._sample_rate)
+        return frames
+
+    def get_time(self):
+        """Position in Millisekunden, auf die Periode genau aus der Ausgabe, dazwischen per Uhr."""
+        with self._changed:
+            return int((self._base_frame + self._current_frames()) * 1000 / self._sample_rate)
+
+    def set_time(self, ms):
+        with self._lock:
+            if self.media is None or not self._playing or abs(ms - self.get_time()) < 100:
+                return
+            try:
+                decoder = open_decoder(self.media.path, self.backend.period_frames)
+                frame = int(ms * decoder.sample_rate / 1000)
+                decoder.seek(frame)
+            except Exception as e:
+                print(f"Springen in {os.path.basename(self.media.path)} fehlgeschlagen: {e}")
+                return
+            paused = self._paused
+            self._begin(decoder, frame=frame)
+            if paused:
+                self.pause()
+
+    # --- Threads ---
+
+    def _decode_loop(self, decoder, prebuffer, generation):
+        ring = self.ring
+        try:
+            for data in prebuffer:
+                if not ring.write(data, generation):
+                    return
+            while True:
+                start = profiler.start()
+                data = decoder.read()
+                profiler.stop("decode", start)
+                if not data:
+                    break
+                if not ring.write(data, generation):
+                    return
+            ring.finish(generation)
+        except Exception as e:
+            print(f"Fehler beim Dekodieren: {e}")
+            with self._changed:
+                if generation == self._generation:
+                    self._error = True
+                    self._changed.notify_all()
+        finally:
+            decoder.close()
+
+    def _write_loop(self):
+        sink = self.sink
+        chunk = memoryview(bytearray(self.backend.period_frames * MAX_FRAME_BYTES))
+        period = chunk
+        frame_bytes = 4
+        generation = None
+        sink_format = None
+        sink_paused = False
+        active = False
+        next_time_event = 0.0
+        while True:
+            with self._changed:
+                while (self._generation == generation
+                       and not (self._playing and not self._paused)
+                       and not (active and (self._paused != sink_paused or not self._playing))):
+                    self._changed.wait()
+                new_generation = self._generation
+                playing, paused, error, audio_format = self._playing, self._paused, self._error, self._format
+
+            try:
+                if new_generation != generation:
+                    # Neuer Track oder Sprung: Reste des alten verwerfen
+                    generation = new_generation
+                    if active:
+                        sink.drop()
+                        sink_paused = False
+                    if playing and not error:
+                        if audio_format != sink_format:
+                            sink.open(*audio_format)
+                            sink_format = audio_format
+                        frame_bytes = audio_format[1] * 2
+                        period = chunk[:self.backend.period_frames * frame_bytes]
+                        next_time_event = 0.0
+                        active = True
+                if not playing:
+                    if active:
+                        sink.drop()
+                        sink_paused = False
+                        active = False
+                    continue
+                if error:
+                    self._finish(generation, self.backend.EventType.MediaPlayerEncounteredError)
+                    continue
+                if paused != sink_paused:
+                    sink.pause(paused)
+                    sink_paused = paused
+                    if paused:
+                        continue
+
+                count = self.ring.read_into(period, 0.05, generation)
+                if count:
+                    sink.write(period[:count])
+                    if self.tap is not None:
+                        self.tap.write(period[:count])
+                    played = self._written(generation, count // frame_bytes, sink.delay())
+                    if played is not None and played >= next_time_event:
+                        next_time_event = played + self.TIME_EVENT_INTERVAL
+                        self.events.fire(self.backend.EventType.MediaPlayerTimeChanged, new_time=int(played * 1000))
+                elif self.ring.exhausted(generation):
+                    # Dateiende: warten, bis die Ausgabe alles gespielt hat
+                    while sink.delay() > 0 and generation == self._generation and not self._paused:
+                        time.sleep(0.01)
+                    if generation == self._generation and not self._paused:
+                        self._finish(generation, self.backend.EventType.MediaPlayerEndReached)
+            except Exception as e:
+                # Ausgabe nicht verfügbar (Gerät belegt, Datei nicht schreibbar, ...): als Fehler
+                # des Tracks melden, beim nächsten Track wird sie neu geöffnet
+                print(f"Fehler bei der Audioausgabe: {e}")
+                sink_format = None
+                sink_paused = False
+                active = False
+                self._fail(generation)
+
+    def _written(self, generation, frames, delay):
+        """Nach einer Periode: gespielte Frames merken. Gibt die Position in Sekunden zurück."""
+        with self._changed:
+            if generation != self._generation:
+                return None
+            if self.first_write_time is None:
+                self.first_write_time = time.perf_counter()
+            self._total_written += frames
+            self._played_frames = max(0, self._total_written - delay)
+            self._played_at = time.monotonic()
+            return (self._base_frame + self._played_frames) / self._sample_rate
+
+    def _fail(self, generation):
+        with self._changed:
+            if generation != self._generation:
+                return
+            self._error = True
+        self._finish(generation, self.backend.EventType.MediaPlayerEncounteredError)
+
+    def _finish(self, generation, event_type):
+        with self._changed:
+            if generation != self._generation:
+                return
+            self._playing = False
+        self.events.fire(event_type)
+
+
+class NativeInstance:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def media_player_new(self):
+        return NativePlayer(self.backend)
+
+    def media_new(self, path):
+        return NativeMedia(self.backend, path)
+
+
+class NativeBackend:
+    """Ersatz für das vlc-Modul im AudioPlayer.
+
+    sink wählt die Ausgabe (siehe create_sink). buffer_ms ist die Größe des Ringpuffers
+    zwischen Decoder und Ausgabe, period_frames die Blockgröße beim Dekodieren und Schreiben,
+    periods die Anzahl Perioden im ALSA-Puffer. Mit tap (visualizer.PCMTap) gehen alle
+    gespielten Samples zusätzlich an den Visualizer.
+    """
+
+    EventType = types.SimpleNamespace(
+        MediaPlayerEndReached="end", MediaPlayerTimeChanged="time", MediaPlayerEncounteredError="error")
+    MediaParseFlag = types.SimpleNamespace(local=0)
+
+    def __init__(self, sink="alsa", buffer_ms=500, period_frames=1024, periods=4, prebuffer_periods=4, tap=None):
+        self.sink = sink
+        self.buffer_ms = buffer_ms
+        self.period_frames = period_frames
+        self.periods = periods
+        self.prebuffer_periods = prebuffer_periods
+        self.tap = tap
+
+    def create_sink(self):
+        if not isinstance(self.sink, str):
+            return self.sink
+        return create_sink(self.sink, self.period_frames, self.periods)
+
+    def Instance(self, *args):
+        return NativeInstance(self)
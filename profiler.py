@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+from collections import deque
+
+
+class StageStats:
+    """Die letzten window Messwerte einer Stufe, Perzentile werden erst beim Auslesen berechnet."""
+
+    __slots__ = ('samples', 'count', 'total')
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        """{p50, p95, max} in Millisekunden über das aktuelle Fenster, dazu die Gesamtanzahl."""
+        samples = sorted(self.samples)
+        if not samples:
+            return {"count": self.count, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        last = len(samples) - 1
+        return {
+            "count": self.count,
+            "p50_ms": samples[last // 2] * 1000,
+            "p95_ms": samples[min(last, int(len(samples) * 0.95))] * 1000,
+            "max_ms": samples[-1] * 1000,
+        }
+
+
+class Profiler:
+    """Zeitmessung der Stufen im Hotpath (Zeichnen, Umwandlung, SPI, I2C, Lautstärke, libvlc).
+
+    Gemessen wird mit start()/stop() statt mit einem Kontextmanager: ist der Profiler aus,
+    kosten beide Aufrufe nur eine Attributabfrage. Stufen dürfen aus beliebigen Threads
+    gemeldet werden. Zähler (I2C-/SPI-Transaktionen) werden über add_counter als Funktionen
+    eingetragen und erst beim Auslesen abgefragt.
+    """
+
+    def __init__(self, enabled=False, window=256, frame_budget=1 / 30):
+        self.enabled = enabled
+        self.window = window
+        self.frame_budget = frame_budget
+        self.stages = {}
+        self.counters = {}
+        self.frames = 0
+        self.overruns = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Startzeitpunkt für stop(), 0.0 wenn der Profiler aus ist."""
+        return time.perf_counter() if self.enabled else 0.0
+
+    def stop(self, stage, start):
+        if not self.enabled or not start:
+            return
+        self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage, seconds):
+        """Trägt eine anderswo gemessene Dauer ein."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats(self.window)
+            stats.add(seconds)
+
+    def frame_done(self, start):
+        """Schließt einen Durchlauf des Hauptloops ab und zählt Überschreitungen des Frame-Budgets."""
+        if not self.enabled or not start:
+            return
+        seconds = time.perf_counter() - start
+        self.record("frame", seconds)
+        self.frames += 1
+        if seconds > self.frame_budget:
+            self.overruns += 1
+
+    def add_counter(self, name, read):
+        """read() liefert den aktuellen Stand eines fortlaufenden Zählers."""
+        self.counters[name] = read
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.frames = 0
+            self.overruns = 0
+            self.started_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            stages = {name: stats.summary() for name, stats in self.stages.items()}
+        return {
+            "enabled": self.enabled,
+            "uptime_s": time.monotonic() - self.started_at,
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "frame_budget_ms": self.frame_budget * 1000,
+            "stages": stages,
+            "counters": {name: read() for name, read in self.counters.items()},
+        }
+
+    def report_lines(self):
+        """Kurze Zeilen für den Debug-Screen: Stufe p50/p95/max in ms, danach die Zähler."""
+        data = self.snapshot()
+        lines = [f"Frames {data['frames']}  >{data['frame_budget_ms']:.0f}ms: {data['overruns']}"]
+        for name, stats in sorted(data["stages"].items()):
+            lines.append(f"{name:<7}{stats['p50_ms']:5.1f}{stats['p95_ms']:6.1f}{stats['max_ms']:6.1f}")
+        for name, value in data["counters"].items():
+            lines.append(f"{name:<7}{value:>17}")
+        return lines
+
+    def dump(self, path):
+        """Schreibt den aktuellen Stand als JSON nach path."""
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+
+# Gemeinsame Instanz für alle Module, eingeschaltet wird sie in main.py
+profiler = Profiler()
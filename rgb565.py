@@ -0,0 +1,82 @@
+import numpy as np
+
+
+# Farbmasken eines 16-Bit-Surfaces im Panel-Format
+RGB565_MASKS = (0xF800, 0x07E0, 0x001F, 0)
+
+
+def pack_rgb565(color):
+    """(r, g, b) -> 16-Bit-Wert im RGB565-Format."""
+    r, g, b = color[:3]
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+
+def unpack_rgb565(value):
+    """16-Bit-RGB565-Wert -> (r, g, b), so wie pygame ihn aus einem 16-Bit-Surface liest."""
+    r = (value >> 11) & 0x1F
+    g = (value >> 5) & 0x3F
+    b = value & 0x1F
+    return ((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2))
+
+
+class RGB565Converter:
+    """Wandelt Pixel-Daten ohne temporäre Kopien in das RGB565-Format des ST7735.
+
+    Alle Puffer werden einmalig angelegt und in jedem Frame wiederverwendet.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # Zwei native Frames: der aktuelle und der zuletzt gesendete (für den Vergleich)
+        self.frame = np.zeros((height, width), dtype=np.uint16)
+        self.last_frame = np.zeros((height, width), dtype=np.uint16)
+        self.changed = np.zeros((height, width), dtype=bool)
+        # Zwischenspeicher für Grün- und Blau-Kanal
+        self._green = np.empty((height, width), dtype=np.uint16)
+        self._blue = np.empty((height, width), dtype=np.uint16)
+        # Big-Endian-Sendepuffer, der direkt an spidev übergeben wird
+        self.send_buffer = np.empty(width * height, dtype='>u2')
+
+    def convert(self, pixels):
+        """Erwartet ein (Breite, Höhe, 3)-Array, z.B. aus pygame.surfarray.pixels3d."""
+        frame = self.frame
+        np.copyto(frame, pixels[:, :, 0].T)
+        frame &= 0xF8
+        frame <<= 8
+
+        green = self._green
+        np.copyto(green, pixels[:, :, 1].T)
+        green &= 0xFC
+        green <<= 3
+        frame |= green
+
+        blue = self._blue
+        np.copyto(blue, pixels[:, :, 2].T)
+        blue >>= 3
+        frame |= blue
+        return frame
+
+    def load_rgb565(self, pixels):
+        """Übernimmt ein (Breite, Höhe)-Array, das bereits RGB565 enthält (pygame.surfarray.pixels2d
+        eines 16-Bit-Surfaces). Es wird nur transponiert kopiert, die Byte-Vertauschung passiert
+        beim Packen in den Sendepuffer."""
+        np.copyto(self.frame, pixels.T)
+        return self.frame
+
+    def diff(self):
+        """Gibt eine Maske der Pixel zurück, die sich seit dem letzten Frame geändert haben."""
+        return np.not_equal(self.frame, self.last_frame, out=self.changed)
+
+    def pack_region(self, x0, y0, x1, y1):
+        """Kopiert einen Bereich in den Sendepuffer und gibt eine Byte-Ansicht darauf zurück."""
+        width = x1 - x0 + 1
+        height = y1 - y0 + 1
+        out = self.send_buffer[:width * height]
+        # Beim Kopieren in den Big-Endian-Puffer werden die Bytes gleich mit vertauscht
+        np.copyto(out.reshape(height, width), self.frame[y0:y1 + 1, x0:x1 + 1])
+        return out.view(np.uint8)
+
+    def swap(self):
+        """Merkt sich den aktuellen Frame als zuletzt gesendet."""
+        self.frame, self.last_frame = self.last_frame, self.frame
@@ -1,42 +1,224 @@
-import board
-from adafruit_seesaw import seesaw, rotaryio, digitalio
+import threading
+import time
+
+# Ohne Blinka/Seesaw-Bibliothek (z.B. am PC) nur mit übergebenem device nutzbar
+try:
+    import board
+    import digitalio as board_digitalio
+    from adafruit_seesaw import seesaw
+except ImportError:
+    board = board_digitalio = seesaw = None
+# Mit lgpio wartet der Input-Thread auf die fallende Flanke der INT-Leitung
+try:
+    import lgpio
+except ImportError:
+    lgpio = None
+
+# Button-Pins am Seesaw-Board
+SELECT_PIN = 1
+UP_PIN = 2
+LEFT_PIN = 3
+DOWN_PIN = 4
+RIGHT_PIN = 5
+BUTTON_MASK = sum(1 << pin for pin in range(SELECT_PIN, RIGHT_PIN + 1))
+
+
+class EncoderAcceleration:
+    """Vergrößert schnelle Encoder-Drehungen, damit auch lange Listen schnell durchlaufen sind.
+
+    Die Geschwindigkeit (Rastungen pro Sekunde) wird aus dem Abstand zum letzten Delta
+    geschätzt und geglättet. Bis slow Rastungen/s bleibt jede Rastung ein Schritt, darüber
+    steigt der Faktor quadratisch bis max_factor bei fast Rastungen/s. Eine Pause von mehr
+    als reset Sekunden oder ein Richtungswechsel beginnt wieder langsam.
+    """
+
+    def __init__(self, slow=4.0, fast=30.0, max_factor=60.0, smoothing=0.5, reset=0.25):
+        self.slow = slow
+        self.fast = fast
+        self.max_factor = max_factor
+        self.smoothing = smoothing
+        self.reset = reset
+        self.speed = 0.0
+        self._last_time = float('-inf')
+        self._last_sign = 0
+
+    def apply(self, delta, now):
+        if not delta:
+            return 0
+        sign = 1 if delta > 0 else -1
+        elapsed = now - self._last_time
+        self._last_time = now
+        if elapsed > self.reset or sign != self._last_sign:
+            self._last_sign = sign
+            self.speed = 0.0
+            return delta
+        speed = abs(delta) / max(elapsed, 0.001)
+        self.speed += (speed - self.speed) * self.smoothing
+        return round(delta * self.factor())
+
+    def factor(self):
+        if self.speed <= self.slow:
+            return 1.0
+        ratio = min(1.0, (self.speed - self.slow) / (self.fast - self.slow))
+        return 1.0 + (self.max_factor - 1.0) * ratio * ratio
+
+
+class InputSnapshot:
+    """Zustand von Encoder und Buttons zu einem Zeitpunkt (ein Objekt pro Frame).
+
+    delta sind die tatsächlichen Rastungen, fast_delta das beschleunigte Delta für lange Listen.
+    """
+
+    __slots__ = ('delta', 'fast_delta', 'buttons', 'select', 'up', 'left', 'down', 'right', 'timestamp')
+
+    def __init__(self, delta=0, buttons=BUTTON_MASK, timestamp=0.0, fast_delta=None):
+        self.delta = delta
+        self.fast_delta = delta if fast_delta is None else fast_delta
+        self.buttons = buttons
+        # Die Buttons ziehen den Pin auf Masse, gedrückt = Bit nicht gesetzt
+        self.select = not buttons & (1 << SELECT_PIN)
+        self.up = not buttons & (1 << UP_PIN)
+        self.left = not buttons & (1 << LEFT_PIN)
+        self.down = not buttons & (1 << DOWN_PIN)
+        self.right = not buttons & (1 << RIGHT_PIN)
+        self.timestamp = timestamp
+
+
+class InterruptLine:
+    """INT-Leitung des Seesaw über einen lgpio-Alert (lgpio-kompatibles gpio).
+
+    value ist wie bei digitalio der Pegel (low-aktiv), wait() blockiert bis zur nächsten
+    fallenden Flanke, ohne den I2C-Bus oder die CPU zu beanspruchen.
+    """
+
+    def __init__(self, gpio, line):
+        self.gpio = gpio
+        self.line = line
+        self.handle = gpio.gpiochip_open(0)
+        self._edge = threading.Event()
+        gpio.gpio_claim_alert(self.handle, line, gpio.FALLING_EDGE, gpio.SET_PULL_UP)
+        self._callback = gpio.callback(self.handle, line, gpio.FALLING_EDGE, self._on_edge)
+
+    def _on_edge(self, chip, gpio, level, tick):
+        self._edge.set()
+
+    @property
+    def value(self):
+        return bool(self.gpio.gpio_read(self.handle, self.line))
+
+    def wait(self, timeout):
+        """True, sobald INT aktiv ist, False nach timeout Sekunden ohne Änderung."""
+        self._edge.clear()
+        # Schon aktiv (Flanke vor dem clear): nicht auf die nächste warten
+        if not self.value:
+            return True
+        return self._edge.wait(timeout)
+
 
 class SeesawInput:
-    def __init__(self, addr=0x49):
-        self.i2c = board.I2C()
-        self.device = seesaw.Seesaw(self.i2c, addr=addr)
+    """Liest Encoder und Buttons des Seesaw-Boards mit möglichst wenigen I2C-Transaktionen.
+
+    Alle fünf Buttons werden mit einem einzigen Bulk-Read gelesen, der Encoder mit einem
+    Delta-Read. Ist die Interrupt-Leitung des Seesaw an int_pin angeschlossen, wird der
+    I2C-Bus nur gelesen, wenn sich etwas geändert hat, und wait_for_interrupt() wartet auf
+    die Leitung (mit lgpio auf die Flanke, sonst durch Abfragen des Pegels).
+    """
+
+    # Wartezeit zwischen Register-Anfrage und Antwort (Vorgabe der Seesaw-Bibliothek)
+    READ_DELAY = 0.008
+    # Ohne lgpio-Alert wird der Pegel der INT-Leitung in diesem Abstand abgefragt (kein I2C)
+    LEVEL_POLL_INTERVAL = 0.04
+
+    def __init__(self, addr=0x49, int_pin=None, device=None, gpio=None):
+        if device is None:
+            if seesaw is None:
+                raise RuntimeError("adafruit_seesaw nicht gefunden, bitte ein device übergeben")
+            self.i2c = board.I2C()
+            device = seesaw.Seesaw(self.i2c, addr=addr)
+        self.device = device
         product = (self.device.get_version() >> 16) & 0xFFFF
         print(f"Found product {product}")
         if product != 5740:
             print("Wrong firmware loaded? Expected 5740")
-        for pin in range(1, 6):
-            self.device.pin_mode(pin, self.device.INPUT_PULLUP)
-        self.select = digitalio.DigitalIO(self.device, 1)
-        self.up = digitalio.DigitalIO(self.device, 2)
-        self.left = digitalio.DigitalIO(self.device, 3)
-        self.down = digitalio.DigitalIO(self.device, 4)
-        self.right = digitalio.DigitalIO(self.device, 5)
-        self.encoder = rotaryio.IncrementalEncoder(self.device)
-        self.last_encoder_position = self.encoder.position
-
-    def get_encoder_delta(self):
-        current = self.encoder.position
-        delta = current - self.last_encoder_position
-        self.last_encoder_position = current
+        self.device.pin_mode_bulk(BUTTON_MASK, self.device.INPUT_PULLUP)
+        self.i2c_transactions = 0
+        self.acceleration = EncoderAcceleration()
+
+        self.interrupt = None
+        if int_pin is not None:
+            self.device.set_GPIO_interrupts(BUTTON_MASK, True)
+            self.device.enable_encoder_interrupt()
+            gpio = gpio or lgpio
+            if gpio is not None:
+                # board-Pins tragen die BCM-Nummer in id
+                self.interrupt = InterruptLine(gpio, getattr(int_pin, "id", int_pin))
+            else:
+                self.interrupt = board_digitalio.DigitalInOut(int_pin)
+                self.interrupt.direction = board_digitalio.Direction.INPUT
+                self.interrupt.pull = board_digitalio.Pull.UP
+
+        # Aufgelaufene Drehungen seit dem Einschalten verwerfen
+        self.device.encoder_delta()
+        self.snapshot = InputSnapshot(0, self._read_buttons(), time.monotonic())
+
+    def _read_buttons(self):
+        self.i2c_transactions += 1
+        return self.device.digital_read_bulk(BUTTON_MASK, delay=self.READ_DELAY)
+
+    def poll(self):
+        """Liest Encoder und Buttons und gibt einen neuen InputSnapshot zurück."""
+        now = time.monotonic()
+        if self.interrupt is not None and self.interrupt.value:
+            # INT ist low-aktiv: nichts geändert, gehaltene Buttons gelten weiter
+            self.snapshot = InputSnapshot(0, self.snapshot.buttons, now)
+            return self.snapshot
+
+        if self.interrupt is not None:
+            # Interrupt-Flag lesen setzt die INT-Leitung zurück
+            self.device.get_GPIO_interrupt_flag()
+            self.i2c_transactions += 1
+        buttons = self._read_buttons()
+        delta = self.device.encoder_delta()
+        self.i2c_transactions += 1
+        self.snapshot = InputSnapshot(delta, buttons, now, self.acceleration.apply(delta, now))
+        return self.snapshot
+
+    def wait_for_interrupt(self, timeout):
+        """Wartet höchstens timeout Sekunden auf eine Änderung an der INT-Leitung.
+
+        Gibt True zurück, wenn INT aktiv ist (poll() liest dann den Bus). Ohne lgpio-Alert
+        wird der Pegel alle LEVEL_POLL_INTERVAL Sekunden abgefragt.
+        """
+        if isinstance(self.interrupt, InterruptLine):
+            return self.interrupt.wait(timeout)
+        deadline = time.monotonic() + timeout
+        while self.interrupt.value:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(remaining, self.LEVEL_POLL_INTERVAL))
+        return True
+
+    def get_encoder_delta(self, accelerate=False):
+        """Rastungen seit dem letzten Lesen, mit accelerate nach Drehgeschwindigkeit vergrößert."""
+        self.i2c_transactions += 1
+        delta = self.device.encoder_delta()
+        if accelerate:
+            return self.acceleration.apply(delta, time.monotonic())
         return delta
 
+    # Die folgenden Abfragen beziehen sich auf den letzten poll()
     def is_select_pressed(self):
-        return not self.select.value
+        return self.snapshot.select
 
     def is_left_pressed(self):
-        return not self.left.value
+        return self.snapshot.left
 
     def is_right_pressed(self):
-        return not self.right.value
+        return self.snapshot.right
 
     def is_up_pressed(self):
-        return not self.up.value
+        return self.snapshot.up
 
     def is_down_pressed(self):
-        return not self.down.value
-
+        return self.snapshot.down
@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+class _Stage:
+    __slots__ = ('name', 'thread', 'result', 'error', 'started', 'finished')
+
+    def __init__(self, name):
+        self.name = name
+        self.thread = None
+        self.result = None
+        self.error = None
+        self.started = 0.0
+        self.finished = None
+
+
+class Startup:
+    """Führt voneinander unabhängige Startschritte parallel aus und misst die Zeiten.
+
+    run() startet einen Schritt in einem eigenen Thread, result() wartet auf ihn und gibt
+    sein Ergebnis zurück (eine Ausnahme des Schritts, auch SystemExit, wird dort erneut
+    ausgelöst). mark() hält Meilensteine wie den ersten Frame fest. Alle Zeiten zählen ab
+    boot_time (time.perf_counter(), z.B. ganz am Anfang von main.py genommen).
+    """
+
+    def __init__(self, boot_time=None):
+        self.boot_time = time.perf_counter() if boot_time is None else boot_time
+        self.stages = {}
+        self.marks = {}
+
+    def elapsed(self):
+        return time.perf_counter() - self.boot_time
+
+    def run(self, name, func, *args, **kwargs):
+        stage = _Stage(name)
+
+        def target():
+            try:
+                stage.result = func(*args, **kwargs)
+            except BaseException as e:
+                stage.error = e
+            stage.finished = self.elapsed()
+
+        stage.started = self.elapsed()
+        stage.thread = threading.Thread(target=target, name=f"startup-{name}", daemon=True)
+        self.stages[name] = stage
+        stage.thread.start()
+
+    def result(self, name):
+        stage = self.stages[name]
+        stage.thread.join()
+        if stage.error is not None:
+            raise stage.error
+        return stage.result
+
+    def mark(self, name):
+        self.marks[name] = self.elapsed()
+        return self.marks[name]
+
+    def report(self):
+        lines = []
+        for stage in self.stages.values():
+            if stage.finished is None:
+                lines.append(f"  {stage.name:<12} ab {stage.started * 1000:7.1f} ms  läuft noch")
+            else:
+                lines.append(f"  {stage.name:<12} ab {stage.started * 1000:7.1f} ms  fertig nach "
+                             f"{(stage.finished - stage.started) * 1000:7.1f} ms")
+        for name, at in self.marks.items():
+            lines.append(f"  {name:<12} {at * 1000:7.1f} ms nach dem Start")
+        return "\n".join(lines)
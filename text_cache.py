@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """LRU-Cache für gerenderte Text-Surfaces und Textbreiten.
+
+    Schlüssel ist (Font, Text, Farbe, Antialiasing). Font-Objekte müssen daher einmalig
+    angelegt und wiederverwendet werden. max_entries=0 schaltet den Cache ab.
+
+    Gebraucht werden nur die sichtbaren Zeilen in beiden Farben (Cursor) und die Texte
+    des Play-Screens; mehr Einträge erhöhen die Trefferquote nicht, kosten aber Speicher
+    (eine lange Listenzeile sind rund 40 KiB).
+    """
+
+    def __init__(self, max_entries=32, max_sizes=1024):
+        self.max_entries = max_entries
+        self.max_sizes = max_sizes
+        self._surfaces = OrderedDict()
+        self._sizes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if self.max_entries:
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.max_entries:
+                self._surfaces.popitem(last=False)
+        return surface
+
+    def size(self, font, text):
+        """Wie font.size(text), aber gecacht."""
+        key = (font, text)
+        size = self._sizes.get(key)
+        if size is not None:
+            self._sizes.move_to_end(key)
+            return size
+        size = font.size(text)
+        if self.max_sizes:
+            self._sizes[key] = size
+            if len(self._sizes) > self.max_sizes:
+                self._sizes.popitem(last=False)
+        return size
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._surfaces.clear()
+        self._sizes.clear()
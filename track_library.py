@@ -0,0 +1,243 @@
+import threading
+from array import array
+from bisect import bisect_left, insort
+
+
+class StringPool:
+    """Speichert jeden Namen nur einmal und vergibt dafür eine ganzzahlige ID."""
+
+    __slots__ = ('names', '_ids')
+
+    def __init__(self):
+        self.names = []
+        self._ids = {}
+
+    def intern(self, name):
+        name_id = self._ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self._ids[name] = name_id
+        return name_id
+
+    def get_id(self, name):
+        return self._ids.get(name)
+
+    def __getitem__(self, name_id):
+        return self.names[name_id] if name_id >= 0 else None
+
+
+class TrackRow:
+    """Leichte Zeilen-Ansicht auf einen Track, verhält sich beim Lesen wie das frühere Dict."""
+
+    __slots__ = ('_library', 'track_id')
+
+    def __init__(self, library, track_id):
+        self._library = library
+        self.track_id = track_id
+
+    def __getitem__(self, key):
+        library = self._library
+        track_id = self.track_id
+        if key == 'file':
+            return library.files[track_id]
+        if key == 'artist':
+            return library.artist_pool[library.artist_ids[track_id]]
+        if key == 'album':
+            return library.album_pool[library.album_ids[track_id]]
+        if key == 'original_index':
+            return track_id
+        if key == 'duration':
+            duration = library.durations[track_id]
+            return duration if duration >= 0 else None
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        return isinstance(other, TrackRow) and other._library is self._library and other.track_id == self.track_id
+
+    def __hash__(self):
+        return hash(self.track_id)
+
+    def __repr__(self):
+        return f"TrackRow({self['file']!r}, {self['artist']!r}, {self['album']!r})"
+
+
+class TrackList:
+    """Sequenz-Ansicht über alle Tracks (ersetzt die frühere Liste von Dicts)."""
+
+    __slots__ = ('_library',)
+
+    def __init__(self, library):
+        self._library = library
+
+    def __len__(self):
+        return len(self._library.files)
+
+    def __getitem__(self, track_id):
+        if isinstance(track_id, slice):
+            return [TrackRow(self._library, i) for i in range(len(self))[track_id]]
+        if track_id < 0:
+            track_id += len(self)
+        if not 0 <= track_id < len(self):
+            raise IndexError(track_id)
+        return TrackRow(self._library, track_id)
+
+    def __iter__(self):
+        library = self._library
+        return (TrackRow(library, i) for i in range(len(library.files)))
+
+
+class TrackLibrary:
+    """Spaltenorientierte Track-Tabelle mit Hash-Indizes für Interpret und Album.
+
+    Interpreten und Alben liegen je einmal in einem String-Pool, pro Track werden nur
+    ganzzahlige IDs und die Länge in kompakten Arrays gespeichert. Die Dateinamen sind
+    die (geteilte) sortierte Dateiliste des AudioPlayers. Interpret -> Track-IDs,
+    Album -> Track-IDs und Interpret -> Alben werden beim Eintragen inkrementell gepflegt.
+    Track-IDs sind die Positionen in der Dateiliste.
+    """
+
+    def __init__(self, files):
+        self.files = files
+        self.positions = {file: i for i, file in enumerate(files)}
+        self.artist_pool = StringPool()
+        self.album_pool = StringPool()
+        # -1 = noch nicht gescannt
+        self.artist_ids = array('i', [-1]) * len(files)
+        self.album_ids = array('i', [-1]) * len(files)
+        self.durations = array('f', [-1.0]) * len(files)
+        self.metadata = TrackList(self)
+        # Sortierte Listen für die Menüs; sie werden bei Änderungen ersetzt, nie verändert
+        self.artists = []
+        self.albums = []
+        self._by_artist = {}
+        self._by_album = {}
+        self._artist_albums = {}
+        self._lock = threading.Lock()
+
+    def set_track_info(self, track_id, artist, album, duration=None):
+        """Setzt Interpret, Album und Länge eines Tracks und aktualisiert die Indizes."""
+        with self._lock:
+            if self.artist_ids[track_id] >= 0:
+                self._unindex(track_id)
+            artist_id = self.artist_pool.intern(artist)
+            album_id = self.album_pool.intern(album)
+            self.artist_ids[track_id] = artist_id
+            self.album_ids[track_id] = album_id
+            if duration is not None:
+                self.durations[track_id] = duration
+
+            ids = self._by_artist.get(artist_id)
+            if ids is None:
+                self._by_artist[artist_id] = array('i', [track_id])
+                self.artists = self._inserted(self.artists, artist)
+            else:
+                insort(ids, track_id)
+
+            ids = self._by_album.get(album_id)
+            if ids is None:
+                self._by_album[album_id] = array('i', [track_id])
+                self.albums = self._inserted(self.albums, album)
+            else:
+                insort(ids, track_id)
+
+            albums = self._artist_albums.setdefault(artist_id, {})
+            albums[album_id] = albums.get(album_id, 0) + 1
+
+    def rebuilt(self, files, infos=None):
+        """Neue Bibliothek für eine geänderte Dateiliste (Dateien hinzugefügt oder entfernt).
+
+        Die Metadaten bekannter Dateien werden übernommen, ohne sie erneut zu lesen, infos
+        ({datei: (interpret, album, länge)}) ergänzt neue oder geänderte Dateien. Die
+        Track-IDs sind danach die Positionen in der neuen Liste.
+        """
+        library = TrackLibrary(files)
+        infos = infos or {}
+        with self._lock:
+            for track_id, file in enumerate(files):
+                info = infos.get(file)
+                if info is not None:
+                    library.set_track_info(track_id, *info)
+                    continue
+                old_id = self.positions.get(file)
+                if old_id is not None and self.artist_ids[old_id] >= 0:
+                    library.set_track_info(track_id, self.artist_pool[self.artist_ids[old_id]],
+                                           self.album_pool[self.album_ids[old_id]], self.get_duration(old_id))
+        return library
+
+    def _unindex(self, track_id):
+        artist_id = self.artist_ids[track_id]
+        album_id = self.album_ids[track_id]
+
+        ids = self._by_artist[artist_id]
+        del ids[bisect_left(ids, track_id)]
+        if not ids:
+            del self._by_artist[artist_id]
+            self.artists = self._removed(self.artists, self.artist_pool[artist_id])
+
+        ids = self._by_album[album_id]
+        del ids[bisect_left(ids, track_id)]
+        if not ids:
+            del self._by_album[album_id]
+            self.albums = self._removed(self.albums, self.album_pool[album_id])
+
+        albums = self._artist_albums[artist_id]
+        albums[album_id] -= 1
+        if not albums[album_id]:
+            del albums[album_id]
+        if not albums:
+            del self._artist_albums[artist_id]
+
+    @staticmethod
+    def _inserted(names, name):
+        names = names[:]
+        insort(names, name)
+        return names
+
+    @staticmethod
+    def _removed(names, name):
+        names = names[:]
+        del names[bisect_left(names, name)]
+        return names
+
+    def get_duration(self, track_id):
+        duration = self.durations[track_id]
+        return duration if duration >= 0 else None
+
+    def get_songs_by_artist(self, artist_name):
+        """Gibt die Songs eines Interpreten in Bibliotheks-Reihenfolge zurück."""
+        with self._lock:
+            ids = self._by_artist.get(self.artist_pool.get_id(artist_name), ())
+            return [TrackRow(self, i) for i in ids]
+
+    def get_songs_by_album(self, album_name):
+        """Gibt die Songs eines Albums in Bibliotheks-Reihenfolge zurück."""
+        with self._lock:
+            ids = self._by_album.get(self.album_pool.get_id(album_name), ())
+            return [TrackRow(self, i) for i in ids]
+
+    def count_songs_by_artist(self, artist_name):
+        """Anzahl der Songs eines Interpreten, ohne die Liste aufzubauen."""
+        return len(self._by_artist.get(self.artist_pool.get_id(artist_name), ()))
+
+    def count_songs_by_album(self, album_name):
+        """Anzahl der Songs eines Albums, ohne die Liste aufzubauen."""
+        return len(self._by_album.get(self.album_pool.get_id(album_name), ()))
+
+    def get_albums_by_artist(self, artist_name):
+        """Gibt die sortierten Alben eines Interpreten zurück."""
+        with self._lock:
+            album_ids = self._artist_albums.get(self.artist_pool.get_id(artist_name), ())
+            return sorted(self.album_pool[i] for i in album_ids)
+
+    def has_artist(self, name):
+        return self.artist_pool.get_id(name) in self._by_artist
+
+    def has_album(self, name):
+        return self.album_pool.get_id(name) in self._by_album
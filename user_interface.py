@@ -1,15 +1,38 @@
 import pygame
 import os
 import time
+from collections import OrderedDict
+
+from list_view import ListView
+from text_cache import TextCache
+from marquee import Marquee
+from rgb565 import pack_rgb565, unpack_rgb565
+
+
+def song_title(filename):
+    """Anzeigename eines Songs: Dateiname ohne Ordner und Endung."""
+    return os.path.splitext(os.path.basename(filename))[0]
+
 
 class UserInterface:
-    def __init__(self, width, height):
+    MAX_MARQUEES = 16
+
+    def __init__(self, width, height, rgb565=False):
         self.width = width
         self.height = height
+        # Im RGB565-Modus wird in ein 16-Bit-Surface im Panel-Format gezeichnet
+        self.rgb565 = rgb565
+        self.theme_rgb565 = {}
         pygame.font.init()
         self.font = pygame.font.Font('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', 14)
         self.title_font = pygame.font.Font('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 16)
         self.play_font = pygame.font.SysFont(None, 18)
+        # Kleine Schrift mit fester Breite für den Debug-Screen (Spalten müssen untereinander stehen)
+        self.debug_font = pygame.font.Font('/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf', 9)
+        # Gerenderte Texte und Textbreiten wiederverwenden statt in jedem Frame neu zu rendern
+        self.text_cache = TextCache()
+        # Vorgerenderte Lauftexte, nach (Font, Text, Farben, Größe)
+        self._marquees = OrderedDict()
 
         # --- THEME IMPLEMENTIERUNG ---
         self.themes = [
@@ -18,10 +41,48 @@ class UserInterface:
             {"bg": (255, 255, 255), "fg": (50, 50, 50), "highlight": (100, 100, 100), "text_selected": (0,0,0), "indicator":  (255, 0, 0)} # Hell
         ]
         self.current_theme = self.themes[0]
+        self.set_theme(0)
+
+        # Scroll-Zustand der Listen, gezeichnet wird nur der sichtbare Ausschnitt
+        self.menu_view = ListView(40, height - 40, self.font.get_linesize() + 5)
+        self.song_list_view = ListView(5, height - 5, self.font.get_linesize() + 2)
+
+    def text_width(self, font, text):
+        """Breite eines Textes in Pixeln (gecacht)."""
+        return self.text_cache.size(font, text)[0]
+
+    def _marquee(self, font, text, fg, bg, width, height):
+        key = (font, text, fg, bg, width, height)
+        marquee = self._marquees.get(key)
+        if marquee is not None:
+            self._marquees.move_to_end(key)
+            return marquee
+        marquee = Marquee(self.text_cache.render(font, text + Marquee.GAP, fg), bg, width, height)
+        self._marquees[key] = marquee
+        if len(self._marquees) > self.MAX_MARQUEES:
+            self._marquees.popitem(last=False)
+        return marquee
+
+    def song_title_marquee(self, filename):
+        """Lauftext für die ausgewählte Zeile der Songliste."""
+        theme = self.current_theme
+        return self._marquee(self.font, song_title(filename), theme["text_selected"], theme["highlight"],
+                             self.width - 30, self.song_list_view.line_height)
+
+    def play_title_marquee(self, title):
+        """Lauftext für den Titel auf dem Play-Screen."""
+        theme = self.current_theme
+        return self._marquee(self.play_font, title, theme["fg"], theme["bg"], self.width - 20, 20)
 
     def set_theme(self, theme_index):
         if 0 <= theme_index < len(self.themes):
-            self.current_theme = self.themes[theme_index]
+            theme = self.themes[theme_index]
+            if self.rgb565:
+                # Theme-Farben einmalig ins Panel-Format bringen. Gezeichnet wird mit den
+                # darauf gerundeten Farben, sie landen damit exakt so im Framebuffer.
+                self.theme_rgb565 = {name: pack_rgb565(color) for name, color in theme.items()}
+                theme = {name: unpack_rgb565(value) for name, value in self.theme_rgb565.items()}
+            self.current_theme = theme
             
             
             # --- NEUE ICON-ZEICHENFUNKTIONEN ---
@@ -60,37 +121,93 @@ class UserInterface:
 
     def draw_generic_menu(self, screen, options, selected, title):
         screen.fill(self.current_theme["bg"])
-        line_height = self.font.get_linesize() + 5
+        view = self.menu_view
+        line_height = view.line_height
 
         # Titel
-        title_surface = self.title_font.render(title, True, self.current_theme["fg"])
+        title_surface = self.text_cache.render(self.title_font, title, self.current_theme["fg"])
         screen.blit(title_surface, ((self.width - title_surface.get_width()) // 2, 10))
 
-        y = 40
-        for i, option_text in enumerate(options):
+        view.ensure_visible(selected)
+        screen.set_clip(pygame.Rect(0, view.top, self.width, view.height))
+        for i in view.visible_range(len(options)):
+            option_text = options[i]
+            y = view.row_y(i)
             if i == selected:
                 pygame.draw.rect(screen, self.current_theme["highlight"], (5, y, self.width - 10, line_height))
                 text_color = self.current_theme["text_selected"]
             else:
                 text_color = self.current_theme["fg"]
 
-            text_surface = self.font.render(option_text, True, text_color)
+            text_surface = self.text_cache.render(self.font, option_text, text_color)
             screen.blit(text_surface, (15, y + (line_height - text_surface.get_height()) // 2))
+        screen.set_clip(None)
+
+    def draw_splash(self, screen):
+        """Startbild, solange DAC, libvlc und Bibliothek noch geladen werden."""
+        screen.fill(self.current_theme["bg"])
+        title_surface = self.text_cache.render(self.title_font, "MP3 Player", self.current_theme["fg"])
+        screen.blit(title_surface, ((self.width - title_surface.get_width()) // 2, self.height // 2 - 20))
+        text_surface = self.text_cache.render(self.font, "Starte...", self.current_theme["indicator"])
+        screen.blit(text_surface, ((self.width - text_surface.get_width()) // 2, self.height // 2 + 4))
+
+    def draw_visualizer(self, screen, levels, rect):
+        """Balkenspektrum (Pegel 0.0 bis 1.0 je Band) von unten nach oben in rect."""
+        x, y, width, height = rect
+        bar_width = max(1, width // len(levels) - 1)
+        heights = (levels * height).astype(int)
+        color = self.current_theme["highlight"]
+        for i, bar_height in enumerate(heights.tolist()):
+            if bar_height > 0:
+                pygame.draw.rect(screen, color, (x + i * (bar_width + 1), y + height - bar_height,
+                                                 bar_width, bar_height))
+
+    def draw_jump_label(self, screen, label):
+        """Gruppe nach einem Sprung, als Kasten in der Mitte über der Liste.
+
+        Ein Buchstabe steht in einem Quadrat, längere Beschriftungen (Ordnernamen) in einem
+        breiteren Kasten, der am Bildschirmrand abgeschnitten wird.
+        """
+        label_surface = self.text_cache.render(self.title_font, label, self.current_theme["text_selected"])
+        height = label_surface.get_height() + 12
+        width = min(max(label_surface.get_width() + 12, height), self.width - 8)
+        box = pygame.Rect((self.width - width) // 2, (self.height - height) // 2, width, height)
+        pygame.draw.rect(screen, self.current_theme["highlight"], box)
+        text_rect = label_surface.get_rect(center=box.center)
+        if text_rect.width > box.width - 12:
+            text_rect.left = box.left + 6
+        screen.set_clip(box.inflate(-6, 0))
+        screen.blit(label_surface, text_rect)
+        screen.set_clip(None)
+
+    def draw_debug_screen(self, screen, lines, first_line):
+        """Versteckter Debug-Screen mit den Profiler-Werten ab Zeile first_line."""
+        screen.fill(self.current_theme["bg"])
+        font = self.debug_font
+        line_height = font.get_linesize()
+        # Die Werte ändern sich ständig, daher am TextCache vorbei rendern
+        header = font.render("Stufe   p50   p95   max", True, self.current_theme["indicator"])
+        screen.blit(header, (4, 2))
+        y = 4 + line_height
+        for line in lines[first_line:]:
+            if y + line_height > self.height:
+                break
+            screen.blit(font.render(line, True, self.current_theme["fg"]), (4, y))
             y += line_height
+
      # Umbenannt von draw_main_menu zu draw_all_songs_menu
-    def draw_all_songs_menu(self, screen, files, selected, current_song_index, paused, h_scroll, v_scroll):
+    def draw_all_songs_menu(self, screen, files, selected, current_song_index, paused, h_scroll):
         screen.fill(self.current_theme["bg"])
-        y = 5 - v_scroll
-        spacing = 2
-        line_height = self.font.get_linesize() + spacing
+        view = self.song_list_view
+        line_height = view.line_height
 
-        for i, filename in enumerate(files):
-            # Nur im sichtbaren Bereich zeichnen
-            if y > self.height or y + line_height < 0:
-                y += line_height
-                continue
+        # Nur die sichtbaren Zeilen anfassen
+        view.ensure_visible(selected)
+        for i in view.visible_range(len(files)):
+            filename = files[i]
+            y = view.row_y(i)
 
-            base_title = os.path.splitext(filename)[0]
+            base_title = song_title(filename)
             display_title = base_title + "   " # Add padding for scrolling
             
             # Farben setzen
@@ -109,74 +226,62 @@ class UserInterface:
                 else:
                     pygame.draw.polygon(screen, indicator_color, [(5, indicator_y_pos), (5, indicator_y_pos + 8), (12, indicator_y_pos + 4)])
 
-            # Scrolling für lange Titel
-            text_surface = self.font.render(display_title, True, text_color)
-            text_width = text_surface.get_width()
-            
-            text_area = pygame.Rect(17, y, self.width - 30, line_height)
-            
-            if i == selected and text_width > text_area.width:
-                scroll_pos = h_scroll % text_width
-                # Erstelle eine temporäre Oberfläche für den Text, um das Clipping zu erleichtern
-                temp_surface = pygame.Surface(text_area.size, pygame.SRCALPHA)
-                temp_surface.fill(self.current_theme["highlight"]) # Hintergrundfarbe für den Auswahlbalken
-                temp_surface.blit(text_surface, (0,0), (scroll_pos, 0, text_area.width, line_height))
-                
-                # Teil 2 für nahtloses Scrollen
-                if scroll_pos + text_area.width > text_width:
-                    remaining_width = text_width - scroll_pos
-                    temp_surface.blit(text_surface, (remaining_width, 0), (0, 0, text_area.width - remaining_width, line_height))
-                screen.blit(temp_surface, text_area.topleft)
-            else:
-                # Clipping, damit der Text nicht über den Rand hinausragt
-                screen.set_clip(text_area)
-                screen.blit(text_surface, text_area.topleft)
-                screen.set_clip(None)
+            # Scrolling für lange Titel über den vorgerenderten Lauftext
+            if i == selected:
+                marquee = self.song_title_marquee(filename)
+                if marquee.needs_scroll:
+                    marquee.draw(screen, 17, y, h_scroll)
+                    continue
 
-            y += line_height
+            text_surface = self.text_cache.render(self.font, display_title, text_color)
+            text_area = pygame.Rect(17, y, self.width - 30, line_height)
+            # Clipping, damit der Text nicht über den Rand hinausragt
+            screen.set_clip(text_area)
+            screen.blit(text_surface, text_area.topleft)
+            screen.set_clip(None)
 
-    def draw_play_menu(self, screen, current_file, progress, elapsed, total, playing, scroll_offset, volume, last_volume_change_time, VOLUME_DISPLAY_DURATION ):
+    def draw_play_menu(self, screen, current_file, progress, elapsed, total, playing, scroll_offset, volume, last_volume_change_time, VOLUME_DISPLAY_DURATION, art=None):
         screen.fill(self.current_theme["bg"])
-        font = pygame.font.SysFont(None, 18)
+        font = self.play_font
 
          # Scrolling für Play-Screen Titel
-        title_text = current_file + "   "
-        title_surface = self.play_font.render(title_text, True, self.current_theme["fg"])
-        title_width = title_surface.get_width()
-        
-        title_area = pygame.Rect(10, 10, self.width - 20, 20)
-        
-        if title_width > title_area.width:
-            scroll_pos = scroll_offset % title_width
-            temp_surface = pygame.Surface(title_area.size, pygame.SRCALPHA)
-            temp_surface.fill(self.current_theme["bg"])
-            temp_surface.blit(title_surface, (0,0), (scroll_pos, 0, title_area.width, 20))
-            if scroll_pos + title_area.width > title_width:
-                remaining_width = title_width - scroll_pos
-                temp_surface.blit(title_surface, (remaining_width, 0), (0, 0, title_area.width - remaining_width, 20))
-            screen.blit(temp_surface, title_area.topleft)
+        marquee = self.play_title_marquee(current_file)
+        if marquee.needs_scroll:
+            marquee.draw(screen, 10, 10, scroll_offset)
         else:
-            screen.blit(title_surface, (title_area.x + (title_area.width - title_width) // 2, title_area.y))
+            title_surface = marquee.strip
+            screen.blit(title_surface, (10 + (marquee.width - title_surface.get_width()) // 2, 10))
+
+        # Cover (fertiges Thumbnail aus dem AlbumArtCache) links, Balken und Zeit rücken daneben
+        left = 10
+        if art is not None:
+            screen.blit(art, (10, 34))
+            left = 10 + art.get_width() + 8
+        column_width = self.width - left - 10
+        column_center = left + column_width // 2
 
         # Fortschrittsbalken
         bar_y = 40
         bar_height = 10
-        pygame.draw.rect(screen, (50, 50, 50), (10, bar_y, self.width - 20, bar_height))
-        prog_width = int((self.width - 20) * progress)
-        pygame.draw.rect(screen, self.current_theme["highlight"], (10, bar_y, prog_width, bar_height))
+        pygame.draw.rect(screen, (50, 50, 50), (left, bar_y, column_width, bar_height))
+        prog_width = int(column_width * progress)
+        pygame.draw.rect(screen, self.current_theme["highlight"], (left, bar_y, prog_width, bar_height))
 
         # Zeit
         cur_min, cur_sec = divmod(int(elapsed), 60)
         tot_min, tot_sec = divmod(int(total), 60)
         time_text = f"{cur_min:02d}:{cur_sec:02d} / {tot_min:02d}:{tot_sec:02d}"
-        time_surface = font.render(time_text, True, self.current_theme["fg"])
-        screen.blit(time_surface, ((self.width - time_surface.get_width()) // 2, bar_y + bar_height + 5))
+        time_surface = self.text_cache.render(font, time_text, self.current_theme["fg"])
+        screen.blit(time_surface, (column_center - time_surface.get_width() // 2, bar_y + bar_height + 5))
         
         # Lautstärkeindikator nur anzeigen, wenn kürzlich die Lautstärke geändert wurde
         if time.time() - last_volume_change_time < VOLUME_DISPLAY_DURATION:
-            vol_bar_width = 80
+            vol_bar_width = min(80, column_width - 35)
             vol_bar_height = 8
-            vol_x = (self.width - vol_bar_width) // 2
+            vol_x = column_center - vol_bar_width // 2
+            if art is not None:
+                # Neben dem Cover Balken und "Vol:" gemeinsam zentrieren
+                vol_x += (self.text_width(font, "Vol:") + 5) // 2
             vol_y = bar_y + bar_height + 20
             # Rahmen für den Balken
             pygame.draw.rect(screen, self.current_theme["highlight"], (vol_x, vol_y, vol_bar_width, vol_bar_height), 1)
@@ -184,7 +289,7 @@ class UserInterface:
             filled_width = int(vol_bar_width * volume)
             pygame.draw.rect(screen, self.current_theme["fg"], (vol_x, vol_y, filled_width, vol_bar_height))
             # Optional: Beschriftung "Vol" neben dem Balken
-            vol_text_surface = font.render("Vol:", True, self.current_theme["fg"])
+            vol_text_surface = self.text_cache.render(font, "Vol:", self.current_theme["fg"])
             screen.blit(vol_text_surface, (vol_x - vol_text_surface.get_width() - 5, vol_y))
 
         # --- ICONS WERDEN JETZT MIT PYGAME GEZEICHNET ---
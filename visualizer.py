@@ -0,0 +1,232 @@
+import threading
+import time
+
+import numpy as np
+
+from profiler import profiler
+
+# pyalsaaudio ist optional, ohne läuft der Visualizer nur mit anderen Quellen (z.B. dem Player)
+try:
+    import alsaaudio
+except ImportError:
+    alsaaudio = None
+
+
+class PCMTap:
+    """Ringpuffer für die zuletzt gespielten Samples (mono, float32).
+
+    Quellen schreiben mit write() int16-Blöcke (mono oder stereo verschachtelt) hinein, der
+    Visualizer holt mit latest() die neuesten n Samples. Geschrieben wird nur in den
+    Puffer, die Quelle wartet also nie auf die Analyse.
+    """
+
+    def __init__(self, capacity=8192, channels=2):
+        self.capacity = capacity
+        self.channels = channels
+        self._buffer = np.zeros(capacity, dtype=np.float32)
+        self._position = 0
+        self.written = 0
+        self._lock = threading.Lock()
+
+    def write(self, samples):
+        """samples: bytes oder int16-Array mit verschachtelten Kanälen."""
+        if isinstance(samples, (bytes, bytearray, memoryview)):
+            samples = np.frombuffer(samples, dtype=np.int16)
+        if self.channels > 1:
+            frames = len(samples) // self.channels
+            # Kanäle mitteln, das reicht für die Anzeige
+            samples = samples[:frames * self.channels].reshape(frames, self.channels).mean(axis=1)
+        samples = samples[-self.capacity:]
+        count = len(samples)
+        with self._lock:
+            end = self._position + count
+            if end <= self.capacity:
+                self._buffer[self._position:end] = samples
+            else:
+                split = self.capacity - self._position
+                self._buffer[self._position:] = samples[:split]
+                self._buffer[:count - split] = samples[split:]
+            self._position = end % self.capacity
+            self.written += count
+
+    def latest(self, count, out):
+        """Kopiert die neuesten count Samples nach out (float32-Array der Länge count)."""
+        with self._lock:
+            start = self._position - count
+            if start >= 0:
+                out[:] = self._buffer[start:self._position]
+            else:
+                out[:-start] = self._buffer[start:]
+                out[-start:] = self._buffer[:self._position]
+        return out
+
+
+class SpectrumAnalyzer:
+    """Balkenspektrum aus PCM-Samples, vollständig vektorisiert.
+
+    Fensterfunktion, die Grenzen der logarithmisch verteilten Bänder und alle Puffer werden
+    einmal angelegt. Pro Analyse: Fenster anwenden, rfft, Betragsquadrat, Summen je Band
+    über np.add.reduceat, Umrechnung in dB und Glättung (schnell steigen, langsam fallen).
+    Ergebnis sind bands Werte von 0.0 bis 1.0.
+    """
+
+    def __init__(self, sample_rate=44100, fft_size=1024, bands=16, min_freq=60.0, max_freq=16000.0,
+                 floor_db=-60.0, fall=0.6):
+        self.fft_size = fft_size
+        self.bands = bands
+        self.floor_db = floor_db
+        self.fall = fall
+        self.window = np.hanning(fft_size).astype(np.float32)
+        # Vollaussteuerung eines Sinus ergibt 0 dB
+        self._reference = (32768.0 * self.window.sum() / 2) ** 2
+
+        max_freq = min(max_freq, sample_rate / 2)
+        frequencies = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+        edges = np.geomspace(min_freq, max_freq, bands + 1)
+        # Band i umfasst die Bins starts[i] bis starts[i + 1] (so summiert np.add.reduceat),
+        # das letzte endet bei max_freq
+        starts = np.minimum(np.searchsorted(frequencies, edges[:-1]), len(frequencies) - 1)
+        self._end = max(int(np.searchsorted(frequencies, edges[-1])), int(starts[-1]) + 1)
+        widths = np.diff(np.append(starts, self._end))
+        # Tiefe Bänder sind schmaler als ein FFT-Bin: reduceat liefert dann genau einen Bin
+        self._starts = starts
+        self._widths = np.maximum(widths, 1).astype(np.float64)
+
+        self.samples = np.zeros(fft_size, dtype=np.float32)
+        self._windowed = np.empty(fft_size, dtype=np.float32)
+        self._band_power = np.empty(bands, dtype=np.float64)
+        self.levels = np.zeros(bands, dtype=np.float32)
+
+    def analyze(self, samples=None):
+        """Analysiert samples (sonst self.samples) und gibt die geglätteten Bandpegel zurück."""
+        if samples is None:
+            samples = self.samples
+        np.multiply(samples, self.window, out=self._windowed)
+        spectrum = np.fft.rfft(self._windowed)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        np.add.reduceat(power[:self._end], self._starts, out=self._band_power)
+        # Mittlere Leistung je Band, dann dB relativ zur Vollaussteuerung
+        self._band_power /= self._widths
+        self._band_power /= self._reference
+        db = 10.0 * np.log10(self._band_power + 1e-12)
+        level = np.clip(1.0 - db / self.floor_db, 0.0, 1.0).astype(np.float32)
+        # Schnell steigen, langsam fallen
+        np.maximum(level, self.levels * self.fall, out=self.levels)
+        return self.levels
+
+
+class AlsaLoopbackSource:
+    """Liest das gespielte Audio von einem ALSA-Capture-Gerät, z.B. der Loopback-Karte.
+
+    Dafür muss in /etc/asound.conf die Ausgabe zusätzlich auf snd-aloop gelegt werden
+    (multi-Plugin); device ist dann die Capture-Seite, z.B. "hw:Loopback,1,0". Läuft in
+    einem eigenen Thread und schreibt in den PCMTap.
+    """
+
+    def __init__(self, tap, device="hw:Loopback,1,0", sample_rate=44100, period=512):
+        if alsaaudio is None:
+            raise RuntimeError("pyalsaaudio nicht gefunden, Loopback-Quelle nicht verfügbar")
+        self.tap = tap
+        # Überläufe des Capture-Puffers: Zeichen, dass das System gerade nicht hinterherkommt
+        self.overruns = 0
+        self.pcm = alsaaudio.PCM(alsaaudio.PCM_CAPTURE, alsaaudio.PCM_NORMAL, device=device,
+                                 channels=tap.channels, rate=sample_rate,
+                                 format=alsaaudio.PCM_FORMAT_S16_LE, periodsize=period)
+        self._running = True
+        self._thread = threading.Thread(target=self._read_loop, name="pcm-loopback", daemon=True)
+        self._thread.start()
+
+    def _read_loop(self):
+        while self._running:
+            length, data = self.pcm.read()
+            if length > 0:
+                self.tap.write(data)
+            elif length < 0:
+                self.overruns += 1
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+        self.pcm.close()
+
+
+class Visualizer:
+    """Berechnet das Spektrum in einem eigenen Thread mit begrenzter Rate.
+
+    Höchstens max_rate Analysen pro Sekunde. Braucht eine Analyse mehr als budget (Anteil
+    des Intervalls) oder meldet at_risk() True (z.B. Frames zu langsam oder Audio-Puffer
+    knapp), wird die Rate halbiert, bis hinunter zu min_rate. Läuft alles ruhig, steigt sie
+    nach recover Sekunden schrittweise wieder. levels ist immer das letzte fertige Ergebnis;
+    on_update() wird nach jeder Analyse aufgerufen (z.B. um neu zu zeichnen).
+    """
+
+    def __init__(self, tap, analyzer=None, max_rate=25.0, min_rate=5.0, budget=0.25, at_risk=None,
+                 recover=2.0, on_update=None):
+        self.tap = tap
+        self.analyzer = analyzer or SpectrumAnalyzer()
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate = max_rate
+        self.budget = budget
+        self.at_risk = at_risk
+        self.recover = recover
+        self.on_update = on_update
+        self.levels = np.zeros(self.analyzer.bands, dtype=np.float32)
+        self.analyses = 0
+        self.last_analysis_time = 0.0
+        self._calm_since = time.monotonic()
+        self._active = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._analysis_loop, name="visualizer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._active.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def set_active(self, active):
+        """Nur rechnen, solange der Play-Screen sichtbar ist und Musik läuft."""
+        if active == self._active.is_set():
+            return
+        if active:
+            self._active.set()
+        else:
+            self._active.clear()
+            self.levels = np.zeros(self.analyzer.bands, dtype=np.float32)
+
+    def _analysis_loop(self):
+        analyzer = self.analyzer
+        while self._running:
+            self._active.wait()
+            if not self._running:
+                break
+            start = time.perf_counter()
+            self.tap.latest(analyzer.fft_size, analyzer.samples)
+            # Kopie, damit der Hauptloop nie ein halb geschriebenes Array liest
+            self.levels = analyzer.analyze().copy()
+            elapsed = time.perf_counter() - start
+            self.last_analysis_time = elapsed
+            self.analyses += 1
+            profiler.record("visualizer", elapsed)
+            self._adapt(elapsed)
+            if self.on_update is not None:
+                self.on_update()
+            time.sleep(max(0.0, 1.0 / self.rate - elapsed))
+
+    def _adapt(self, elapsed):
+        now = time.monotonic()
+        if elapsed > self.budget / self.rate or (self.at_risk is not None and self.at_risk()):
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._calm_since = now
+        elif self.rate < self.max_rate and now - self._calm_since >= self.recover:
+            self.rate = min(self.max_rate, self.rate * 1.5)
+            self._calm_since = now
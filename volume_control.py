@@ -0,0 +1,83 @@
+import math
+import subprocess
+import threading
+import time
+
+from profiler import profiler
+
+# Bereich der digitalen DAC-Lautstärke, die wir nutzen (0 dB = Maximum ohne Verstärkung)
+MIN_DB = -63.5
+MAX_DB = 0.0
+
+
+def volume_to_db(volume):
+    """Rechnet eine Lautstärke von 0.0 bis 1.0 in dB für das DAC-Register um.
+
+    40*log10 folgt grob dem Lautstärkeempfinden (0.5 -> -12 dB). Gerundet wird auf die
+    0,5-dB-Schritte des TLV320DAC3100.
+    """
+    if volume <= 0:
+        return MIN_DB
+    db = max(MIN_DB, min(MAX_DB, 40 * math.log10(volume)))
+    return round(db * 2) / 2
+
+
+def set_system_volume(volume_level):
+    """Setzt die Systemlautstärke mit amixer. Erwartet einen Wert zwischen 0.0 und 1.0."""
+    volume_percent = int(volume_level * 100)
+    try:
+        # Wir verwenden den Mixer "PCM", der in /etc/asound.conf definiert wird
+        subprocess.run(["amixer", "set", "Master", f"{volume_percent}%"], check=True, capture_output=True)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"Fehler beim Setzen der Lautstärke mit amixer: {e}")
+        print("Stellen Sie sicher, dass 'alsa-utils' installiert ist und /etc/asound.conf korrekt konfiguriert ist.")
+
+
+class VolumeController:
+    """Setzt die Lautstärke in einem eigenen Thread, ohne den Hauptloop zu blockieren.
+
+    Mit DAC wird das Lautstärke-Register des TLV320DAC3100 direkt beschrieben, ohne DAC
+    wird auf amixer zurückgegriffen. Schnelle Encoder-Drehungen werden zusammengefasst:
+    Geschrieben wird immer nur der zuletzt gewünschte Wert, höchstens einmal pro Frame.
+    """
+
+    def __init__(self, dac=None, min_interval=1 / 30):
+        self.dac = dac
+        self.min_interval = min_interval
+        self.requests = 0
+        self.writes = 0
+        self._target = None
+        self._written = None
+        self._changed = threading.Condition()
+        self._thread = threading.Thread(target=self._write_loop, name="volume", daemon=True)
+        self._thread.start()
+
+    def set_volume(self, volume):
+        """Merkt sich die gewünschte Lautstärke (0.0 bis 1.0) und kehrt sofort zurück."""
+        with self._changed:
+            self._target = volume
+            self.requests += 1
+            self._changed.notify()
+
+    def _write_loop(self):
+        while True:
+            with self._changed:
+                while self._target == self._written:
+                    self._changed.wait()
+                volume = self._target
+            start = profiler.start()
+            self._write(volume)
+            profiler.stop("volume", start)
+            self._written = volume
+            self.writes += 1
+            # Weitere Änderungen in dieser Zeit sammeln sich in _target
+            time.sleep(self.min_interval)
+
+    def _write(self, volume):
+        if self.dac is None:
+            set_system_volume(volume)
+            return
+        try:
+            self.dac.dac_volume = volume_to_db(volume)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Fehler beim Setzen der DAC-Lautstärke: {e}")